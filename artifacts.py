@@ -0,0 +1,135 @@
+import os
+import gzip
+import queue
+import shutil
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+
+# Default parent directory of the per-run artifact directories
+ARTIFACTS_DIR = "artifacts"
+# How many runs' artifact directories to keep, the current one included
+ARTIFACT_RETENTION = 10
+
+
+class ArtifactWriter:
+    """Saves debug page sources and screenshots of a run on a background thread"""
+
+    def __init__(self, base_dir=ARTIFACTS_DIR, every_n_pages=10, max_bytes=200 * 1024 * 1024, keep_runs=ARTIFACT_RETENTION):
+        self.base_dir = base_dir
+        self.run_dir = os.path.join(base_dir, f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        self.every_n_pages = every_n_pages
+        # Both caps cover every run directory under base_dir, not just this run's
+        self.max_bytes = max_bytes
+        self.keep_runs = keep_runs
+        self.logger = logging.getLogger("IndiaMartScraper")
+        self.sequence = 0
+        # Written files, oldest first, for the size-capped retention
+        self.files = deque()
+        self.total_bytes = 0
+        self.saved = 0
+        self.saved_bytes = 0
+        self.dropped = 0
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="artifacts", daemon=True)
+        self.thread.start()
+
+    def wants(self, error=False, page=None):
+        """Return True if an artifact should be captured: always on error, every Nth results page otherwise"""
+        if error:
+            return True
+        if page is not None:
+            return bool(self.every_n_pages) and (page - 1) % self.every_n_pages == 0
+        return True
+
+    def _submit(self, name, extension, data, compress):
+        self.sequence += 1
+        filename = f"{self.sequence:05d}_{name}.{extension}" + (".gz" if compress else "")
+        self.queue.put((filename, data, compress))
+
+    def page_source(self, name, html, error=False, page=None):
+        """Queue a page source for writing if the sampling policy wants it"""
+        if html and self.wants(error, page):
+            self._submit(name, "html", html.encode("utf-8"), compress=True)
+
+    def screenshot(self, driver, name, error=False, page=None):
+        """Take a screenshot now and queue it for writing if the sampling policy wants it"""
+        if not self.wants(error, page):
+            return
+        try:
+            # PNG data is already compressed
+            self._submit(name, "png", driver.get_screenshot_as_png(), compress=False)
+        except Exception as e:
+            self.logger.debug(f"Could not take screenshot {name}: {e}")
+
+    def run(self):
+        """Write queued artifacts until close() is called"""
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                self.write(*item)
+            except Exception as e:
+                self.logger.warning(f"Could not write artifact {item[0]}: {e}")
+            finally:
+                self.queue.task_done()
+
+    def load_previous_runs(self):
+        """Delete the oldest run directories beyond keep_runs and queue the files of the others for the size cap"""
+        if not os.path.isdir(self.base_dir):
+            return
+        runs = sorted(name for name in os.listdir(self.base_dir) if name.startswith("run_") and os.path.join(self.base_dir, name) != self.run_dir)
+        stale = max(0, len(runs) - max(0, self.keep_runs - 1))
+        for name in runs[:stale]:
+            shutil.rmtree(os.path.join(self.base_dir, name), ignore_errors=True)
+        for name in runs[stale:]:
+            run_dir = os.path.join(self.base_dir, name)
+            # File names start with a sequence number, so they sort oldest first within a run
+            for filename in sorted(os.listdir(run_dir)):
+                path = os.path.join(run_dir, filename)
+                try:
+                    self.files.append((path, os.path.getsize(path)))
+                    self.total_bytes += self.files[-1][1]
+                except OSError:
+                    pass
+
+    def write(self, filename, data, compress):
+        if not os.path.exists(self.run_dir):
+            # First artifact of the run: apply the retention to the runs before it
+            self.load_previous_runs()
+            os.makedirs(self.run_dir)
+        path = os.path.join(self.run_dir, filename)
+        if compress:
+            data = gzip.compress(data, compresslevel=6)
+        with open(path, "wb") as f:
+            f.write(data)
+
+        # Ring buffer: drop the oldest artifacts, earlier runs' first, once they are over the size cap
+        self.files.append((path, len(data)))
+        self.total_bytes += len(data)
+        self.saved += 1
+        self.saved_bytes += len(data)
+        while self.total_bytes > self.max_bytes and len(self.files) > 1:
+            old_path, size = self.files.popleft()
+            try:
+                os.remove(old_path)
+                old_dir = os.path.dirname(old_path)
+                if old_dir != self.run_dir and not os.listdir(old_dir):
+                    os.rmdir(old_dir)
+            except OSError:
+                pass
+            self.total_bytes -= size
+            self.dropped += 1
+
+    def flush(self):
+        """Wait until every queued artifact is written"""
+        self.queue.join()
+
+    def close(self):
+        """Write the remaining artifacts and stop the writer thread"""
+        self.queue.put(None)
+        self.thread.join()
+        if self.saved:
+            self.logger.info(f"Saved {self.saved} debug artifacts ({self.saved_bytes / 1024:.0f} KB) to {self.run_dir}, {self.dropped} older ones dropped")
@@ -0,0 +1,267 @@
+"""End-to-end crawl benchmark against the local stand-in IndiaMART server.
+
+Drives IndiaMartScraper.search_product, scrape_search_results and the profile
+visits in a headless Chrome, then reports leads/sec, per-stage latency
+percentiles, WebDriver command counts and peak RSS. Every run is appended to
+benchmarks/results/crawl.jsonl and compared with the previous run of the same
+configuration. Run from the repository root:
+
+    python -m benchmarks.crawl --backend dom --pages 5 --latency-ms 50
+"""
+import os
+import json
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import Counter
+import psutil
+
+import indiamart_scraper
+from indiamart_scraper import IndiaMartScraper, BACKENDS
+from waits import RatePolicy
+from benchmarks.stand_in_server import StandInSite, start_server
+
+RESULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "crawl.jsonl")
+
+# Scraper methods and module functions timed as stages
+STAGE_METHODS = [
+    "search_product", "wait_for_listings", "find_seller_elements", "fetch_results_page",
+    "extract_seller_info", "extract_detailed_info", "add_lead",
+]
+STAGE_FUNCTIONS = ["extract_listings", "extract_listings_js"]
+
+
+class StageTimer:
+    """Collects call durations per stage"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.durations = {}
+
+    def wrap(self, name, func):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.durations.setdefault(name, []).append(time.perf_counter() - start)
+        return timed
+
+    def report(self):
+        """Return count, total and p50/p90/p99 latency in milliseconds per stage"""
+        report = {}
+        with self.lock:
+            for name, durations in self.durations.items():
+                durations = sorted(durations)
+                percentile = lambda p: round(durations[min(len(durations) - 1, int(p / 100 * len(durations)))] * 1000, 1)
+                report[name] = {
+                    "count": len(durations),
+                    "total_s": round(sum(durations), 3),
+                    "p50_ms": percentile(50),
+                    "p90_ms": percentile(90),
+                    "p99_ms": percentile(99),
+                }
+        return report
+
+
+class RssSampler:
+    """Samples the resident memory of this process and its children (chromedriver, Chrome)"""
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.peak = 0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="rss-sampler", daemon=True)
+
+    def sample(self):
+        process = psutil.Process()
+        total = 0
+        for proc in [process] + process.children(recursive=True):
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass
+        self.peak = max(self.peak, total)
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self.sample()
+            self.stop_event.wait(self.interval)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+        return self.peak / (1024 * 1024)
+
+
+# Function to count the commands a driver sends to chromedriver
+def count_commands(driver):
+    """Wrap driver.execute so every WebDriver command is counted by name"""
+    counts = Counter()
+    execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        counts[driver_command] += 1
+        return execute(driver_command, params)
+
+    driver.execute = counting_execute
+    return counts
+
+
+# Function to identify the code being benchmarked
+def git_revision():
+    """Return the short commit hash of the working tree, or an empty string outside git"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_crawl(args):
+    """Crawl the stand-in site once and return the measurements"""
+    recorded = None
+    if args.recorded:
+        with open(args.recorded, encoding="utf-8") as f:
+            recorded = f.read()
+
+    site = StandInSite(
+        pages=args.pages,
+        cards_per_page=args.cards,
+        latency_ms=args.latency_ms,
+        hidden_phone_share=args.hidden_phone_share,
+        recorded=recorded,
+    )
+    server, base_url = start_server(site)
+
+    # The scraper writes logs and debug artifacts to the working directory
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp(prefix="indiamart-bench-"))
+
+    stages = StageTimer()
+    originals = {name: getattr(indiamart_scraper, name) for name in STAGE_FUNCTIONS}
+    for name, func in originals.items():
+        setattr(indiamart_scraper, name, stages.wrap(name, func))
+
+    rss = RssSampler()
+    rss.start()
+    scraper = None
+    try:
+        scraper = IndiaMartScraper(
+            headless=True,
+            backend=args.backend,
+            enrich_workers=args.enrich_workers,
+            session_file=None,
+            rate_policy=RatePolicy(scale=0),
+        )
+        scraper.base_url = f"{base_url}/"
+        commands = count_commands(scraper.driver)
+        for name in STAGE_METHODS:
+            setattr(scraper, name, stages.wrap(name, getattr(scraper, name)))
+
+        start = time.perf_counter()
+        if not scraper.search_product(args.keyword):
+            raise RuntimeError("Search on the stand-in site failed")
+        scraper.scrape_search_results(args.keyword, min_leads=args.min_leads or args.pages * args.cards)
+        elapsed = time.perf_counter() - start
+        leads = scraper.lead_count
+    finally:
+        if scraper:
+            scraper.close()
+        peak_rss_mb = rss.stop()
+        for name, func in originals.items():
+            setattr(indiamart_scraper, name, func)
+        os.chdir(cwd)
+        server.shutdown()
+
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "config": {
+            "backend": args.backend,
+            "pages": args.pages,
+            "cards": args.cards,
+            "latency_ms": args.latency_ms,
+            "hidden_phone_share": args.hidden_phone_share,
+            "enrich_workers": args.enrich_workers,
+            "recorded": bool(args.recorded),
+        },
+        "leads": leads,
+        "seconds": round(elapsed, 3),
+        "leads_per_sec": round(leads / elapsed, 2) if elapsed else 0.0,
+        "stages": stages.report(),
+        "webdriver_commands": sum(commands.values()),
+        "top_commands": dict(commands.most_common(10)),
+        "peak_rss_mb": round(peak_rss_mb, 1),
+        "requests": dict(site.hits),
+    }
+
+
+# Function to find the last stored run with the same settings
+def previous_result(path, config):
+    """Return the most recent stored result with the same configuration, or None"""
+    if not os.path.exists(path):
+        return None
+    previous = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            result = json.loads(line)
+            if result["config"] == config:
+                previous = result
+    return previous
+
+
+def print_result(result, previous):
+    print(f"Revision:            {result['revision'] or '-'}")
+    print(f"Leads:               {result['leads']} in {result['seconds']} s ({result['leads_per_sec']} leads/s)")
+    print(f"WebDriver commands:  {result['webdriver_commands']}")
+    print(f"Peak RSS:            {result['peak_rss_mb']} MB")
+    print(f"Server requests:     {result['requests']}")
+    print("Stages (ms):")
+    for name, stage in sorted(result["stages"].items(), key=lambda item: -item[1]["total_s"]):
+        print(f"  {name:24} n={stage['count']:<5} total={stage['total_s']:>8.3f}s  p50={stage['p50_ms']:>8}  p90={stage['p90_ms']:>8}  p99={stage['p99_ms']:>8}")
+
+    if previous:
+        print(f"Compared with {previous['revision'] or '-'} ({previous['time']}):")
+        for key in ("leads_per_sec", "webdriver_commands", "peak_rss_mb"):
+            before, after = previous[key], result[key]
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+            print(f"  {key:20} {before} -> {after} ({change})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark a full crawl against a local stand-in IndiaMART server")
+    parser.add_argument("--backend", "-b", choices=BACKENDS, default="dom", help="Listing extraction backend (default: dom)")
+    parser.add_argument("--pages", type=int, default=5, help="Number of result pages (default: 5)")
+    parser.add_argument("--cards", type=int, default=20, help="Listings per result page (default: 20)")
+    parser.add_argument("--min-leads", type=int, default=0, help="Stop after this many leads (default: every listing)")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Server delay per response (default: 0)")
+    parser.add_argument("--hidden-phone-share", type=float, default=0.3, help="Share of companies that hide their number behind a click (default: 0.3)")
+    parser.add_argument("--enrich-workers", "-w", type=int, default=0, help="Parallel profile fetchers (default: 0)")
+    parser.add_argument("--recorded", type=str, help="Serve this saved results page (e.g. page_source.html) instead of synthetic ones")
+    parser.add_argument("--keyword", type=str, default="cricket ball", help="Keyword to search for")
+    parser.add_argument("--results-file", type=str, default=RESULTS_FILE, help="Where runs are stored (default: benchmarks/results/crawl.jsonl)")
+    parser.add_argument("--no-save", action="store_true", help="Don't store this run")
+    args = parser.parse_args()
+
+    result = run_crawl(args)
+    print_result(result, previous_result(args.results_file, result["config"]))
+
+    if not args.no_save:
+        directory = os.path.dirname(args.results_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(args.results_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Compare the XPath text probes with the compiled single-pass text extractors.
+
+Extracts price, phone number and address from the listing cards and the page of
+page_source.html, plus synthetic cards whose location is any gazetteer city and
+isn't marked with a location class. Run from the repository root:
+
+    python -m benchmarks.extractors --cards 2000
+"""
+import time
+import random
+import argparse
+
+from dom_extractor import parse_page, find_listing_cards, _text, _lines
+from text_extractors import scan_text, get_gazetteer
+
+# The probes the extractors used before the gazetteer, kept here as the baseline
+PRICE_XPATH = ".//*[contains(text(), '₹') or contains(text(), 'Rs') or contains(@class, 'price') or contains(@class, 'prc')]"
+ADDRESS_XPATH = ".//*[contains(@class, 'loctn') or contains(@class, 'location') or contains(text(), 'Delhi') or contains(text(), 'Mumbai') or contains(text(), 'Bengaluru')]"
+PHONE_XPATH = ".//*[contains(text(), 'View Mobile Number') or contains(text(), 'Call') or contains(@class, 'phone') or contains(@class, 'mobile')]"
+
+SYNTHETIC_CARD = """<div class="FM_sldrB"><p class="prd-title">{title}</p><a class="clg" href="https://www.indiamart.com/x/">{company}</a>
+<div>&#8377; {price}/ {unit}</div><div>{locality}, {city}</div><span>Call +91-{phone}</span></div>"""
+
+
+def probe_card(card):
+    """Extract price, phone and address with the XPath probes"""
+    fields = {"Price": "", "Phone Number": "", "Address": ""}
+    for element in card.xpath(PRICE_XPATH):
+        price_text = _text(element)
+        if price_text and ('₹' in price_text or 'Rs' in price_text or '/' in price_text):
+            fields["Price"] = price_text
+            break
+    for element in card.xpath(ADDRESS_XPATH):
+        address_text = _text(element)
+        if address_text and len(address_text) > 2 and not ('₹' in address_text or 'Rs' in address_text):
+            fields["Address"] = address_text
+            break
+    for element in card.xpath(PHONE_XPATH):
+        phone_text = _text(element)
+        if any(c.isdigit() for c in phone_text):
+            fields["Phone Number"] = ''.join(c for c in phone_text if c.isdigit())
+            break
+    return fields
+
+
+def scan_card(card):
+    """Extract price, phone and address with one scan of the card's text"""
+    return scan_text(_lines(card))
+
+
+def synthetic_cards(count):
+    """Build cards located in random gazetteer cities"""
+    cities = sorted({place[0] for place in iter_places(get_gazetteer().trie) if place[2] == "city"})
+    html = "".join(
+        SYNTHETIC_CARD.format(
+            title=f"Cricket Ball {i}",
+            company=f"Company {i}",
+            price=random.randint(50, 5000),
+            unit=random.choice(["Piece", "Dozen", "Kg", "Box"]),
+            locality=f"Plot {random.randint(1, 300)}, Industrial Area",
+            city=random.choice(cities),
+            phone=f"9{random.randint(100000000, 999999999)}",
+        )
+        for i in range(count)
+    )
+    return find_listing_cards(parse_page(f"<html><body>{html}</body></html>"))
+
+
+def iter_places(node):
+    for key, child in node.items():
+        if key == "":
+            yield child
+        else:
+            yield from iter_places(child)
+
+
+def measure(name, cards, extract):
+    start = time.perf_counter()
+    results = [extract(card) for card in cards]
+    elapsed = time.perf_counter() - start
+    found = {field: sum(1 for result in results if result[field]) for field in ("Price", "Address")}
+    # Only ten-digit numbers count, the probes also pick up digits like "Call Response Rate 78%"
+    found["Phone Number"] = sum(1 for result in results if len(result["Phone Number"]) == 10)
+    per_card = elapsed / len(cards) * 1e6 if cards else 0.0
+    print(f"  {name:8} {per_card:8.1f} us/card   price {found['Price']:>5}   phone {found['Phone Number']:>5}   address {found['Address']:>5}   of {len(cards)}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark XPath probes vs compiled text extractors")
+    parser.add_argument("--page", type=str, default="page_source.html", help="Saved page to extract from (default: page_source.html)")
+    parser.add_argument("--cards", type=int, default=2000, help="Number of synthetic cards (default: 2000)")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the saved page's cards (default: 20)")
+    args = parser.parse_args()
+
+    random.seed(0)
+    start = time.perf_counter()
+    gazetteer = get_gazetteer()
+    print(f"Gazetteer: {gazetteer.size} names loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    with open(args.page, encoding="utf-8") as f:
+        document = parse_page(f.read())
+    saved_cards = find_listing_cards(document) * args.repeat
+
+    for label, cards in ((f"{args.page} cards", saved_cards), ("Synthetic cards", synthetic_cards(args.cards))):
+        print(f"{label}:")
+        probe_time = measure("xpath", cards, probe_card)
+        scan_time = measure("scan", cards, scan_card)
+        print(f"  speedup  {probe_time / scan_time:.1f}x")
+
+    print(f"{args.page} as a profile page:")
+    body = document.find("body")
+    measure("xpath", [body], probe_card)
+    measure("scan", [body], scan_card)
+
+
+if __name__ == "__main__":
+    main()
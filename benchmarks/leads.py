@@ -0,0 +1,131 @@
+"""Compare leads kept as dicts with the columnar LeadStore.
+
+Builds synthetic leads, measures the memory each representation holds and the
+time to sanitize, sort and write them to CSV, and checks that both exports are
+identical. Run from the repository root:
+
+    python -m benchmarks.leads --leads 100000
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+from lead_store import LeadStore
+from utils import new_seller_info, LEAD_FIELDS
+from text_extractors import get_gazetteer
+
+WORDS = ["cricket", "tennis", "ball", "leather", "sports", "rubber", "stand", "frame", "aluminium", "standee", "traders", "enterprises"]
+UNITS = ["Piece", "Dozen", "Kg", "Box", "Pair"]
+
+
+def make_leads(count):
+    """Build leads with prices, city addresses and long, untidy descriptions"""
+    cities = sorted(get_gazetteer().trie)[:300]
+    leads = []
+    for i in range(count):
+        lead = new_seller_info()
+        lead["Company Name"] = f" {random.choice(WORDS).title()} {random.choice(WORDS).title()} Pvt Ltd {i % 5000}\n"
+        lead["Company Profile URL"] = f"https://www.indiamart.com/company-{i}/"
+        if random.random() < 0.8:
+            lead["Price"] = f"₹ {random.choice([50, 120, 250, 499, 1200])}/ {random.choice(UNITS)}"
+        lead["Address"] = random.choice(cities).title()
+        lead["Phone Number"] = f"9{random.randint(100000000, 999999999)}" if random.random() < 0.6 else ""
+        # Scraped descriptions keep some of the page's indentation and line breaks
+        lead["Product Title/Description"] = f"{' '.join(random.choices(WORDS, k=4)).title()}\n    {' '.join(random.choices(WORDS, k=20))}  "
+        lead["Relevancy Score (%)"] = random.randint(0, 100)
+        leads.append(lead)
+    return leads
+
+
+def sanitize_loop(value):
+    """sanitize_data as it was before the columnar store, kept as the baseline"""
+    value = value.strip().replace('\n', ' ').replace('\t', ' ')
+    while '  ' in value:
+        value = value.replace('  ', ' ')
+    return value
+
+
+def export_dicts(leads, filename):
+    """Export leads the way export_to_csv did with a list of dicts, on copies so every run starts from the raw leads"""
+    cleaned = [{key: sanitize_loop(value) if isinstance(value, str) else value for key, value in lead.items()} for lead in leads]
+    cleaned = sorted(cleaned, key=lambda x: x["Relevancy Score (%)"], reverse=True)
+    df = pd.DataFrame(cleaned)[LEAD_FIELDS]
+    df.to_csv(filename, index=False, encoding='utf-8-sig')
+
+
+def export_store(store, filename):
+    store.export_frame().to_csv(filename, index=False, encoding='utf-8-sig')
+
+
+def best_time(export, repeat):
+    """Return the fastest of several runs, which is the least disturbed by other processes"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        export()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def held_memory(build):
+    """Return what build() returns and the bytes it still holds"""
+    tracemalloc.start()
+    result = build()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, held
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dict leads vs the columnar lead store")
+    parser.add_argument("--leads", type=int, default=100000, help="Number of synthetic leads (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Exports of each kind, the fastest is reported (default: 3)")
+    args = parser.parse_args()
+
+    random.seed(0)
+    get_gazetteer()
+
+    # Each lead is built from its own strings, like leads parsed from separate pages
+    dicts, dict_bytes = held_memory(lambda: make_leads(args.leads))
+
+    def build_store():
+        store = LeadStore()
+        for lead in make_leads(args.leads):
+            store.append(lead, final=True)
+        return store
+
+    random.seed(0)
+    store, store_bytes = held_memory(build_store)
+
+    # The store sanitizes each lead as it is added, moving that work from the export into the crawl
+    start = time.perf_counter()
+    timed_store = LeadStore()
+    for lead in dicts:
+        timed_store.append(lead, final=True)
+    add_time = time.perf_counter() - start
+
+    print(f"Leads:        {args.leads}")
+    print(f"Memory:       dicts {dict_bytes / args.leads:.0f} B/lead, store {store_bytes / args.leads:.0f} B/lead ({1 - store_bytes / dict_bytes:.0%} less)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        dict_csv = os.path.join(directory, "dicts.csv")
+        store_csv = os.path.join(directory, "store.csv")
+
+        dict_time = best_time(lambda: export_dicts(dicts, dict_csv), args.repeat)
+        store_time = best_time(lambda: export_store(store, store_csv), args.repeat)
+
+        with open(dict_csv, "rb") as a, open(store_csv, "rb") as b:
+            identical = a.read() == b.read()
+
+    print(f"Export:       dicts {dict_time:.2f} s, store {store_time:.2f} s ({dict_time / store_time:.1f}x)")
+    print(f"Adding:       {add_time / args.leads * 1e6:.1f} us/lead to the store")
+    print(f"Same CSV:     {identical}")
+
+
+if __name__ == "__main__":
+    main()
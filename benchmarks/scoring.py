@@ -0,0 +1,62 @@
+"""Compare the batch relevancy scorer with the per-lead one.
+
+Run from the repository root:
+
+    python -m benchmarks.scoring --leads 20000
+"""
+import time
+import random
+import argparse
+
+from dom_extractor import extract_listings
+from indiamart_scraper import IndiaMartScraper
+from scoring import score_leads
+from utils import new_seller_info
+
+WORDS = ["cricket", "tennis", "ball", "leather", "sports", "rubber", "stand", "frame", "aluminium", "standee", "traders", "enterprises"]
+
+
+def make_leads(count):
+    """Build synthetic leads from the listings in page_source.html plus random words"""
+    with open("page_source.html", encoding="utf-8") as f:
+        titles = [lead["Product Title/Description"] for lead in extract_listings(f.read()) if lead["Product Title/Description"]]
+
+    leads = []
+    for _ in range(count):
+        lead = new_seller_info()
+        lead["Product Title/Description"] = f"{random.choice(titles)} {' '.join(random.sample(WORDS, 3))}"
+        lead["Company Name"] = f"{random.choice(WORDS).title()} {random.choice(WORDS).title()} Pvt Ltd"
+        lead["Phone Number"] = "9876543210" if random.random() < 0.5 else ""
+        lead["Address"] = "Hyderabad" if random.random() < 0.7 else ""
+        leads.append(lead)
+    return leads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-lead vs batch relevancy scoring")
+    parser.add_argument("--leads", type=int, default=20000, help="Number of synthetic leads (default: 20000)")
+    parser.add_argument("--keyword", type=str, default="roll up standee", help="Keyword to score against")
+    args = parser.parse_args()
+
+    random.seed(0)
+    leads = make_leads(args.leads)
+
+    start = time.perf_counter()
+    per_lead = [IndiaMartScraper.calculate_relevancy_score(None, lead, args.keyword) for lead in leads]
+    per_lead_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = score_leads(leads, [args.keyword])
+    batch_time = time.perf_counter() - start
+
+    # rapidfuzz finds the optimal partial alignment, fuzzywuzzy a heuristic one, so scores can differ by a few points
+    differences = [abs(a - b) for a, b in zip(per_lead, batch)]
+    print(f"Leads:        {len(leads)}")
+    print(f"Per-lead:     {per_lead_time:.3f} s ({len(leads) / per_lead_time:,.0f} leads/s)")
+    print(f"Batch:        {batch_time:.3f} s ({len(leads) / batch_time:,.0f} leads/s)")
+    print(f"Speedup:      {per_lead_time / batch_time:.1f}x")
+    print(f"Score diff:   mean {sum(differences) / len(differences):.2f}, max {max(differences)} points, {sum(d <= 5 for d in differences) / len(differences):.0%} within 5 points")
+
+
+if __name__ == "__main__":
+    main()
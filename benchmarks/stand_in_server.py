@@ -0,0 +1,198 @@
+"""Local stand-in for the IndiaMART pages the scraper reads.
+
+Serves a home page with the search form, paginated search results built on the
+FM_sldrB card markup of page_source.html, and company profile pages, with a
+configurable latency per request. Run from the repository root:
+
+    python -m benchmarks.stand_in_server --port 8000 --latency-ms 50
+"""
+import re
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, quote_plus
+
+CITIES = ["Delhi", "Mumbai", "Bengaluru", "Hyderabad", "Chennai", "Kolkata", "Pune", "Ahmedabad", "Jaipur", "Ludhiana"]
+COMPANY_WORDS = ["Sixit", "Shree", "Balaji", "Ganesh", "Krishna", "Royal", "Star", "National", "Bharat", "Modern"]
+COMPANY_KINDS = ["Sports", "Traders", "Enterprises", "Industries", "Exports", "Overseas"]
+PRODUCT_WORDS = ["Leather", "Rubber", "Tennis", "Season", "Synthetic", "Hard", "Soft", "Training", "Match", "Practice"]
+
+# Profile links must contain indiamart.com for the extractors to accept them
+PROFILE_PREFIX = "/indiamart.com/"
+
+CARD_TEMPLATE = """<div class="FM_sldrB FM_fl FM_bs enq_hash" prodname="{title}" price="{price}" id="sldr_{index}">
+<figure class="FM_pr"><div class="FM_sldrTxt FM_pa FM_p10 FM_f15">
+<p class="prd-title fasC FM_w1">{title}</p>
+<a class="clg" href="{profile}">{company}</a>
+<span class="prc">&#8377; {price}</span>
+<span class="loctn">{city}</span>
+<span class="FM_ds1 FM_bo enq_click"{pns}>Get Best Quote</span>
+</div></figure></div>"""
+
+PROFILE_TEMPLATE = """<html><head><title>{company}</title></head><body>
+<h1>{company}</h1>
+<div class="address">{street}, {city}, India</div>
+{phone}
+</body></html>"""
+
+# The number is only shown after a click, like the "View Mobile Number" button on the live site
+HIDDEN_PHONE = """<button onclick="this.textContent='Call +91-{phone}'">View Mobile Number</button>"""
+
+
+class StandInSite:
+    """Deterministic synthetic (or recorded) result and profile pages"""
+
+    def __init__(self, pages=5, cards_per_page=20, latency_ms=0, hidden_phone_share=0.3, recorded=None, seed=0):
+        self.pages = pages
+        self.cards_per_page = cards_per_page
+        self.latency_ms = latency_ms
+        self.hidden_phone_share = hidden_phone_share
+        self.recorded = recorded
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.hits = {}
+
+    def count(self, kind):
+        with self.lock:
+            self.hits[kind] = self.hits.get(kind, 0) + 1
+
+    def company(self, company_id):
+        """Return the details of a synthetic company"""
+        rng = random.Random(f"{self.seed}:{company_id}")
+        return {
+            "name": f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_KINDS)} {company_id}",
+            "city": rng.choice(CITIES),
+            "street": f"{rng.randint(1, 400)}, {rng.choice(COMPANY_WORDS)} Nagar",
+            "phone": f"9{rng.randint(100000000, 999999999)}",
+            "hidden": rng.random() < self.hidden_phone_share,
+        }
+
+    def home_page(self):
+        return """<html><body><form action="/search.mp" method="get">
+<input id="search-input" name="ss" type="text"><button type="submit">Search</button>
+</form></body></html>"""
+
+    def next_link(self, keyword, page_num):
+        if page_num >= self.pages:
+            return ""
+        return f'<a class="next" href="/search.mp?ss={quote_plus(keyword)}&page={page_num + 1}">Next</a>'
+
+    def results_page(self, keyword, page_num, base_url):
+        """Return a results page, or an empty one past the last page"""
+        if page_num > self.pages:
+            return "<html><body><p>No results</p></body></html>"
+
+        if self.recorded:
+            # Keep the recorded markup but point its company links at this server and drop the scripts,
+            # except the JSON-LD data, so the benchmark never reaches the network
+            html = re.sub(r"<script(?![^>]*ld\+json)[^>]*>.*?</script>", "", self.recorded, flags=re.S)
+            html = html.replace("https://www.indiamart.com/", f"{base_url}{PROFILE_PREFIX}")
+            return html.replace("</body>", f"{self.next_link(keyword, page_num)}</body>")
+
+        cards = []
+        for index in range(self.cards_per_page):
+            company_id = (page_num - 1) * self.cards_per_page + index
+            company = self.company(company_id)
+            rng = random.Random(f"{self.seed}:product:{company_id}")
+            cards.append(CARD_TEMPLATE.format(
+                index=index,
+                title=f"{rng.choice(PRODUCT_WORDS)} {keyword.title()}",
+                price=f"{rng.randint(50, 2000)}/ Piece",
+                profile=f"{PROFILE_PREFIX}company-{company_id}/",
+                company=company["name"],
+                city=company["city"],
+                # Cards of companies that hide their number carry no PNS number either
+                pns="" if company["hidden"] else f' pnsnumber="{company["phone"]}"',
+            ))
+        return (
+            '<html><body><div class="FM_grid">'
+            + "\n".join(cards)
+            + f"</div>{self.next_link(keyword, page_num)}</body></html>"
+        )
+
+    def profile_page(self, path):
+        match = re.search(r"company-(\d+)", path)
+        company_id = int(match.group(1)) if match else sum(path.encode())
+        company = self.company(company_id)
+        if company["hidden"]:
+            phone = HIDDEN_PHONE.format(phone=company["phone"])
+        else:
+            phone = f"<span>Call +91-{company['phone']}</span>"
+        return PROFILE_TEMPLATE.format(company=company["name"], street=company["street"], city=company["city"], phone=phone)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Route requests to the stand-in site"""
+
+    site = None
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.site.latency_ms:
+            time.sleep(self.site.latency_ms / 1000)
+
+        url = urlparse(self.path)
+        base_url = f"http://{self.headers.get('Host')}"
+        if url.path in ("", "/"):
+            self.site.count("home")
+            body = self.site.home_page()
+        elif url.path == "/search.mp":
+            query = parse_qs(url.query)
+            self.site.count("results")
+            body = self.site.results_page(query.get("ss", [""])[0], int(query.get("page", ["1"])[0]), base_url)
+        elif url.path.startswith(PROFILE_PREFIX):
+            self.site.count("profile")
+            body = self.site.profile_page(url.path)
+        else:
+            self.send_error(404)
+            return
+
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Function to run the stand-in site in the background
+def start_server(site, port=0):
+    """Serve the site on a background thread; returns the server and its base URL"""
+    handler = type("Handler", (StandInHandler,), {"site": site})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stand-in-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve stand-in IndiaMART result and profile pages")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    parser.add_argument("--pages", type=int, default=5, help="Number of result pages (default: 5)")
+    parser.add_argument("--cards", type=int, default=20, help="Listings per result page (default: 20)")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay added to every response (default: 0)")
+    parser.add_argument("--recorded", type=str, help="Serve this saved results page (e.g. page_source.html) for every page")
+    args = parser.parse_args()
+
+    recorded = None
+    if args.recorded:
+        with open(args.recorded, encoding="utf-8") as f:
+            recorded = f.read()
+
+    site = StandInSite(pages=args.pages, cards_per_page=args.cards, latency_ms=args.latency_ms, recorded=recorded)
+    server, base_url = start_server(site, args.port)
+    print(f"Serving stand-in IndiaMART at {base_url}/ (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+# Import utility functions
+from utils import normalize_url
+
+# Default location of the crawl checkpoints
+CHECKPOINT_FILE = os.path.join("checkpoints", "crawl.db")
+
+
+# Function to build the identity of a lead within one crawl
+def lead_key(seller_info):
+    """Return a key that identifies the same listing across restarts"""
+    return "|".join([
+        normalize_url(seller_info["Company Profile URL"]),
+        seller_info["Company Name"].strip().lower(),
+        seller_info["Product Title/Description"].strip().lower(),
+    ])
+
+
+class CrawlCheckpoint:
+    """Record the progress of a keyword crawl in SQLite so it can be resumed"""
+
+    def __init__(self, keyword, path=CHECKPOINT_FILE):
+        self.keyword = keyword
+        self.path = path
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Written from the scraping loop and the enrichment workers, guarded by self.lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS crawls ("
+            " keyword TEXT PRIMARY KEY,"
+            " page_num INTEGER NOT NULL,"
+            " page_url TEXT NOT NULL,"
+            " completed INTEGER NOT NULL DEFAULT 0,"
+            " updated_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS leads ("
+            " keyword TEXT NOT NULL,"
+            " lead_key TEXT NOT NULL,"
+            " seq INTEGER NOT NULL,"
+            " data TEXT NOT NULL,"
+            " PRIMARY KEY (keyword, lead_key));"
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            " keyword TEXT NOT NULL,"
+            " url TEXT NOT NULL,"
+            " phone TEXT NOT NULL,"
+            " address TEXT NOT NULL,"
+            " PRIMARY KEY (keyword, url));"
+        )
+        self.conn.commit()
+        self.collected = self.load_lead_keys()
+
+    def load_lead_keys(self):
+        """Return the keys of the leads already collected for this keyword"""
+        rows = self.conn.execute("SELECT lead_key FROM leads WHERE keyword = ?", (self.keyword,))
+        return {row[0] for row in rows}
+
+    def resume_point(self):
+        """Return (page_num, page_url) to continue an unfinished crawl from, or None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT page_num, page_url, completed FROM crawls WHERE keyword = ?", (self.keyword,)
+            ).fetchone()
+        if row is None or row[2]:
+            return None
+        return row[0], row[1]
+
+    def load_leads(self):
+        """Return the leads already collected for this keyword, in collection order"""
+        with self.lock:
+            rows = self.conn.execute("SELECT data FROM leads WHERE keyword = ? ORDER BY seq", (self.keyword,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def reset(self):
+        """Forget any previous progress for this keyword"""
+        with self.lock:
+            for table in ("crawls", "leads", "profiles"):
+                self.conn.execute(f"DELETE FROM {table} WHERE keyword = ?", (self.keyword,))
+            self.conn.commit()
+            self.collected = set()
+
+    def save_page(self, page_num, page_url):
+        """Record the page the crawl should continue from"""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO crawls (keyword, page_num, page_url, completed, updated_at) VALUES (?, ?, ?, 0, ?)",
+                (self.keyword, page_num, page_url, time.time())
+            )
+            self.conn.commit()
+
+    def has_lead(self, seller_info):
+        """Return True if this listing was already collected"""
+        return lead_key(seller_info) in self.collected
+
+    def save_lead(self, seller_info):
+        """Insert or update a collected lead"""
+        key = lead_key(seller_info)
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO leads (keyword, lead_key, seq, data) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (keyword, lead_key) DO UPDATE SET data = excluded.data",
+                (self.keyword, key, len(self.collected), json.dumps(seller_info))
+            )
+            self.conn.commit()
+            self.collected.add(key)
+
+    def save_profile(self, url, profile_info):
+        """Record the details taken from a processed profile page"""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO profiles (keyword, url, phone, address) VALUES (?, ?, ?, ?)",
+                (self.keyword, normalize_url(url), profile_info.get("Phone Number", ""), profile_info.get("Address", ""))
+            )
+            self.conn.commit()
+
+    def get_profile(self, url):
+        """Return the details of an already processed profile page, or None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT phone, address FROM profiles WHERE keyword = ? AND url = ?", (self.keyword, normalize_url(url))
+            ).fetchone()
+        if row is None:
+            return None
+        return {"Phone Number": row[0], "Address": row[1]}
+
+    def finish(self):
+        """Mark the crawl as completed"""
+        with self.lock:
+            self.conn.execute("UPDATE crawls SET completed = 1, updated_at = ? WHERE keyword = ?", (time.time(), self.keyword))
+            self.conn.commit()
+
+    def close(self):
+        """Close the checkpoint database"""
+        with self.lock:
+            self.conn.close()
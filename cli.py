@@ -1,13 +1,32 @@
 #!/usr/bin/env python
 import argparse
 import os
+import json
 import sys
-from indiamart_scraper import IndiaMartScraper
+from datetime import datetime
+from indiamart_scraper import IndiaMartScraper, BACKENDS, SESSION_FILE
+from worker_pool import PageWorkerPool
+from profile_cache import ProfileCache, CACHE_FILE
+from checkpoint import CrawlCheckpoint, CHECKPOINT_FILE
+from sinks import create_sink, external_sort
+from dedup import DedupIndex, DEDUP_FILE
+from job_queue import JobQueue, read_keyword_file, combine_outputs
+from waits import RatePolicy
+from selector_cache import SelectorCache, SELECTOR_FILE
+from lite_profile import LiteProfile
+from metrics import Metrics
+from command_accounting import CommandAccounting
+from artifacts import ArtifactWriter, ARTIFACTS_DIR, ARTIFACT_RETENTION
+from retry_policy import RetryBudget, CircuitBreaker
+from warehouse import WarehouseSink, WAREHOUSE_FILE, SORT_ORDERS, query_leads
 from utils import setup_logger
 
 def parse_arguments():
     """Parse command line arguments"""
-    parser = argparse.ArgumentParser(description="IndiaMART Lead Scraper - Extract leads from IndiaMART based on product keywords")
+    parser = argparse.ArgumentParser(
+        description="IndiaMART Lead Scraper - Extract leads from IndiaMART based on product keywords",
+        epilog="Run 'cli.py export -h' to export leads from the warehouse without scraping"
+    )
     
     parser.add_argument(
         "--keyword", "-k",
@@ -19,7 +38,7 @@ def parse_arguments():
         "--output", "-o",
         type=str,
         default="leads.csv",
-        help="Output CSV file name (default: leads.csv)"
+        help="Output file name, .csv unless streaming to .jsonl or .parquet (default: leads.csv)"
     )
     
     parser.add_argument(
@@ -35,47 +54,596 @@ def parse_arguments():
         help="Run in headless mode (no browser UI)"
     )
     
+    parser.add_argument(
+        "--backend", "-b",
+        type=str,
+        choices=BACKENDS,
+        default="selenium",
+        help="Listing extraction backend: selenium reads each field from the browser, dom parses one page snapshot, js extracts all listings in one browser call, http downloads result and profile pages without the browser after login (default: selenium)"
+    )
+    
+    parser.add_argument(
+        "--enrich-workers", "-w",
+        type=int,
+        default=0,
+        help="Number of company profiles to fetch in parallel over HTTP (default: 0, visit profiles one at a time in the browser)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of browsers that scrape result pages in parallel (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--worker-memory",
+        type=int,
+        default=1024,
+        help="Memory limit in MB for each worker browser before it is restarted (default: 1024)"
+    )
+    
+    parser.add_argument(
+        "--session-file",
+        type=str,
+        default=SESSION_FILE,
+        help=f"File used to keep the login session between runs (default: {SESSION_FILE})"
+    )
+    
+    parser.add_argument(
+        "--no-session",
+        action="store_true",
+        help="Always log in with OTP and don't save the session"
+    )
+    
+    parser.add_argument(
+        "--cache-file",
+        type=str,
+        default=CACHE_FILE,
+        help=f"Cache of company profile details shared between runs (default: {CACHE_FILE})"
+    )
+    
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=168,
+        help="Hours before a cached company profile is fetched again (default: 168)"
+    )
+    
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=50000,
+        help="Maximum number of cached company profiles, least recently used are evicted first (default: 50000)"
+    )
+    
+    parser.add_argument(
+        "--cache-html",
+        action="store_true",
+        help="Also keep a compressed copy of each profile page in the cache"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always visit company profile pages and don't cache them"
+    )
+    
+    parser.add_argument(
+        "--lite",
+        action="store_true",
+        help="Don't load images, fonts, media or analytics scripts in the browser"
+    )
+    
+    parser.add_argument(
+        "--lite-allow",
+        type=str,
+        default="",
+        help="With --lite, comma-separated categories (image, font, media, tracker) or URL fragments to load anyway"
+    )
+    
+    parser.add_argument(
+        "--lite-deny",
+        type=str,
+        default="",
+        help="With --lite, comma-separated extra URL patterns to block, e.g. '*chat*,*.css'"
+    )
+    
+    parser.add_argument(
+        "--selector-file",
+        type=str,
+        default=SELECTOR_FILE,
+        help=f"File where the selectors that matched on the login and results pages are remembered between runs (default: {SELECTOR_FILE})"
+    )
+    
+    parser.add_argument(
+        "--no-selector-cache",
+        action="store_true",
+        help="Don't remember selectors between runs; every run starts with the full selector fallbacks"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the last unfinished crawl for this keyword instead of starting over"
+    )
+    
+    parser.add_argument(
+        "--checkpoint-file",
+        type=str,
+        default=CHECKPOINT_FILE,
+        help=f"File where crawl progress is recorded (default: {CHECKPOINT_FILE})"
+    )
+    
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write each lead to the output file as soon as it is collected instead of exporting at the end"
+    )
+    
+    parser.add_argument(
+        "--sorted-output",
+        type=str,
+        help="With --stream, also write a copy of the CSV/JSONL output sorted by relevancy to this file"
+    )
+    
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Drop suppliers already seen on earlier pages or in earlier runs, matched by profile URL, phone or, for listings without a profile URL, company name"
+    )
+    
+    parser.add_argument(
+        "--dedup-file",
+        type=str,
+        default=DEDUP_FILE,
+        help=f"File where the seen suppliers are kept between runs (default: {DEDUP_FILE})"
+    )
+    
+    parser.add_argument(
+        "--warehouse",
+        action="store_true",
+        help="Also upsert every lead into the SQLite lead warehouse, which keeps the suppliers of all runs for 'cli.py export'"
+    )
+    
+    parser.add_argument(
+        "--warehouse-file",
+        type=str,
+        default=WAREHOUSE_FILE,
+        help=f"File of the lead warehouse (default: {WAREHOUSE_FILE})"
+    )
+    
+    parser.add_argument(
+        "--batch-scoring",
+        action="store_true",
+        help="Score leads in batches on a background thread instead of one at a time in the scraping loop"
+    )
+    
+    parser.add_argument(
+        "--synonyms",
+        type=str,
+        default="",
+        help="Comma-separated synonyms of the keyword that also count as matches (used with --batch-scoring)"
+    )
+    
+    parser.add_argument(
+        "--pacing",
+        type=float,
+        default=1.0,
+        help="Scale of the human-like pauses between listings, pages and profile visits; 0 disables them (default: 1.0)"
+    )
+    
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        help="Write a JSON summary of the run (stage timings, pages/min, leads/min, retries, waits) to this file"
+    )
+    
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve live metrics in the Prometheus text format on this port, for long-running jobs"
+    )
+    
+    parser.add_argument(
+        "--command-stats",
+        action="store_true",
+        help="Count WebDriver commands and their latency per call site and per lead, and log the ranking at the end"
+    )
+    
+    parser.add_argument(
+        "--command-stats-file",
+        type=str,
+        help="With --command-stats, also write the full ranking to this JSON file"
+    )
+    
+    parser.add_argument(
+        "--artifact-dir",
+        type=str,
+        default=ARTIFACTS_DIR,
+        help=f"Directory for the per-run folders of debug page sources and screenshots (default: {ARTIFACTS_DIR})"
+    )
+    
+    parser.add_argument(
+        "--artifact-every",
+        type=int,
+        default=10,
+        help="Save the page source of every Nth results page; errors are always saved, 0 saves errors only (default: 10)"
+    )
+    
+    parser.add_argument(
+        "--artifact-max-mb",
+        type=float,
+        default=200,
+        help="Size cap of the debug artifacts of all kept runs; the oldest are deleted beyond it (default: 200)"
+    )
+    
+    parser.add_argument(
+        "--artifact-runs",
+        type=int,
+        default=ARTIFACT_RETENTION,
+        help=f"Number of runs whose debug artifacts are kept, this one included (default: {ARTIFACT_RETENTION})"
+    )
+    
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=0,
+        help="Results pages to load ahead while the current one is processed; the browser backends load one in a second tab (default: 0)"
+    )
+    
+    parser.add_argument(
+        "--enrich-queue",
+        type=int,
+        default=0,
+        help="With --enrich-workers, pause the crawl while this many leads wait for their profile (default: 0, no limit)"
+    )
+    
+    parser.add_argument(
+        "--retry-budget",
+        type=int,
+        default=100,
+        help="Maximum number of retries in the whole run, across login, search and profile visits (default: 100)"
+    )
+    
+    parser.add_argument(
+        "--breaker-threshold",
+        type=float,
+        default=0.5,
+        help="Pause profile visits when this share of the last 20 failed (default: 0.5)"
+    )
+    
+    parser.add_argument(
+        "--breaker-cooldown",
+        type=float,
+        default=60,
+        help="Seconds profile visits are paused for, doubling while the site keeps failing (default: 60)"
+    )
+    
+    parser.add_argument(
+        "--batch",
+        type=str,
+        help="File with one 'keyword[,min_leads[,output]]' per line to scrape in one session; --output becomes the combined file"
+    )
+    
+    parser.add_argument(
+        "--batch-dir",
+        type=str,
+        default="batch_output",
+        help="Directory for per-keyword outputs and the batch job queue (default: batch_output)"
+    )
+    
+    parser.add_argument(
+        "--new-batch",
+        action="store_true",
+        help="With --batch, scrape every keyword again instead of resuming an unfinished run of the file"
+    )
+    
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="With --batch, run keywords that failed in an earlier run again"
+    )
+    
     return parser.parse_args()
 
+def parse_export_arguments(argv):
+    """Parse the arguments of the export subcommand"""
+    parser = argparse.ArgumentParser(prog="cli.py export", description="Export a filtered, sorted slice of the lead warehouse without scraping")
+    
+    parser.add_argument(
+        "--warehouse-file",
+        type=str,
+        default=WAREHOUSE_FILE,
+        help=f"File of the lead warehouse (default: {WAREHOUSE_FILE})"
+    )
+    
+    parser.add_argument(
+        "--output", "-o",
+        type=str,
+        default="leads.csv",
+        help="Output file, .csv, .jsonl or .parquet (default: leads.csv)"
+    )
+    
+    parser.add_argument(
+        "--keyword", "-k",
+        type=str,
+        help="Only leads found when searching for this keyword"
+    )
+    
+    parser.add_argument(
+        "--city",
+        type=str,
+        help="Only leads located in this city"
+    )
+    
+    parser.add_argument(
+        "--state",
+        type=str,
+        help="Only leads located in this state"
+    )
+    
+    parser.add_argument(
+        "--has-phone",
+        action="store_true",
+        help="Only leads with a phone number"
+    )
+    
+    parser.add_argument(
+        "--min-score",
+        type=int,
+        help="Only leads with at least this relevancy score"
+    )
+    
+    parser.add_argument(
+        "--since-days",
+        type=float,
+        help="Only leads seen in the last this many days"
+    )
+    
+    parser.add_argument(
+        "--sort",
+        type=str,
+        choices=list(SORT_ORDERS),
+        default="relevancy",
+        help="Order of the exported leads (default: relevancy)"
+    )
+    
+    parser.add_argument(
+        "--limit",
+        type=int,
+        help="Export at most this many leads"
+    )
+    
+    return parser.parse_args(argv)
+
+def export_warehouse(argv):
+    """Write the warehouse leads matching the filters to the output file"""
+    args = parse_export_arguments(argv)
+    if not os.path.exists(args.warehouse_file):
+        print(f"No lead warehouse at {args.warehouse_file}. Scrape with --warehouse first.")
+        return 1
+    
+    directory = os.path.dirname(args.output)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    
+    sink = create_sink(args.output)
+    try:
+        for lead in query_leads(
+            args.warehouse_file,
+            keyword=args.keyword,
+            city=args.city,
+            state=args.state,
+            has_phone=args.has_phone,
+            min_score=args.min_score,
+            since_days=args.since_days,
+            sort=args.sort,
+            limit=args.limit
+        ):
+            sink.write(lead)
+    finally:
+        sink.close()
+    
+    print(f"{sink.count} leads exported to {args.output}")
+    return 0
+
+def scrape_keyword(scraper, args, keyword, min_leads, output, resume=False):
+    """Search for one keyword, scrape its leads and write them to output; returns the lead count or None"""
+    logger = scraper.logger
+    logger.info(f"Using keyword: {keyword}")
+    
+    scraper.reset_leads()
+    directory = os.path.dirname(output)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    
+    # Open the streaming output
+    scraper.sinks = [create_sink(output)] if args.stream else []
+    if args.warehouse:
+        scraper.sinks.append(WarehouseSink(args.warehouse_file, keyword=keyword, run_id=args.run_id))
+    
+    # Record progress so an interrupted crawl can be resumed
+    checkpoint = CrawlCheckpoint(keyword, args.checkpoint_file)
+    
+    try:
+        start_page = scraper.resume_from_checkpoint(checkpoint) if resume else None
+        
+        if start_page:
+            search_success = True
+        else:
+            if resume:
+                print("No unfinished crawl to resume. Starting a new search.")
+            checkpoint.reset()
+            start_page = 1
+            
+            # Search for the product
+            search_success = scraper.search_product(keyword)
+        
+        if not search_success:
+            logger.error("Search failed.")
+            print("Search failed. Please try again.")
+            return None
+        
+        # Scrape the search results
+        if args.workers > 1 and args.backend != "http":
+            pool = PageWorkerPool(scraper, workers=args.workers, memory_limit_mb=args.worker_memory)
+            pool.scrape(keyword, min_leads=min_leads)
+        else:
+            scraper.scrape_search_results(keyword, min_leads=min_leads, checkpoint=checkpoint, start_page=start_page)
+        
+        if args.stream:
+            # Leads are already on disk, optionally produce the sorted copy
+            with scraper.metrics.span("export"):
+                for sink in scraper.sinks:
+                    sink.close()
+                if args.sorted_output:
+                    external_sort(output, args.sorted_output)
+                    print(f"Sorted leads written to {args.sorted_output}")
+            export_success = scraper.lead_count > 0
+        else:
+            # Export the leads to a CSV file
+            export_success = scraper.export_to_csv(filename=output)
+        
+        if export_success:
+            logger.info(f"Scraping completed successfully. {scraper.lead_count} leads exported to {output}")
+            print(f"\nScraping completed! {scraper.lead_count} leads have been exported to {output}")
+        return scraper.lead_count
+    finally:
+        scraper.checkpoint = None
+        checkpoint.close()
+        for sink in scraper.sinks:
+            if not sink.closed:
+                sink.close()
+
+def run_batch(scraper, args):
+    """Scrape every keyword of the batch file through the logged-in session"""
+    logger = scraper.logger
+    if not os.path.exists(args.batch_dir):
+        os.makedirs(args.batch_dir)
+    
+    # The job queue remembers each keyword's status, so a rerun continues where it stopped
+    queue = JobQueue(os.path.join(args.batch_dir, "jobs.db"))
+    try:
+        jobs = read_keyword_file(args.batch, args.min_leads, args.batch_dir)
+        # Only this file's keywords are run and combined, not those left from other batch files
+        keywords = [job["keyword"] for job in jobs]
+        queue.add_jobs(jobs)
+        if args.retry_failed:
+            queue.retry_failed(keywords)
+        if args.new_batch or queue.batch_finished(keywords):
+            # The last run of this file finished, so this is a new run rather than a resume
+            queue.start_batch(keywords)
+        
+        while True:
+            job = queue.next_job(keywords)
+            if job is None:
+                break
+            
+            # A job left running was interrupted, pick it up from its checkpoint
+            resume = job["status"] == "running"
+            queue.update(job["keyword"], "running")
+            print(f"\n=== {job['keyword']} ===")
+            
+            try:
+                leads_count = scrape_keyword(scraper, args, job["keyword"], job["min_leads"], job["output"], resume=resume)
+            except KeyboardInterrupt:
+                raise
+            except Exception as e:
+                logger.error(f"Keyword '{job['keyword']}' failed: {e}")
+                queue.update(job["keyword"], "failed", error=str(e))
+                continue
+            
+            if leads_count is None:
+                queue.update(job["keyword"], "failed", error="Search failed")
+            else:
+                queue.update(job["keyword"], "done", leads=leads_count)
+        
+        done = queue.jobs("done", keywords)
+        failed = queue.jobs("failed", keywords)
+        written = combine_outputs(done, args.output)
+        logger.info(f"Batch finished: {len(done)} keywords done, {len(failed)} failed, {written} unique leads in {args.output}")
+        print(f"\nBatch finished! {len(done)} keywords done, {len(failed)} failed. {written} unique leads combined into {args.output}")
+    finally:
+        queue.close()
+
 def main():
     """Main entry point for the CLI"""
+    # Exporting from the warehouse needs neither a login nor a browser
+    if sys.argv[1:2] == ["export"]:
+        sys.exit(export_warehouse(sys.argv[2:]))
+    
     # Parse command line arguments
     args = parse_arguments()
+    # Leads upserted into the warehouse record the run that found them
+    args.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
     
     # Set up logger
     logger = setup_logger()
     
+    # Open the company profile cache
+    profile_cache = None
+    if not args.no_cache:
+        profile_cache = ProfileCache(args.cache_file, ttl=args.cache_ttl * 3600, max_entries=args.cache_size, store_html=args.cache_html)
+    
+    # Collect stage timings and counters, optionally served to Prometheus while the run goes on
+    metrics = Metrics()
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+        logger.info(f"Serving metrics on http://127.0.0.1:{args.metrics_port}/metrics")
+    
+    # Count WebDriver round-trips if asked to
+    accounting = CommandAccounting() if args.command_stats else None
+    
+    # Open the learned selector cache
+    selector_cache = None if args.no_selector_cache else SelectorCache(args.selector_file)
+    
+    # Open the supplier dedup index
+    dedup = DedupIndex(args.dedup_file) if args.dedup else None
+    
     # Create an instance of the scraper
-    scraper = IndiaMartScraper(headless=args.headless)
+    scraper = IndiaMartScraper(
+        headless=args.headless,
+        backend=args.backend,
+        enrich_workers=args.enrich_workers,
+        session_file=None if args.no_session else args.session_file,
+        profile_cache=profile_cache,
+        keep_leads=not args.stream,
+        dedup=dedup,
+        batch_scoring=args.batch_scoring,
+        synonyms=[synonym.strip() for synonym in args.synonyms.split(",") if synonym.strip()],
+        rate_policy=RatePolicy(scale=args.pacing),
+        selector_cache=selector_cache,
+        lite=LiteProfile(
+            allow=[entry.strip() for entry in args.lite_allow.split(",") if entry.strip()],
+            deny=[entry.strip() for entry in args.lite_deny.split(",") if entry.strip()]
+        ) if args.lite else None,
+        metrics=metrics,
+        accounting=accounting,
+        artifacts=ArtifactWriter(args.artifact_dir, every_n_pages=args.artifact_every, max_bytes=int(args.artifact_max_mb * 1024 * 1024), keep_runs=args.artifact_runs),
+        retry_budget=RetryBudget(args.retry_budget),
+        prefetch=args.prefetch,
+        enrich_queue=args.enrich_queue,
+        breaker=CircuitBreaker("enrichment", threshold=args.breaker_threshold, cooldown=args.breaker_cooldown, metrics=metrics)
+    )
+    
+    started = False
     
     try:
         # Login to IndiaMART
         login_success = scraper.login()
         
         if login_success:
-            # Get the search keyword from the user if not provided as an argument
-            keyword = args.keyword
-            if not keyword:
-                keyword = input("Enter the product keyword to search for: ")
-            
-            logger.info(f"Using keyword: {keyword}")
-            
-            # Search for the product
-            search_success = scraper.search_product(keyword)
-            
-            if search_success:
-                # Scrape the search results
-                leads = scraper.scrape_search_results(keyword, min_leads=args.min_leads)
-                
-                # Export the leads to a CSV file
-                export_success = scraper.export_to_csv(filename=args.output)
-                
-                if export_success:
-                    logger.info(f"Scraping completed successfully. {len(leads)} leads exported to {args.output}")
-                    print(f"\nScraping completed! {len(leads)} leads have been exported to {args.output}")
+            started = True
+            if args.batch:
+                run_batch(scraper, args)
             else:
-                logger.error("Search failed.")
-                print("Search failed. Please try again.")
+                # Get the search keyword from the user if not provided as an argument
+                keyword = args.keyword
+                if not keyword:
+                    keyword = input("Enter the product keyword to search for: ")
+                
+                scrape_keyword(scraper, args, keyword, args.min_leads, args.output, resume=args.resume)
         else:
             logger.error("Login failed.")
             print("Login failed. Please check your credentials and try again.")
@@ -83,13 +651,25 @@ def main():
     except KeyboardInterrupt:
         logger.info("Operation cancelled by user.")
         print("\nOperation cancelled by user.")
+        if started:
+            print("Progress has been saved. Run again with --resume (or the same --batch file) to continue.")
     except Exception as e:
         logger.error(f"An unexpected error occurred: {e}")
         print(f"An error occurred: {e}")
     finally:
         # Close the browser
         logger.info("Closing browser and ending session")
+        if dedup:
+            dedup.close()
         scraper.close()
+        if args.metrics_file:
+            metrics.write_json(args.metrics_file)
+            print(f"Run metrics written to {args.metrics_file}")
+        metrics.close()
+        if accounting and args.command_stats_file:
+            with open(args.command_stats_file, "w", encoding="utf-8") as f:
+                json.dump(accounting.report(top=None), f, indent=2)
+            print(f"WebDriver command stats written to {args.command_stats_file}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
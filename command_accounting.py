@@ -0,0 +1,124 @@
+import os
+import sys
+import time
+import linecache
+import threading
+import selenium
+
+# Frames inside Selenium or this module are skipped when looking for the call site
+SELENIUM_DIR = os.path.dirname(os.path.abspath(selenium.__file__))
+THIS_FILE = os.path.abspath(__file__)
+
+
+# Function to find the scraper code that issued a command
+def call_site():
+    """Return (function:line, filename) of the first caller outside Selenium"""
+    frame = sys._getframe(1)
+    while frame:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename != THIS_FILE and not filename.startswith(SELENIUM_DIR):
+            return f"{frame.f_code.co_name}:{frame.f_lineno}", filename
+        frame = frame.f_back
+    return "unknown", ""
+
+
+class CommandAccounting:
+    """Counts WebDriver round-trips and their latency per call site and per lead"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (site, command) -> [count, seconds, filename]
+        self.sites = {}
+        self.total = 0
+        self.seconds = 0.0
+        # [count, seconds] of every finished lead, and of the one being extracted
+        self.leads = []
+        self.current = None
+
+    def attach(self, driver):
+        """Route every command of the driver and its elements through the accounting"""
+        execute = driver.execute
+
+        def accounted_execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                site, filename = call_site()
+                self.record(site, filename, driver_command, time.perf_counter() - start)
+
+        # WebElements send their commands through their parent driver's execute
+        driver.execute = accounted_execute
+        return driver
+
+    def record(self, site, filename, command, seconds):
+        with self.lock:
+            entry = self.sites.get((site, command))
+            if entry is None:
+                entry = self.sites[(site, command)] = [0, 0.0, filename]
+            entry[0] += 1
+            entry[1] += seconds
+            self.total += 1
+            self.seconds += seconds
+            if self.current is not None:
+                self.current[0] += 1
+                self.current[1] += seconds
+
+    def begin_lead(self):
+        """Attribute the following commands to a new lead, closing the previous one"""
+        with self.lock:
+            if self.current is not None:
+                self.leads.append(self.current)
+            self.current = [0, 0.0]
+
+    def end_lead(self):
+        """Stop attributing commands to a lead"""
+        with self.lock:
+            if self.current is not None:
+                self.leads.append(self.current)
+            self.current = None
+
+    def report(self, top=20):
+        """Return totals, per-lead figures and the call sites ranked by time spent"""
+        with self.lock:
+            ranked = sorted(self.sites.items(), key=lambda item: item[1][1], reverse=True)
+            counts = sorted(count for count, _ in self.leads)
+            lead_seconds = sum(seconds for _, seconds in self.leads)
+            return {
+                "commands": self.total,
+                "seconds": round(self.seconds, 3),
+                "leads": len(self.leads),
+                "per_lead": {
+                    "mean_commands": round(sum(counts) / len(counts), 1) if counts else 0.0,
+                    "median_commands": counts[len(counts) // 2] if counts else 0,
+                    "max_commands": counts[-1] if counts else 0,
+                    "mean_ms": round(lead_seconds / len(counts) * 1000, 1) if counts else 0.0,
+                },
+                "sites": [
+                    {
+                        "site": site,
+                        "command": command,
+                        "count": count,
+                        "total_ms": round(seconds * 1000, 1),
+                        "mean_ms": round(seconds / count * 1000, 2),
+                        "code": linecache.getline(filename, int(site.rsplit(":", 1)[1])).strip() if filename else "",
+                    }
+                    for (site, command), (count, seconds, filename) in ranked[:top]
+                ],
+            }
+
+    def format_report(self, top=20):
+        """Return the report as a table for the log"""
+        report = self.report(top)
+        per_lead = report["per_lead"]
+        lines = [
+            f"WebDriver commands: {report['commands']} in {report['seconds']} s",
+            f"Per lead ({report['leads']} leads): mean {per_lead['mean_commands']} commands / {per_lead['mean_ms']} ms, "
+            f"median {per_lead['median_commands']}, max {per_lead['max_commands']}",
+            f"{'call site':32} {'command':24} {'count':>7} {'total ms':>10} {'mean ms':>8}  code",
+        ]
+        for entry in report["sites"]:
+            lines.append(
+                f"{entry['site']:32} {entry['command']:24} {entry['count']:>7} {entry['total_ms']:>10} {entry['mean_ms']:>8}  {entry['code'][:80]}"
+            )
+        return "\n".join(lines)
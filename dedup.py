@@ -0,0 +1,154 @@
+import os
+import re
+import sqlite3
+import threading
+from fuzzywuzzy import fuzz
+
+# Import utility functions
+from utils import normalize_url, validate_phone
+
+# Default location of the persisted dedup index
+DEDUP_FILE = os.path.join("cache", "dedup.db")
+
+# Legal-form and filler words that don't tell two suppliers apart
+NAME_STOPWORDS = {
+    "the", "and", "pvt", "private", "ltd", "limited", "llp", "inc", "co", "company",
+    "corp", "corporation", "india", "m", "s",
+}
+
+
+# Function to canonicalize company names
+def canonical_name(name):
+    """Lowercase a company name and drop punctuation and legal-form words"""
+    tokens = re.findall(r"[a-z0-9]+", (name or "").lower())
+    return " ".join(token for token in tokens if token not in NAME_STOPWORDS)
+
+
+# Function to normalize phone numbers for matching
+def canonical_phone(phone):
+    """Return the 10-digit form of a phone number, or an empty string"""
+    phone = validate_phone(phone or "")
+    return phone if len(phone) == 10 and phone.isdigit() else ""
+
+
+class DedupIndex:
+    """Index of seen suppliers by profile URL, phone number and company name"""
+
+    def __init__(self, path=DEDUP_FILE, name_threshold=92):
+        self.path = path
+        self.name_threshold = name_threshold
+        self.lock = threading.Lock()
+        self.urls = set()
+        self.phones = set()
+        # Canonical name -> set of (url, phone) of the suppliers seen under it, so two
+        # suppliers sharing a common trade name aren't taken for one
+        self.names = {}
+        # Blocking: names are only fuzzy-compared with names sharing a block key
+        self.blocks = {}
+        self.conn = None
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS seen (kind TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (kind, value))")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS names (name TEXT NOT NULL, url TEXT NOT NULL, phone TEXT NOT NULL,"
+                " PRIMARY KEY (name, url, phone))"
+            )
+            self.conn.commit()
+            for kind, value in self.conn.execute("SELECT kind, value FROM seen"):
+                if kind == "name":
+                    # Indexes written before names kept their supplier's URL and phone
+                    self._remember_name(value, "", "")
+                else:
+                    self._remember(kind, value)
+            for name, url, phone in self.conn.execute("SELECT name, url, phone FROM names"):
+                self._remember_name(name, url, phone)
+
+    def block_keys(self, name):
+        """Return the block keys of a canonical name: prefixes of its first and longest tokens"""
+        tokens = name.split()
+        if not tokens:
+            return []
+        return list({tokens[0][:4], max(tokens, key=len)[:4]})
+
+    def _remember(self, kind, value):
+        if kind == "url":
+            self.urls.add(value)
+        elif kind == "phone":
+            self.phones.add(value)
+
+    def _remember_name(self, name, url, phone):
+        if name not in self.names:
+            self.names[name] = set()
+            for key in self.block_keys(name):
+                self.blocks.setdefault(key, []).append(name)
+        self.names[name].add((url, phone))
+
+    def identity(self, seller_info):
+        """Return the canonical profile URL, phone number and company name of a lead"""
+        return (
+            normalize_url(seller_info["Company Profile URL"]),
+            canonical_phone(seller_info["Phone Number"]),
+            canonical_name(seller_info["Company Name"]),
+        )
+
+    def keys(self, seller_info):
+        """Return the (kind, value) identity keys of a lead"""
+        return [(kind, value) for kind, value in zip(("url", "phone", "name"), self.identity(seller_info)) if value]
+
+    def similar_names(self, name):
+        """Yield the indexed names equal to or within the fuzzy threshold of a name"""
+        if name in self.names:
+            yield name
+        seen = {name}
+        for key in self.block_keys(name):
+            for candidate in self.blocks.get(key, []):
+                if candidate not in seen and fuzz.token_sort_ratio(name, candidate) >= self.name_threshold:
+                    seen.add(candidate)
+                    yield candidate
+
+    def same_supplier_name(self, name, phone):
+        """Return True if a similar name was seen on a supplier whose phone number doesn't contradict this one"""
+        for candidate in self.similar_names(name):
+            for _, seen_phone in self.names[candidate]:
+                if not (phone and seen_phone and phone != seen_phone):
+                    return True
+        return False
+
+    def is_duplicate(self, seller_info):
+        """Return True if the lead's profile URL or phone was seen, or, without a URL, its name on a matching supplier"""
+        url, phone, name = self.identity(seller_info)
+        with self.lock:
+            if url in self.urls or phone in self.phones:
+                return True
+            # A different profile URL is a different supplier, whatever its name; only
+            # URL-less listings fall back to the name, unless their phone number disagrees
+            if not url and name and self.same_supplier_name(name, phone):
+                return True
+        return False
+
+    def add(self, seller_info):
+        """Index every key of a lead"""
+        url, phone, name = self.identity(seller_info)
+        with self.lock:
+            new_keys = [(kind, value) for kind, value, seen in (("url", url, self.urls), ("phone", phone, self.phones)) if value and value not in seen]
+            for kind, value in new_keys:
+                self._remember(kind, value)
+            new_name = bool(name) and (url, phone) not in self.names.get(name, ())
+            if new_name:
+                self._remember_name(name, url, phone)
+
+            if self.conn and (new_keys or new_name):
+                self.conn.executemany("INSERT OR IGNORE INTO seen (kind, value) VALUES (?, ?)", new_keys)
+                if new_name:
+                    self.conn.execute("INSERT OR IGNORE INTO names (name, url, phone) VALUES (?, ?, ?)", (name, url, phone))
+                self.conn.commit()
+
+    def close(self):
+        """Close the persisted index"""
+        if self.conn:
+            with self.lock:
+                self.conn.close()
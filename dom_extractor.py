@@ -0,0 +1,231 @@
+import json
+from urllib.parse import urljoin
+from lxml import etree, html as lxml_html
+
+# Import utility functions
+from utils import new_seller_info, validate_phone
+from text_extractors import scan_text
+
+# Selectors used to find product listings on a results page, tried in order
+LISTING_SELECTORS = [
+    ".product-listing .listing",  # Original selector
+    ".prd-block",               # Alternative selector
+    ".FM_sldrB",               # From the image
+    "[class*='FM_'][class*='bs']",  # Generic FM class with box-shadow
+    ".product-card",           # Common product card class
+    "div[onclick*='product']",  # Elements with product in onclick
+    "div[class*='product']",    # Elements with product in class
+    "div[class*='card']",       # Elements with card in class
+    "div[class*='item']",       # Elements with item in class
+]
+
+# Last resort when none of the listing selectors match
+FALLBACK_LISTING_XPATH = "//div[.//a and .//div[contains(text(), 'Contact') or contains(text(), 'Price')]]"
+
+# Location elements of a listing card, preferred over a place found in the card's text
+LOCATION_SELECTOR = ".loctn, .location"
+# Labelled address fields of a profile page, preferred over a place found in the page's text
+PROFILE_ADDRESS_XPATHS = [
+    "//span[contains(text(), 'Address:')]/following-sibling::span",
+    "//div[contains(@class, 'address') or contains(@class, 'location')]",
+    "//span[contains(text(), 'Address')]/following::*[1]",
+    "//div[contains(text(), 'Address')]/following::*[1]",
+]
+# Text nodes outside scripts and styles, one line each
+TEXT_XPATH = etree.XPath(".//text()[not(parent::script) and not(parent::style)]", smart_strings=False)
+NEXT_PAGE_XPATH = "//a[contains(text(), 'Next') or contains(@class, 'next')]"
+DESCRIPTION_XPATH = ".//div[contains(@class, 'FM_') and not(contains(@class, 'price')) and not(contains(@class, 'contact'))]"
+# Word a card's fallback description text must contain, shared by every extraction backend
+DESCRIPTION_WORD = "ball"
+
+
+def _text(element):
+    """Return the whitespace-normalized text content of an element"""
+    return " ".join(element.text_content().split())
+
+
+def _lines(element):
+    """Return the non-empty text nodes of an element as lines, without script and style content"""
+    return [text.strip() for text in TEXT_XPATH(element) if text.strip()]
+
+
+def parse_page(page_source):
+    """Parse a page source snapshot into an lxml document"""
+    if isinstance(page_source, str):
+        page_source = page_source.encode("utf-8")
+    return lxml_html.fromstring(page_source)
+
+
+def find_listing_cards(document, selectors=LISTING_SELECTORS):
+    """Find the listing cards in a parsed page, without duplicates"""
+    cards = []
+    seen = set()
+    for selector in selectors:
+        for card in document.cssselect(selector):
+            if card not in seen:
+                seen.add(card)
+                cards.append(card)
+
+    if not cards:
+        cards = document.xpath(FALLBACK_LISTING_XPATH)
+
+    return cards
+
+
+def extract_page_info(document):
+    """Extract company details published in the page's LocalBusiness JSON-LD block"""
+    page_info = {"Company Name": "", "Company Profile URL": "", "Address": "", "Phone Number": ""}
+
+    for script in document.xpath("//script[@type='application/ld+json']"):
+        try:
+            data = json.loads(script.text_content())
+        except ValueError:
+            continue
+
+        entries = data if isinstance(data, list) else [data]
+        for entry in entries:
+            if not isinstance(entry, dict) or entry.get("@type") != "LocalBusiness":
+                continue
+
+            page_info["Company Name"] = (entry.get("name") or "").strip()
+            page_info["Company Profile URL"] = (entry.get("url") or "").strip()
+            page_info["Phone Number"] = validate_phone((entry.get("telephone") or "").strip())
+
+            address = entry.get("address") or {}
+            if isinstance(address, dict):
+                parts = [
+                    address.get(key, "").strip(" ,-")
+                    for key in ("streetAddress", "addressLocality", "addressRegion", "postalCode", "addressCountry")
+                ]
+                page_info["Address"] = ", ".join(part for part in parts if part)
+            return page_info
+
+    return page_info
+
+
+def is_description(text):
+    """Return True if a fallback text block looks like the card's product description"""
+    return len(text) > 5 and DESCRIPTION_WORD in text.lower()
+
+
+def has_details(seller_info):
+    """Return True if a card has a company name or product description, the leads add_lead keeps"""
+    return bool(seller_info["Company Name"] or seller_info["Product Title/Description"])
+
+
+def extract_card_info(card, base_url="", page_info=None):
+    """Extract seller information from a single listing card"""
+    seller_info = new_seller_info()
+    page_info = page_info or {}
+
+    # Company name
+    company_elements = card.cssselect(".company-name, .clg, .FM_b") or card.cssselect("b, strong, .FM_b")
+    if company_elements:
+        seller_info["Company Name"] = _text(company_elements[0])
+
+    # Product title/description
+    title_elements = card.cssselect(".prd-title, .prod-name")
+    if title_elements:
+        seller_info["Product Title/Description"] = _text(title_elements[0])
+    elif card.get("prodname"):
+        seller_info["Product Title/Description"] = card.get("prodname").strip()
+    else:
+        for element in card.xpath(DESCRIPTION_XPATH):
+            text = _text(element)
+            if is_description(text):
+                seller_info["Product Title/Description"] = text
+                break
+
+    # Price, phone number and location from one scan of the card's text
+    fields = scan_text(_lines(card), skip=(seller_info["Company Name"], seller_info["Product Title/Description"]))
+
+    # Price
+    if fields["Price"]:
+        seller_info["Price"] = fields["Price"]
+    elif card.get("price"):
+        seller_info["Price"] = card.get("price").strip()
+
+    # Address
+    for element in card.cssselect(LOCATION_SELECTOR):
+        address_text = _text(element)
+        if address_text and len(address_text) > 2 and not ('₹' in address_text or 'Rs' in address_text):
+            seller_info["Address"] = address_text
+            break
+    else:
+        seller_info["Address"] = fields["Address"]
+
+    # Company profile URL
+    for link in card.cssselect("a.company-name, a.clg, a[href*='indiamart.com']"):
+        href = urljoin(base_url, link.get("href", ""))
+        if href and "indiamart.com" in href and not href.endswith(".pdf"):
+            seller_info["Company Profile URL"] = href
+            break
+
+    # Phone number, either displayed directly or as the card's PNS number
+    if fields["Phone Number"]:
+        seller_info["Phone Number"] = fields["Phone Number"]
+    else:
+        pns_elements = card.xpath("descendant-or-self::*[@pnsnumber][1]")
+        if pns_elements:
+            seller_info["Phone Number"] = validate_phone(pns_elements[0].get("pnsnumber"))
+
+    # Product cards on a company page inherit the page-level company details
+    if seller_info["Product Title/Description"]:
+        for field in ("Company Name", "Company Profile URL", "Address"):
+            if not seller_info[field] and page_info.get(field):
+                seller_info[field] = page_info[field]
+
+    return seller_info
+
+
+def extract_listings(page_source, base_url=""):
+    """Extract seller information for every listing in a page source snapshot"""
+    document = parse_page(page_source)
+    page_info = extract_page_info(document)
+    listings = [extract_card_info(card, base_url, page_info) for card in find_listing_cards(document)]
+    # Layout blocks matched by the generic selectors carry neither
+    return [seller_info for seller_info in listings if has_details(seller_info)]
+
+
+def extract_next_url(page_source, base_url=""):
+    """Return the absolute URL of the "Next" results page link, or None if there is none"""
+    for link in parse_page(page_source).xpath(NEXT_PAGE_XPATH):
+        href = link.get("href")
+        if href and not href.startswith(("#", "javascript:")):
+            return urljoin(base_url, href)
+    return None
+
+
+def extract_profile_info(page_source):
+    """Extract the phone number and address from a company profile page snapshot"""
+    document = parse_page(page_source)
+    page_info = extract_page_info(document)
+    profile_info = {"Phone Number": "", "Address": ""}
+
+    # Phone number displayed on the page, and the first line naming an Indian city or state
+    body = document.find("body")
+    fields = scan_text(_lines(body if body is not None else document))
+    profile_info["Phone Number"] = fields["Phone Number"]
+
+    if not profile_info["Phone Number"]:
+        pns_elements = document.xpath("//*[@pnsnumber][1]")
+        if pns_elements:
+            profile_info["Phone Number"] = validate_phone(pns_elements[0].get("pnsnumber"))
+        else:
+            profile_info["Phone Number"] = page_info["Phone Number"]
+
+    # Address, preferring the structured one
+    profile_info["Address"] = page_info["Address"]
+    if len(profile_info["Address"]) < 5:
+        for xpath in PROFILE_ADDRESS_XPATHS:
+            for element in document.xpath(xpath):
+                text = _text(element)
+                if text and len(text) > 5 and not text.startswith("View") and not text.startswith("Call"):
+                    profile_info["Address"] = text
+                    break
+            if len(profile_info["Address"]) >= 5:
+                break
+        else:
+            profile_info["Address"] = fields["Address"] or profile_info["Address"]
+
+    return profile_info
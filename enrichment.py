@@ -0,0 +1,108 @@
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from dom_extractor import extract_profile_info
+from http_fetcher import HttpFetcher
+from utils import merge_profile_info
+
+
+class ProfileEnricher:
+    """Fetch company profile pages in parallel using the browser's logged-in session"""
+
+    def __init__(self, driver, pool_size=4, delay=(0.5, 1.5), timeout=15, logger=None, cache=None, metrics=None, breaker=None, max_pending=0):
+        self.pool_size = pool_size
+        self.delay = delay
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger()
+        self.cache = cache
+        self.metrics = metrics
+        # Optional CircuitBreaker that pauses the fetches while most of them fail
+        self.breaker = breaker
+        # The same pooled client the "http" backend uses, sized for the enrichment workers
+        self.fetcher = HttpFetcher.from_driver(driver, pool_size=pool_size, timeout=timeout)
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="enrich")
+        self.pending = set()
+        # Backpressure: submit() blocks while this many leads are waiting, 0 for no limit
+        self.slots = threading.BoundedSemaphore(max_pending) if max_pending else None
+        self.lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+
+    def fetch_profile(self, url):
+        """Download a profile page and extract its phone number and address"""
+        if self.cache:
+            profile_info = self.cache.get(url)
+            if profile_info is not None:
+                return profile_info
+
+        if self.breaker:
+            self.breaker.wait()
+        time.sleep(random.uniform(*self.delay))
+        start = time.perf_counter()
+        try:
+            # Raises BlockedError for block and CAPTCHA pages
+            _, page_source = self.fetcher.get(url)
+            if self.metrics:
+                self.metrics.observe("enrich_fetch", time.perf_counter() - start)
+        except Exception:
+            if self.breaker:
+                self.breaker.record(False)
+            raise
+        if self.breaker:
+            self.breaker.record(True)
+        profile_info = extract_profile_info(page_source)
+
+        # Without a click the number may still be hidden, so a profile without one isn't cached
+        # and a later browser visit can reveal it
+        if self.cache and profile_info.get("Phone Number"):
+            self.cache.put(url, profile_info, html=page_source)
+        return profile_info
+
+    def _enrich(self, seller_info, on_done):
+        """Worker task that merges the profile details into the lead"""
+        try:
+            profile_info = self.fetch_profile(seller_info["Company Profile URL"])
+            merge_profile_info(seller_info, profile_info)
+            with self.lock:
+                self.completed += 1
+        except Exception as e:
+            with self.lock:
+                self.failed += 1
+            self.logger.warning(
+                f"Error enriching {seller_info['Company Profile URL']}: {e}",
+                extra={"stage": "enrich", "url": seller_info["Company Profile URL"], "sample": "enrich_error"}
+            )
+
+        if on_done:
+            on_done(seller_info)
+
+    def submit(self, seller_info, on_done=None):
+        """Queue a lead for enrichment; on_done is called with the lead once it is merged"""
+        if self.slots:
+            self.slots.acquire()
+        future = self.executor.submit(self._enrich, seller_info, on_done)
+        with self.lock:
+            self.pending.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def _discard(self, future):
+        with self.lock:
+            self.pending.discard(future)
+        if self.slots:
+            self.slots.release()
+
+    def wait(self):
+        """Block until every queued lead has been enriched"""
+        with self.lock:
+            pending = list(self.pending)
+        wait(pending)
+        self.logger.info(f"Profile enrichment finished: {self.completed} enriched, {self.failed} failed")
+
+    def close(self):
+        """Stop the worker pool and close the HTTP client"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.fetcher.close()
@@ -0,0 +1,90 @@
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+from retry_policy import BlockedError, is_block_page
+
+
+class HttpFetcher:
+    """Pooled keep-alive HTTP client that carries the browser's logged-in session"""
+
+    def __init__(self, user_agent=None, cookies=None, pool_size=4, timeout=15, http2=True):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.logger = logging.getLogger("IndiaMartScraper")
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes_received = 0
+        self.browser_fallbacks = 0
+        self.http2 = False
+        self.client = self.create_client(user_agent, cookies or [], http2)
+
+    @classmethod
+    def from_driver(cls, driver, **kwargs):
+        """Create a fetcher with the cookies and user agent of a logged-in driver"""
+        return cls(
+            user_agent=driver.execute_script("return navigator.userAgent;"),
+            cookies=driver.get_cookies(),
+            **kwargs
+        )
+
+    def create_client(self, user_agent, cookies, http2):
+        """Use httpx with HTTP/2 when it is installed, otherwise a pooled requests session"""
+        client = None
+        if http2:
+            try:
+                # httpx and h2 are optional, only needed for HTTP/2
+                import httpx
+                import h2  # noqa: F401
+
+                client = httpx.Client(
+                    http2=True,
+                    follow_redirects=True,
+                    limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+                )
+                self.http2 = True
+            except ImportError:
+                pass
+
+        if client is None:
+            client = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            client.mount("https://", adapter)
+            client.mount("http://", adapter)
+
+        if user_agent:
+            client.headers["User-Agent"] = user_agent
+        for cookie in cookies:
+            client.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+        return client
+
+    def get(self, url):
+        """Download a page and return (final URL, HTML); raises BlockedError for block and CAPTCHA pages"""
+        response = self.client.get(url, timeout=self.timeout)
+        with self.lock:
+            self.requests += 1
+            self.bytes_received += len(response.content)
+        if is_block_page(response.text, response.status_code):
+            raise BlockedError(f"{url} answered with a block page (HTTP {response.status_code})")
+        response.raise_for_status()
+        return str(response.url), response.text
+
+    def record_fallback(self):
+        """Count a page that had to be loaded in the browser after all"""
+        with self.lock:
+            self.browser_fallbacks += 1
+
+    def stats(self):
+        """Return request, byte and browser fallback counts"""
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "bytes_received": self.bytes_received,
+                "browser_fallbacks": self.browser_fallbacks,
+                "http2": self.http2,
+            }
+
+    def close(self):
+        """Close the pooled connections"""
+        self.client.close()
@@ -1,8 +1,6 @@
 import os
 import time
 import csv
-import random
-import pandas as pd
 import logging
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -16,71 +14,177 @@ from fake_useragent import UserAgent
 from fuzzywuzzy import fuzz
 
 # Import utility functions
-from utils import setup_logger, retry, sanitize_data, validate_phone, validate_email
+from utils import setup_logger, retry, validate_phone, validate_email, new_seller_info, merge_profile_info
+from dom_extractor import LISTING_SELECTORS, FALLBACK_LISTING_XPATH, NEXT_PAGE_XPATH, LOCATION_SELECTOR, DESCRIPTION_XPATH, is_description, extract_listings, extract_next_url, extract_profile_info
+from js_extractor import extract_listings_js
+from text_extractors import scan_text
+from enrichment import ProfileEnricher
+from session_store import save_session, restore_session
+from profile_cache import ProfileCache
+from scoring import ScoringStage
+from waits import Waiter
+from selector_cache import SelectorCache
+from http_fetcher import HttpFetcher
+from worker_pool import page_url
+from metrics import Metrics, timed
+from artifacts import ArtifactWriter
+from retry_policy import BlockedError, RetryBudget, CircuitBreaker
+from pipeline import PagePrefetcher
+from lead_store import LeadStore
+
+
+# Available listing extraction backends
+BACKENDS = ["selenium", "dom", "js", "http"]
+
+# Where the authenticated session is kept between runs
+SESSION_FILE = os.path.join("session", "indiamart_session.json")
 
 
 class IndiaMartScraper:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, backend="selenium", enrich_workers=0, session_file=SESSION_FILE, profile_cache=None, sinks=None, keep_leads=True, dedup=None, batch_scoring=False, synonyms=None, rate_policy=None, selector_cache=None, lite=None, metrics=None, accounting=None, artifacts=None, retry_budget=None, breaker=None, prefetch=0, enrich_queue=0):
         self.base_url = "https://www.indiamart.com/"
         self.driver = None
-        self.leads = []
+        # Collected leads, kept column by column
+        self.leads = LeadStore()
         self.logger = setup_logger()
+        # Stage timings and counters of the run
+        self.metrics = metrics or Metrics()
+        # Optional CommandAccounting that counts WebDriver round-trips per call site and per lead
+        self.accounting = accounting
         self.headless = headless
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown extraction backend: {backend}")
+        self.backend = backend
+        # Number of parallel profile fetchers, 0 keeps the serial in-browser visits
+        self.enrich_workers = enrich_workers
+        self.enricher = None
+        # HttpFetcher of the "http" backend, created from the browser session after login
+        self.http = None
+        self.user_agent = None
+        # Saved login session, None disables reuse between runs
+        self.session_file = session_file
+        # Optional ProfileCache shared by the browser visits and the enrichment pool
+        self.profile_cache = profile_cache
+        # CrawlCheckpoint of the keyword being scraped, set by scrape_search_results
+        self.checkpoint = None
+        # Streaming outputs that receive each lead once it is final
+        self.sinks = sinks or []
+        # Set to False with sinks to avoid holding every lead in memory
+        self.keep_leads = keep_leads
+        self.lead_count = 0
+        # Optional DedupIndex that drops suppliers seen on earlier pages or runs
+        self.dedup = dedup
+        # Score leads in a background batch stage instead of inline, against the keyword and its synonyms
+        self.batch_scoring = batch_scoring
+        self.synonyms = synonyms or []
+        self.scorer = None
+        # Readiness-based waits, with human-like pacing set by the rate policy
+        self.waiter = Waiter(rate_policy, metrics=self.metrics)
+        # Learned winners of the selector cascades; in-memory only unless a persisted cache is given
+        self.selectors = selector_cache or SelectorCache(path=None)
+        # Optional LiteProfile that keeps images, fonts, media and trackers from loading
+        self.lite = lite
+        # Sampled debug page sources and screenshots, written in the background to a per-run directory
+        self.artifacts = artifacts or ArtifactWriter()
+        # Retries left for the whole run, and the breaker that pauses profile visits while most of them fail
+        self.retry_budget = retry_budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker("enrichment", metrics=self.metrics)
+        # Results pages loaded ahead while the current one is processed, 0 loads each page when it is reached
+        self.prefetch = prefetch
+        # Most leads waiting in the enrichment pool before the crawl waits for it, 0 for no limit
+        self.enrich_queue = enrich_queue
         self.setup_driver()
         
+    def build_chrome_options(self):
+        """Build the Chrome options shared by every browser this scraper launches"""
+        # Create Chrome options
+        chrome_options = Options()
+        
+        # Configure headless mode if requested
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--window-size=1920,1080")
+        
+        chrome_options.add_argument(f"user-agent={self.user_agent}")
+        chrome_options.add_argument("--disable-notifications")
+        chrome_options.add_argument("--disable-popup-blocking")
+        chrome_options.add_argument("--start-maximized")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--no-sandbox")
+        
+        if self.lite:
+            self.lite.configure_options(chrome_options)
+        
+        return chrome_options
+        
+    @timed("setup_driver")
     def setup_driver(self):
         """Set up the Selenium WebDriver with appropriate options"""
         self.logger.info("Setting up the browser...")
         try:
             ua = UserAgent()
-            user_agent = ua.random
-            
-            # Create Chrome options
-            chrome_options = Options()
+            self.user_agent = ua.random
             
-            # Configure headless mode if requested
             if self.headless:
                 self.logger.info("Running in headless mode")
-                chrome_options.add_argument("--headless=new")
-                chrome_options.add_argument("--window-size=1920,1080")
-            
-            chrome_options.add_argument(f"user-agent={user_agent}")
-            chrome_options.add_argument("--disable-notifications")
-            chrome_options.add_argument("--disable-popup-blocking")
-            chrome_options.add_argument("--start-maximized")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--no-sandbox")
             
             # Let Selenium handle the driver download and management
-            self.driver = webdriver.Chrome(options=chrome_options)
+            self.driver = webdriver.Chrome(options=self.build_chrome_options())
+            if self.accounting:
+                self.accounting.attach(self.driver)
+            if self.lite:
+                self.lite.apply(self.driver)
+                self.logger.info(f"Lite profile blocking {len(self.lite.patterns)} URL patterns")
             self.logger.info("Browser setup complete")
         except Exception as e:
             self.logger.error(f"Failed to set up browser: {e}")
             raise
         
+    @timed("login")
     @retry(max_attempts=3, delay=2)
     def login(self):
         """Navigate to IndiaMART and handle the login process"""
+        # Reuse the session from a previous run and skip the OTP flow while it is valid
+        if self.session_file:
+            try:
+                if restore_session(self.driver, self.session_file, self.base_url):
+                    self.logger.info("Logged in with saved session")
+                    return True
+            except Exception as e:
+                self.logger.warning(f"Failed to restore saved session: {e}")
+        
         self.logger.info("Navigating to IndiaMART login page...")
         
         # Go directly to the mobile login page
         try:
             self.driver.get("https://m.indiamart.com/login/")
             self.logger.info("Navigated directly to the mobile login page")
-            time.sleep(3)  # Wait for the page to load
         except Exception as e:
             self.logger.error(f"Failed to navigate to IndiaMART mobile login page: {e}")
             return False
         
         # Wait for the page to load
-        time.sleep(5)
+        self.waiter.page_ready(self.driver, "login page")
+        self.waiter.dom_quiet(self.driver, "login page")
         
         # Save screenshot of the current page for debugging
-        self.driver.save_screenshot("login_page.png")
+        self.artifacts.screenshot(self.driver, "login_page")
         self.logger.info(f"Current page title: {self.driver.title}")
         self.logger.info(f"Current URL: {self.driver.current_url}")
         
         try:
+            # Try different possible selectors for the mobile input field
+            mobile_input_selectors = [
+                "//input[@id='mobile']",
+                "//input[@name='mobile']",
+                "//input[@placeholder='Mobile Number']",
+                "//input[@placeholder='Enter Mobile Number']",
+                "//input[@type='tel']",
+                "//input[contains(@class, 'mobile')]",
+                "//input[@type='text']",  # More generic fallback
+                "//form//input"  # Very generic fallback
+            ]
+            
             # Try to find the login form or modal
             # First, check if we need to click a sign-in button to show the login form
             login_buttons = [
@@ -97,80 +201,24 @@ class IndiaMartScraper:
                         if element.is_displayed():
                             element.click()
                             self.logger.info(f"Clicked on login button: {selector}")
-                            time.sleep(2)  # Wait for login form to appear
+                            # Wait for the mobile input of the login form to appear; the generic
+                            # fallbacks are left out since they can match before the form is shown
+                            self.waiter.element(self.driver, (By.XPATH, " | ".join(mobile_input_selectors[:-2])), reason="login form", timeout=10)
                             break
                 except Exception as e:
                     self.logger.debug(f"Login button selector {selector} failed: {e}")
                     continue
             
-            # Try different possible selectors for the mobile input field
-            mobile_input_selectors = [
-                "//input[@id='mobile']",
-                "//input[@name='mobile']",
-                "//input[@placeholder='Mobile Number']",
-                "//input[@placeholder='Enter Mobile Number']",
-                "//input[@type='tel']",
-                "//input[contains(@class, 'mobile')]",
-                "//input[@type='text']",  # More generic fallback
-                "//form//input"  # Very generic fallback
-            ]
-            
-            mobile_input = None
-            for selector in mobile_input_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            mobile_input = element
-                            self.logger.info(f"Found mobile input with selector: {selector}")
-                            break
-                    if mobile_input:
-                        break
-                except Exception as e:
-                    self.logger.debug(f"Mobile input selector {selector} failed: {e}")
-                    continue
-            
-            if not mobile_input:
-                # Try to switch to iframe if present
-                iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
-                if iframes:
-                    self.logger.info(f"Found {len(iframes)} iframes, trying to switch to them")
-                    for iframe in iframes:
-                        try:
-                            self.driver.switch_to.frame(iframe)
-                            self.logger.info("Switched to iframe")
-                            
-                            # Try to find mobile input in iframe
-                            for selector in mobile_input_selectors:
-                                try:
-                                    elements = self.driver.find_elements(By.XPATH, selector)
-                                    for element in elements:
-                                        if element.is_displayed():
-                                            mobile_input = element
-                                            self.logger.info(f"Found mobile input in iframe with selector: {selector}")
-                                            break
-                                    if mobile_input:
-                                        break
-                                except Exception as e:
-                                    self.logger.debug(f"Mobile input selector in iframe {selector} failed: {e}")
-                                    continue
-                            
-                            if mobile_input:
-                                break
-                            else:
-                                self.driver.switch_to.default_content()
-                        except Exception as e:
-                            self.logger.debug(f"Failed to switch to iframe: {e}")
-                            self.driver.switch_to.default_content()
+            # Try the selector that worked last time first, then every selector in the page and its iframes
+            mobile_input = self.selectors.find(self.driver, "login:mobile_input", mobile_input_selectors, frames=True)
             
             if not mobile_input:
                 self.logger.error("Could not find mobile input field")
-                self.driver.save_screenshot("mobile_input_not_found.png")
+                self.artifacts.screenshot(self.driver, "mobile_input_not_found", error=True)
                 
-                # Print page source for debugging
-                with open("page_source.html", "w", encoding="utf-8") as f:
-                    f.write(self.driver.page_source)
-                self.logger.info("Saved page source to page_source.html")
+                # Keep the page source for debugging
+                self.artifacts.page_source("mobile_input_not_found", self.driver.page_source, error=True)
+                self.logger.info(f"Saved page source to {self.artifacts.run_dir}")
                 
                 return False
             
@@ -200,42 +248,24 @@ class IndiaMartScraper:
                 "//input[@type='button']"
             ]
             
-            submit_button = None
-            for selector in submit_button_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            submit_button = element
-                            self.logger.info(f"Found submit button with selector: {selector}")
-                            break
-                    if submit_button:
-                        break
-                except Exception as e:
-                    self.logger.debug(f"Submit button selector {selector} failed: {e}")
-                    continue
+            submit_button = self.selectors.find(self.driver, "login:submit_button", submit_button_selectors)
             
             if not submit_button:
                 self.logger.error("Could not find submit button")
-                self.driver.save_screenshot("submit_button_not_found.png")
+                self.artifacts.screenshot(self.driver, "submit_button_not_found", error=True)
                 return False
             
             # Click the submit button
             submit_button.click()
             self.logger.info("Clicked submit button to get OTP")
             
-            # Wait for OTP input field to appear
-            time.sleep(3)
-            
         except Exception as e:
             self.logger.error(f"Error during login process: {e}")
-            self.driver.save_screenshot("login_process_error.png")
+            self.artifacts.screenshot(self.driver, "login_process_error", error=True)
             return False
         
         # Handle OTP verification
         try:
-            time.sleep(3)
-            
             # Try to find the OTP input field
             otp_input_selectors = [
                 "//input[@id='otp']",
@@ -246,24 +276,13 @@ class IndiaMartScraper:
                 "//input[contains(@class, 'otp')]"
             ]
             
-            otp_input = None
-            for selector in otp_input_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            otp_input = element
-                            self.logger.info(f"Found OTP input with selector: {selector}")
-                            break
-                    if otp_input:
-                        break
-                except Exception as e:
-                    self.logger.debug(f"OTP input selector {selector} failed: {e}")
-                    continue
+            # Wait for the OTP input field to appear; sending the OTP can take several seconds
+            self.waiter.element(self.driver, (By.XPATH, " | ".join(otp_input_selectors)), reason="otp form", timeout=30)
+            otp_input = self.selectors.find(self.driver, "login:otp_input", otp_input_selectors)
             
             if not otp_input:
                 self.logger.error("Could not find OTP input field")
-                self.driver.save_screenshot("otp_input_not_found.png")
+                self.artifacts.screenshot(self.driver, "otp_input_not_found", error=True)
                 return False
             
             # Enter OTP
@@ -283,35 +302,25 @@ class IndiaMartScraper:
                 "//input[@type='submit']"
             ]
             
-            verify_button = None
-            for selector in verify_button_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            verify_button = element
-                            self.logger.info(f"Found verify button with selector: {selector}")
-                            break
-                    if verify_button:
-                        break
-                except Exception as e:
-                    self.logger.debug(f"Verify button selector {selector} failed: {e}")
-                    continue
+            verify_button = self.selectors.find(self.driver, "login:verify_button", verify_button_selectors)
             
             if not verify_button:
                 self.logger.error("Could not find verify button")
-                self.driver.save_screenshot("verify_button_not_found.png")
+                self.artifacts.screenshot(self.driver, "verify_button_not_found", error=True)
                 return False
             
             # Click the verify button
+            marker = self.waiter.page_marker(self.driver)
+            old_url = self.driver.current_url
             verify_button.click()
             self.logger.info("Clicked verify button")
             
-            # Wait for login to complete
-            time.sleep(5)
+            # Wait for login to complete; a rejected OTP may stay on the same page, so a timeout isn't a failure
+            self.waiter.navigation(self.driver, marker, old_url, "login complete", timeout=10)
+            self.waiter.dom_quiet(self.driver, "login complete")
             
             # Take a screenshot of the page after login attempt
-            self.driver.save_screenshot("after_login.png")
+            self.artifacts.screenshot(self.driver, "after_login")
             
             # Check if login was successful - multiple possible indicators
             page_source = self.driver.page_source
@@ -328,21 +337,27 @@ class IndiaMartScraper:
             
             if any(success_indicators):
                 self.logger.info("Login successful!")
+                if self.session_file:
+                    try:
+                        save_session(self.driver, self.session_file)
+                    except Exception as e:
+                        self.logger.warning(f"Failed to save login session: {e}")
                 return True
             else:
                 self.logger.warning("Login failed. Please try again.")
-                self.driver.save_screenshot("login_failed.png")
+                self.artifacts.screenshot(self.driver, "login_failed", error=True)
                 return False
                 
         except Exception as e:
             self.logger.error(f"Error during OTP verification: {e}")
-            self.driver.save_screenshot("otp_verification_error.png")
+            self.artifacts.screenshot(self.driver, "otp_verification_error", error=True)
             return False
                 
         except Exception as e:
             self.logger.error(f"Error during login: {e}")
             return False
     
+    @timed("search_product")
     @retry(max_attempts=3, delay=2)
     def search_product(self, keyword):
         """Search for a product using the given keyword"""
@@ -366,7 +381,9 @@ class IndiaMartScraper:
             search_button.click()
             
             # Wait for search results to load
-            time.sleep(5)
+            self.waiter.page_ready(self.driver, "search results")
+            self.waiter.listings(self.driver, "search results")
+            self.collect_network(self.driver)
             
             self.logger.info("Search completed. Now scraping results...")
             return True
@@ -375,17 +392,10 @@ class IndiaMartScraper:
             self.logger.error(f"Error during search: {e}")
             return False
     
+    @timed("extract_seller_info")
     def extract_seller_info(self, seller_element):
         """Extract information from a seller listing element"""
-        seller_info = {
-            "Company Name": "",
-            "Company Profile URL": "",
-            "Price": "Not Listed",
-            "Address": "",
-            "Phone Number": "",
-            "Product Title/Description": "",
-            "Relevancy Score (%)": 0
-        }
+        seller_info = new_seller_info()
         
         try:
             # Extract company name - based on the image, company names appear to be in elements with class names like "Sixit Sports"
@@ -409,39 +419,37 @@ class IndiaMartScraper:
                 try:
                     # Try to find any text that might contain the product description
                     # From the image, we can see product descriptions like "Green Sixit Cricket Tennis Ball"
-                    desc_elements = seller_element.find_elements(By.XPATH, ".//div[contains(@class, 'FM_') and not(contains(@class, 'price')) and not(contains(@class, 'contact'))]")
+                    desc_elements = seller_element.find_elements(By.XPATH, DESCRIPTION_XPATH)
                     for element in desc_elements:
                         text = element.text.strip()
-                        if text and len(text) > 5 and "ball" in text.lower():
+                        if is_description(text):
                             seller_info["Product Title/Description"] = text
                             break
                 except NoSuchElementException:
                     pass
             
-            # Extract price information - based on the image, prices appear as "₹ 500/Dozen" or "₹ 70/Piece"
-            try:
-                # Look for price elements with currency symbols
-                price_elements = seller_element.find_elements(By.XPATH, ".//*[contains(text(), '₹') or contains(text(), 'Rs') or contains(@class, 'price') or contains(@class, 'prc')]")
-                for element in price_elements:
-                    price_text = element.text.strip()
-                    if price_text and ('₹' in price_text or 'Rs' in price_text or '/' in price_text):
-                        seller_info["Price"] = price_text
-                        break
-            except NoSuchElementException:
-                # Keep the default "Not Listed" value
-                pass
+            # Extract price, phone number and location from one read of the card's text
+            # (prices appear as "₹ 500/Dozen" or "₹ 70/Piece", locations as "Bengaluru" or "Karol Bagh, Delhi")
+            fields = scan_text(
+                seller_element.text,
+                skip=(seller_info["Company Name"], seller_info["Product Title/Description"])
+            )
+            seller_info["Price"] = fields["Price"] or seller_info["Price"]
             
-            # Extract address - based on the image, locations appear like "Bengaluru" or "Mumbai"
-            try:
-                # Look for location elements
-                address_elements = seller_element.find_elements(By.XPATH, ".//*[contains(@class, 'loctn') or contains(@class, 'location') or contains(text(), 'Delhi') or contains(text(), 'Mumbai') or contains(text(), 'Bengaluru')]")
-                for element in address_elements:
-                    address_text = element.text.strip()
-                    if address_text and len(address_text) > 2 and not ('₹' in address_text or 'Rs' in address_text):
-                        seller_info["Address"] = address_text
-                        break
-            except NoSuchElementException:
-                pass
+            # Location elements win over a place named in the card's text, as in the page source extractor
+            seller_info["Address"] = fields["Address"]
+            for element in seller_element.find_elements(By.CSS_SELECTOR, LOCATION_SELECTOR):
+                address_text = element.text.strip()
+                if address_text and len(address_text) > 2 and not ('₹' in address_text or 'Rs' in address_text):
+                    seller_info["Address"] = address_text
+                    break
+            
+            # Phone number, either displayed directly or as the card's PNS number
+            seller_info["Phone Number"] = fields["Phone Number"]
+            if not seller_info["Phone Number"]:
+                pns_elements = seller_element.find_elements(By.XPATH, "descendant-or-self::*[@pnsnumber]")
+                if pns_elements:
+                    seller_info["Phone Number"] = validate_phone(pns_elements[0].get_attribute("pnsnumber"))
             
             # Extract company profile URL
             try:
@@ -464,67 +472,75 @@ class IndiaMartScraper:
                 except:
                     pass
             
-            # Extract phone number - based on the image, there are "View Mobile Number" buttons
-            try:
-                # Look for "View Mobile Number" buttons
-                phone_buttons = seller_element.find_elements(By.XPATH, ".//*[contains(text(), 'View Mobile Number') or contains(text(), 'Call') or contains(@class, 'phone') or contains(@class, 'mobile')]")
-                for button in phone_buttons:
-                    # If we find a button, we'll need to extract the number from the company profile page
-                    # or we might find a directly displayed number
-                    phone_text = button.text.strip()
-                    if phone_text and ('Call' in phone_text or any(c.isdigit() for c in phone_text)):
-                        # If the text contains digits, it might be a direct phone number
-                        if any(c.isdigit() for c in phone_text):
-                            seller_info["Phone Number"] = ''.join(c for c in phone_text if c.isdigit())
-                            break
-            except NoSuchElementException:
-                pass
-            
             # If we have a company profile URL, visit it to extract more details
-            if seller_info["Company Profile URL"]:
+            # (the enrichment pool takes care of it when enabled)
+            if seller_info["Company Profile URL"] and self.enricher is None and not self.should_skip(seller_info):
                 self.extract_detailed_info(seller_info)
             
             return seller_info
             
         except Exception as e:
-            print(f"Error extracting seller info: {e}")
+            self.logger.warning(f"Error extracting seller info: {e}", extra={"stage": "listing", "sample": "listing_error"})
             return seller_info
     
+    @timed("extract_detailed_info")
     @retry(max_attempts=2, delay=1)
     def extract_detailed_info(self, seller_info):
         """Visit the company's profile page to extract more detailed information"""
+        # Use the cached details when this profile was visited recently
+        if self.profile_cache:
+            profile_info = self.profile_cache.get(seller_info["Company Profile URL"])
+            if profile_info is not None:
+                merge_profile_info(seller_info, profile_info)
+                self.metrics.inc("profiles", source="cache")
+                return
+        
+        # Profiles processed before a restart don't need another visit
+        if self.checkpoint:
+            profile_info = self.checkpoint.get_profile(seller_info["Company Profile URL"])
+            if profile_info is not None:
+                merge_profile_info(seller_info, profile_info)
+                self.metrics.inc("profiles", source="checkpoint")
+                return
+        
+        self.breaker.wait()
+        self.waiter.pace("profile")
+        
+        # Without JavaScript the page may still show the number; otherwise use the browser for the reveal
+        try:
+            fetched = self.http and self.fetch_profile_http(seller_info)
+        except BlockedError:
+            self.breaker.record(False)
+            raise
+        if fetched:
+            self.breaker.record(True)
+            self.metrics.inc("profiles", source="http")
+            return
+        self.metrics.inc("profiles", source="browser")
+        
         # Store the current window handle
         main_window = self.driver.current_window_handle
         
         try:
-            # Open the company profile page in a new tab
-            self.driver.execute_script(f"window.open('{seller_info['Company Profile URL']}', '_blank');")
-            
-            # Switch to the new tab
-            self.driver.switch_to.window(self.driver.window_handles[-1])
+            # Open the company profile page in a new tab and switch to it
+            # (prefetched results pages may have opened tabs of their own)
+            self.driver.switch_to.new_window("tab")
+            self.driver.get(seller_info["Company Profile URL"])
             
             # Wait for the page to load
-            time.sleep(random.uniform(3, 5))
+            self.waiter.page_ready(self.driver, "profile page")
+            self.waiter.dom_quiet(self.driver, "profile page")
             
             # Save the page source for debugging if needed
             # with open("company_profile_page.html", "w", encoding="utf-8") as f:
             #     f.write(self.driver.page_source)
             
-            # Extract phone number - try multiple approaches
+            # Read the page's text once and scan it for a phone number and an address line
+            fields = scan_text(self.driver.find_element(By.TAG_NAME, "body").text)
+            # What the profile page itself shows, cached so a hit merges like a fresh visit
+            profile_info = {"Phone Number": fields["Phone Number"], "Address": fields["Address"]}
             if not seller_info["Phone Number"]:
-                try:
-                    # First try to find any visible phone numbers on the page
-                    phone_elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), '+91') or contains(text(), '91-') or contains(text(), 'Call ')]")
-                    for element in phone_elements:
-                        text = element.text.strip()
-                        if text and any(c.isdigit() for c in text):
-                            # Extract only the digits
-                            digits = ''.join(c for c in text if c.isdigit())
-                            if len(digits) >= 10:  # Valid Indian phone numbers have at least 10 digits
-                                seller_info["Phone Number"] = validate_phone(digits)
-                                break
-                except Exception as e:
-                    self.logger.warning(f"Error finding direct phone numbers: {e}")
+                seller_info["Phone Number"] = fields["Phone Number"]
                 
                 if not seller_info["Phone Number"]:
                     try:
@@ -537,17 +553,11 @@ class IndiaMartScraper:
                             if button.is_displayed():
                                 try:
                                     button.click()
-                                    time.sleep(1)  # Wait for the number to appear
+                                    self.waiter.dom_quiet(self.driver, "phone reveal", quiet_ms=300, timeout=3)  # Wait for the number to appear
                                     
-                                    # Now try to extract the phone number
-                                    phone_elements = self.driver.find_elements(By.XPATH, "//*[contains(@class, 'phone') or contains(@class, 'mobile') or contains(text(), '+91')]")
-                                    for element in phone_elements:
-                                        text = element.text.strip()
-                                        if text and any(c.isdigit() for c in text):
-                                            digits = ''.join(c for c in text if c.isdigit())
-                                            if len(digits) >= 10:
-                                                seller_info["Phone Number"] = validate_phone(digits)
-                                                break
+                                    # Now try to extract the revealed phone number
+                                    revealed = scan_text(self.driver.find_element(By.TAG_NAME, "body").text)
+                                    seller_info["Phone Number"] = profile_info["Phone Number"] = revealed["Phone Number"]
                                     
                                     if seller_info["Phone Number"]:
                                         break  # Exit the loop if we found a phone number
@@ -557,40 +567,24 @@ class IndiaMartScraper:
                     except Exception as e:
                         self.logger.warning(f"Error finding phone buttons: {e}")
             
-            # Extract detailed address if not already available
-            if not seller_info["Address"] or len(seller_info["Address"]) < 5:
-                try:
-                    # Try multiple approaches to find address
-                    address_selectors = [
-                        "//span[contains(text(), 'Address:')]/following-sibling::span",
-                        "//div[contains(@class, 'address') or contains(@class, 'location')]",
-                        "//span[contains(text(), 'Address')]/following::*[1]",
-                        "//div[contains(text(), 'Address')]/following::*[1]",
-                        "//div[contains(@class, 'FM_') and (contains(text(), 'Delhi') or contains(text(), 'Mumbai') or contains(text(), 'Bengaluru'))]",
-                        "//span[contains(@class, 'FM_') and (contains(text(), 'Delhi') or contains(text(), 'Mumbai') or contains(text(), 'Bengaluru'))]"
-                    ]
-                    
-                    for selector in address_selectors:
-                        try:
-                            elements = self.driver.find_elements(By.XPATH, selector)
-                            for element in elements:
-                                text = element.text.strip()
-                                if text and len(text) > 5 and not text.startswith("View") and not text.startswith("Call"):
-                                    seller_info["Address"] = text
-                                    break
-                            
-                            if seller_info["Address"] and len(seller_info["Address"]) >= 5:
-                                break  # Exit the loop if we found a good address
-                        except NoSuchElementException:
-                            continue  # Try the next selector
-                except Exception as e:
-                    self.logger.warning(f"Error finding address: {e}")
+            # Use the first line naming an Indian city or state if the listing had no usable address
+            if (not seller_info["Address"] or len(seller_info["Address"]) < 5) and fields["Address"]:
+                seller_info["Address"] = fields["Address"]
+            
+            self.remember_profile(
+                seller_info["Company Profile URL"],
+                profile_info,
+                html=self.driver.page_source if self.profile_cache and self.profile_cache.store_html else None
+            )
             
             # Close the tab and switch back to the main window
+            self.collect_network(self.driver)
             self.driver.close()
             self.driver.switch_to.window(main_window)
+            self.breaker.record(True)
             
         except Exception as e:
+            self.breaker.record(False)
             self.logger.error(f"Error extracting detailed info: {e}")
             # Make sure we switch back to the main window even if there's an error
             try:
@@ -599,6 +593,92 @@ class IndiaMartScraper:
             except:
                 pass
     
+    def visit_profile(self, seller_info):
+        """Extract the profile details of a lead, keeping the listing details when the visit keeps failing"""
+        try:
+            self.extract_detailed_info(seller_info)
+        except Exception as e:
+            self.logger.warning(
+                f"Giving up on profile {seller_info['Company Profile URL']}: {e}",
+                extra={"stage": "profile", "url": seller_info["Company Profile URL"], "sample": "profile_error"}
+            )
+    
+    def prefetch_next_pages(self, prefetcher, page_num, results_url, page_source=None):
+        """Start loading the pages after page_num while its listings are processed"""
+        if self.http:
+            # Numbered pages, as far ahead as the prefetch depth allows
+            for next_num in range(page_num + 1, page_num + prefetcher.depth + 1):
+                prefetcher.schedule(next_num, page_url(results_url, next_num))
+            return
+        
+        # The browser follows the page's own "Next" link, so only one page can be loaded ahead
+        if page_source is not None:
+            next_url = extract_next_url(page_source, base_url=self.driver.current_url)
+        else:
+            links = self.driver.find_elements(By.XPATH, NEXT_PAGE_XPATH)
+            next_url = links[0].get_attribute("href") if links else None
+        if next_url and next_url.startswith("http"):
+            prefetcher.schedule(page_num + 1, next_url)
+    
+    def remember_profile(self, url, profile_info, html=None):
+        """Store the details of a visited profile in the cache and the checkpoint"""
+        if self.profile_cache:
+            self.profile_cache.put(url, profile_info, html=html)
+        if self.checkpoint:
+            self.checkpoint.save_profile(url, profile_info)
+    
+    def start_http(self):
+        """Create the HTTP client of the "http" backend from the logged-in browser"""
+        if self.backend == "http" and self.http is None:
+            self.http = HttpFetcher.from_driver(self.driver)
+            self.logger.info(f"Fetching pages over HTTP{'/2' if self.http.http2 else ''} with the browser session")
+    
+    def fetch_profile_http(self, seller_info):
+        """Fetch a profile page over HTTP; returns False when the browser is needed for the phone number"""
+        url = seller_info["Company Profile URL"]
+        try:
+            _, page_source = self.http.get(url)
+        except BlockedError:
+            # Backing off is the only cure, the browser would be blocked too
+            raise
+        except Exception as e:
+            self.logger.debug(f"HTTP fetch of {url} failed: {e}")
+            self.http.record_fallback()
+            return False
+        
+        profile_info = extract_profile_info(page_source)
+        if not profile_info["Phone Number"] and not seller_info["Phone Number"]:
+            # The number is only revealed by clicking in the browser
+            self.http.record_fallback()
+            return False
+        
+        merge_profile_info(seller_info, profile_info)
+        self.remember_profile(url, profile_info, html=page_source)
+        return True
+    
+    def fetch_results_http(self, url):
+        """Fetch a results page over HTTP and extract its listings; returns None if the fetch fails"""
+        try:
+            final_url, page_source = self.http.get(url)
+            return extract_listings(page_source, base_url=final_url)
+        except Exception as e:
+            self.logger.debug(f"HTTP fetch of {url} failed: {e}")
+            return None
+    
+    def fetch_results_page(self, url, listings=None):
+        """Fetch a results page over HTTP (unless its listings were prefetched), loading it in the browser if it needs JavaScript"""
+        if listings is None:
+            listings = self.fetch_results_http(url)
+        if listings:
+            return listings
+        
+        # Listings rendered by JavaScript only show up in the browser
+        self.http.record_fallback()
+        self.driver.get(url)
+        self.wait_for_listings(self.driver)
+        return extract_listings(self.driver.page_source, base_url=self.driver.current_url)
+    
+    @timed("scoring")
     def calculate_relevancy_score(self, seller_info, keyword):
         """Calculate a relevancy score based on how well the seller info matches the keyword"""
         score = 0
@@ -637,119 +717,315 @@ class IndiaMartScraper:
         # Cap the score at 100
         return min(100, score)
     
-    def scrape_search_results(self, keyword, min_leads=100):
+    def wait_for_listings(self, driver):
+        """Wait for the search results on the driver's current page to load"""
+        # Wait for the search results to load - based on the image, we need to look for various selectors
+        # Try multiple selectors to find product listings
+        if not self.waiter.listings(driver):
+            # If we can't find specific elements, wait for any content to load and settle
+            self.waiter.element(driver, (By.TAG_NAME, "body"), reason="results body")
+            self.waiter.network_idle(driver, "results network idle")
+            self.waiter.dom_quiet(driver, "results dom quiet")
+        self.collect_network(driver)
+    
+    def collect_network(self, driver):
+        """Update the lite profile's request counters from the driver's network log"""
+        if self.lite:
+            self.lite.collect(driver)
+    
+    def start_enrichment(self):
+        """Start the background profile enrichment pool if it is enabled"""
+        # Profile pages are fetched in the background while listings are extracted
+        if self.enrich_workers and self.enricher is None:
+            self.enricher = ProfileEnricher(self.driver, pool_size=self.enrich_workers, logger=self.logger, cache=self.profile_cache, metrics=self.metrics, breaker=self.breaker, max_pending=self.enrich_queue)
+    
+    def finish_enrichment(self):
+        """Wait for queued profile enrichment to complete"""
+        if self.enricher:
+            print("Waiting for profile enrichment to finish...")
+            self.enricher.wait()
+    
+    def start_scoring(self, keyword):
+        """Start the batch scoring stage if it is enabled"""
+        if self.batch_scoring and self.scorer is None:
+            self.scorer = ScoringStage([keyword] + self.synonyms, on_scored=self.save_scored_lead, metrics=self.metrics)
+    
+    def finish_scoring(self):
+        """Score the remaining queued leads and stop the scoring stage"""
+        if self.scorer:
+            self.scorer.close()
+            self.scorer = None
+    
+    def is_collected(self, seller_info):
+        """Return True if the lead was already collected before the crawl was resumed"""
+        return bool(self.checkpoint and self.checkpoint.has_lead(seller_info))
+    
+    def should_skip(self, seller_info):
+        """Return True if the listing was already collected or is a known supplier"""
+        return self.is_collected(seller_info) or bool(self.dedup and self.dedup.is_duplicate(seller_info))
+    
+    def add_lead(self, seller_info, keyword):
+        """Score a lead and keep it if it has at least a company name or product description"""
+        # Calculate relevancy score, unless the batch stage does it once the lead is final
+        if self.scorer is None:
+            seller_info["Relevancy Score (%)"] = self.calculate_relevancy_score(seller_info, keyword)
+        
+        if not (seller_info["Company Name"] or seller_info["Product Title/Description"]):
+            return False
+        
+        if self.should_skip(seller_info):
+            return False
+        
+        if self.dedup:
+            self.dedup.add(seller_info)
+        
+        self.store_lead(seller_info)
+        self.metrics.inc("leads")
+        
+        checkpoint = self.checkpoint
+        if checkpoint:
+            checkpoint.save_lead(seller_info)
+        
+        if self.enricher and seller_info["Company Profile URL"]:
+            # Rescore once the profile details have been merged in
+            def rescore(info):
+                if self.scorer is None:
+                    info["Relevancy Score (%)"] = self.calculate_relevancy_score(info, keyword)
+                if self.dedup:
+                    # Index the phone number found on the profile page
+                    self.dedup.add(info)
+                if checkpoint:
+                    checkpoint.save_profile(info["Company Profile URL"], {"Phone Number": info["Phone Number"], "Address": info["Address"]})
+                    checkpoint.save_lead(info)
+                self.finish_lead(info)
+            self.enricher.submit(seller_info, on_done=rescore)
+        else:
+            self.finish_lead(seller_info)
+        
+        # Sampled, so thousands of leads don't flood the console and the log file
+        self.logger.info(
+            f"Collected lead {self.lead_count}: {seller_info['Company Name'] or seller_info['Product Title/Description']}",
+            extra={"stage": "lead", "keyword": keyword, "lead": self.lead_count, "url": seller_info["Company Profile URL"], "sample": "collected_lead"}
+        )
+        return True
+    
+    def reset_leads(self):
+        """Forget the collected leads before scraping another keyword"""
+        self.leads = LeadStore()
+        self.lead_count = 0
+    
+    def store_lead(self, seller_info):
+        """Count a collected lead and keep it in memory unless streaming only"""
+        self.lead_count += 1
+        if self.keep_leads:
+            # The stored row is updated by emit_lead once enrichment and scoring are done
+            self.leads.append(seller_info)
+    
+    def store_leads(self, leads):
+        """Count and keep leads that are already final, like those restored from a checkpoint"""
+        self.lead_count += len(leads)
+        if self.keep_leads:
+            self.leads.extend(leads)
+    
+    def finish_lead(self, seller_info):
+        """Pass a lead whose details are final to the scoring stage or straight to the sinks"""
+        if self.scorer:
+            self.scorer.submit(seller_info)
+        else:
+            self.emit_lead(seller_info)
+    
+    def save_scored_lead(self, seller_info):
+        """Record a lead scored by the batch stage and write it to the sinks"""
+        if self.checkpoint:
+            self.checkpoint.save_lead(seller_info)
+        self.emit_lead(seller_info)
+    
+    def emit_lead(self, seller_info):
+        """Write a finished lead to every streaming sink"""
+        if self.keep_leads:
+            self.leads.finish(seller_info)
+        for sink in self.sinks:
+            sink.write(seller_info)
+    
+    def find_seller_elements(self):
+        """Find the listing elements on the current results page through Selenium"""
+        # Try multiple selectors to find product listings based on the image structure,
+        # running only the ones that matched on earlier pages while they keep matching
+        seller_elements = self.selectors.find_all(self.driver, "search:listings", LISTING_SELECTORS)
+        self.logger.debug(f"Found {len(seller_elements)} listings", extra={"stage": "page"})
+        
+        if not seller_elements:
+            # If still no elements found, try to find any div that might contain product info
+            seller_elements = self.driver.find_elements(By.XPATH, FALLBACK_LISTING_XPATH)
+        
+        return seller_elements
+    
+    def resume_from_checkpoint(self, checkpoint):
+        """Reload the leads of an unfinished crawl and open the page it stopped on"""
+        resume_point = checkpoint.resume_point()
+        if resume_point is None:
+            return None
+        
+        page_num, page_url = resume_point
+        restored = checkpoint.load_leads()
+        self.store_leads(restored)
+        for seller_info in restored:
+            self.emit_lead(seller_info)
+        self.logger.info(f"Resuming '{checkpoint.keyword}' at page {page_num} with {len(restored)} leads already collected")
+        self.driver.get(page_url)
+        return page_num
+    
+    def scrape_search_results(self, keyword, min_leads=100, checkpoint=None, start_page=1):
         """Scrape search results to collect leads"""
-        page_num = 1
-        leads_count = 0
+        page_num = start_page
+        self.checkpoint = checkpoint
+        # Leads restored from the checkpoint count towards the minimum
+        leads_count = len(checkpoint.collected) if checkpoint else 0
+        finished = False
+        
+        self.start_enrichment()
+        self.start_scoring(keyword)
+        self.start_http()
+        # The http backend pages through the results URL the browser search landed on
+        results_url = self.driver.current_url
+        prefetcher = None
+        if self.prefetch:
+            prefetcher = PagePrefetcher(self.driver, fetch=self.fetch_results_http if self.http else None, depth=self.prefetch)
         
         while leads_count < min_leads:
-            print(f"Scraping page {page_num}...")
+            self.logger.info(f"Scraping page {page_num}...", extra={"stage": "page", "keyword": keyword, "page": page_num})
+            page_started = time.perf_counter()
             
             try:
-                # Wait for the search results to load - based on the image, we need to look for various selectors
-                # Try multiple selectors to find product listings
-                try:
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, ".product-listing, .FM_sldrB, .prd-block, [class*='FM_']"))
-                    )
-                except TimeoutException:
-                    # If we can't find specific elements, wait for any content to load
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.TAG_NAME, "body"))
-                    )
-                    time.sleep(5)  # Give extra time for dynamic content to load
+                # A prefetched page is already parsed, or loading in its own tab
+                prefetched = prefetcher.take(page_num) if prefetcher else False
                 
-                # Save the page source for debugging if needed
-                with open("page_source.html", "w", encoding="utf-8") as f:
-                    f.write(self.driver.page_source)
+                if checkpoint:
+                    checkpoint.save_page(page_num, page_url(results_url, page_num) if self.http else self.driver.current_url)
                 
-                # Try multiple selectors to find product listings based on the image structure
-                seller_elements = []
-                selectors = [
-                    ".product-listing .listing",  # Original selector
-                    ".prd-block",               # Alternative selector
-                    ".FM_sldrB",               # From the image
-                    "[class*='FM_'][class*='bs']",  # Generic FM class with box-shadow
-                    ".product-card",           # Common product card class
-                    "div[onclick*='product']",  # Elements with product in onclick
-                    "div[class*='product']",    # Elements with product in class
-                    "div[class*='card']",       # Elements with card in class
-                    "div[class*='item']",       # Elements with item in class
-                ]
-                
-                # Try each selector
-                for selector in selectors:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        seller_elements.extend(elements)
-                        print(f"Found {len(elements)} listings with selector: {selector}")
-                
-                # Remove duplicates by comparing element IDs
-                unique_elements = []
-                element_ids = set()
-                for element in seller_elements:
-                    element_id = element.id
-                    if element_id not in element_ids:
-                        element_ids.add(element_id)
-                        unique_elements.append(element)
-                
-                seller_elements = unique_elements
-                
-                if not seller_elements:
-                    # If still no elements found, try to find any div that might contain product info
-                    seller_elements = self.driver.find_elements(By.XPATH, "//div[.//a and .//div[contains(text(), 'Contact') or contains(text(), 'Price')]]")
+                if self.http:
+                    # Download and parse the page without the browser
+                    seller_elements = self.fetch_results_page(
+                        page_url(results_url, page_num),
+                        listings=None if prefetched is False else prefetched
+                    )
+                else:
+                    self.wait_for_listings(self.driver)
+                    
+                    # Take a single snapshot of the page when it is parsed or sampled for debugging
+                    page_source = None
+                    if self.backend == "dom" or self.artifacts.wants(page=page_num):
+                        page_source = self.driver.page_source
+                        self.artifacts.page_source(f"search_results_page_{page_num}", page_source, page=page_num)
+                    
+                    if self.backend == "dom":
+                        # Parse every listing out of the snapshot in one pass
+                        seller_elements = extract_listings(page_source, base_url=self.driver.current_url)
+                    elif self.backend == "js":
+                        # Walk every listing card inside the browser in one round-trip
+                        seller_elements = extract_listings_js(self.driver)
+                    else:
+                        seller_elements = self.find_seller_elements()
                 
                 if not seller_elements:
                     print("No product listings found. Taking screenshot for debugging...")
-                    self.driver.save_screenshot(f"search_results_page_{page_num}.png")
+                    self.artifacts.screenshot(self.driver, f"search_results_page_{page_num}", error=True)
+                    self.artifacts.page_source(f"search_results_page_{page_num}", self.driver.page_source, error=True)
                     print("No more results found.")
+                    finished = True
                     break
                 
-                print(f"Found {len(seller_elements)} listings on this page")
+                self.logger.info(f"Found {len(seller_elements)} listings on this page", extra={"stage": "page", "keyword": keyword, "page": page_num})
+                
+                # Start loading the following pages before working through this one
+                if prefetcher and leads_count < min_leads:
+                    self.prefetch_next_pages(prefetcher, page_num, results_url, None if self.http else page_source)
                 
                 # Process each seller listing
                 for seller_element in seller_elements:
-                    # Add random delay to mimic human behavior
-                    time.sleep(random.uniform(1, 3))
-                    
-                    # Extract seller information
-                    seller_info = self.extract_seller_info(seller_element)
-                    
-                    # Calculate relevancy score
-                    seller_info["Relevancy Score (%)"] = self.calculate_relevancy_score(seller_info, keyword)
+                    if self.backend != "selenium" and self.should_skip(seller_element):
+                        continue
+                    if self.accounting:
+                        # Skipped listings issue no commands, so they aren't counted as leads
+                        self.accounting.begin_lead()
+                    if self.backend != "selenium":
+                        # Listings are already extracted, only profile visits touch the browser
+                        seller_info = seller_element
+                        if seller_info["Company Profile URL"] and self.enricher is None:
+                            self.visit_profile(seller_info)
+                    else:
+                        # Pace listing reads to mimic human behavior
+                        self.waiter.pace("listing")
+                        
+                        # Extract seller information
+                        seller_info = self.extract_seller_info(seller_element)
                     
-                    # Add to leads list if we have at least the company name or product description
-                    if seller_info["Company Name"] or seller_info["Product Title/Description"]:
-                        self.leads.append(seller_info)
+                    if self.add_lead(seller_info, keyword):
                         leads_count += 1
-                        print(f"Collected lead {leads_count}: {seller_info['Company Name'] or seller_info['Product Title/Description']}")
                         
                         # If we've reached the minimum number of leads, break out of the loop
                         if leads_count >= min_leads:
                             break
                 
+                if self.accounting:
+                    # Next-page commands belong to the page, not the last lead
+                    self.accounting.end_lead()
+                
                 # If we haven't collected enough leads, go to the next page
-                if leads_count < min_leads:
+                if leads_count < min_leads and self.http:
+                    # Numbered pages are fetched until one comes back empty
+                    self.waiter.pace("page")
+                    page_num += 1
+                elif leads_count < min_leads and prefetcher and prefetcher.has(page_num + 1):
+                    # The next page has been loading in its own tab
+                    self.waiter.pace("page")
+                    page_num += 1
+                elif leads_count < min_leads:
                     # Try to find and click the "Next" button
                     try:
                         next_button = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Next') or contains(@class, 'next')]"))
+                            EC.element_to_be_clickable((By.XPATH, NEXT_PAGE_XPATH))
                         )
+                        self.waiter.pace("page")
+                        # readyState is already complete on the old page, so wait for its cards to go away first
+                        marker = self.waiter.page_marker(self.driver)
+                        old_url = self.driver.current_url
                         next_button.click()
                         page_num += 1
                         # Wait for the next page to load
-                        time.sleep(random.uniform(3, 5))
+                        if not self.waiter.navigation(self.driver, marker, old_url, "next page"):
+                            self.logger.warning(f"Page {page_num} did not replace the previous page, stopping")
+                            finished = True
+                            break
                     except (TimeoutException, NoSuchElementException):
                         print("No more pages available.")
+                        finished = True
                         break
                         
             except Exception as e:
-                print(f"Error scraping search results: {e}")
+                self.logger.error(f"Error scraping search results: {e}", extra={"stage": "page", "keyword": keyword, "page": page_num})
+                self.metrics.inc("page_errors")
+                self.artifacts.screenshot(self.driver, f"search_results_page_{page_num}_error", error=True)
                 break
+            finally:
+                self.metrics.observe("page", time.perf_counter() - page_started)
+                self.metrics.inc("pages")
+        
+        if prefetcher:
+            self.logger.info(f"Prefetch stats: {prefetcher.stats()}")
+            prefetcher.close()
         
-        print(f"Total leads collected: {len(self.leads)}")
+        self.finish_enrichment()
+        self.finish_scoring()
+        
+        # Only a crawl that ran to its end is closed, errors leave it resumable
+        if checkpoint and (finished or leads_count >= min_leads):
+            checkpoint.finish()
+        
+        print(f"Total leads collected: {self.lead_count}")
         return self.leads
     
+    @timed("export")
     def export_to_csv(self, filename="leads.csv"):
         """Export the collected leads to a CSV file"""
         if not self.leads:
@@ -757,25 +1033,13 @@ class IndiaMartScraper:
             return False
         
         try:
-            # Clean and sanitize the data
-            cleaned_leads = [sanitize_data(lead) for lead in self.leads]
-            
-            # Ensure we have the correct fields in the output
-            fields = ["Company Name", "Company Profile URL", "Price", "Address", "Phone Number", "Product Title/Description", "Relevancy Score (%)"]
-            
-            # Sort leads by relevancy score (highest first)
-            sorted_leads = sorted(cleaned_leads, key=lambda x: x["Relevancy Score (%)"], reverse=True)
-            
-            # Create a DataFrame from the leads
-            df = pd.DataFrame(sorted_leads)
-            
-            # Ensure we have the correct fields in the output
-            df = df[fields]
+            # The stored leads are already sanitized; sort them by relevancy score (highest first)
+            df = self.leads.export_frame()
             
             # Export to CSV
             df.to_csv(filename, index=False, encoding='utf-8-sig')  # utf-8-sig for Excel compatibility
             
-            self.logger.info(f"Successfully exported {len(sorted_leads)} leads to {filename}")
+            self.logger.info(f"Successfully exported {len(df)} leads to {filename}")
             return True
             
         except Exception as e:
@@ -784,6 +1048,25 @@ class IndiaMartScraper:
     
     def close(self):
         """Close the browser and clean up"""
+        if self.enricher:
+            self.enricher.close()
+        self.finish_scoring()
+        if self.http:
+            self.logger.info(f"HTTP fetch stats: {self.http.stats()}")
+            self.http.close()
+        if self.lite:
+            self.collect_network(self.driver)
+            self.logger.info(f"Lite profile stats: {self.lite.stats()}")
+        if self.accounting:
+            self.logger.info(self.accounting.format_report())
+        self.logger.info(f"Selector cache stats: {self.selectors.stats()}")
+        self.selectors.close()
+        self.logger.info(f"Retries left: {self.retry_budget.remaining()}, enrichment breaker: {self.breaker.stats()}")
+        self.logger.info(f"Time spent waiting: {self.waiter.stats.total():.1f} s {self.waiter.stats.report()}")
+        if self.profile_cache:
+            self.logger.info(f"Profile cache stats: {self.profile_cache.stats()}")
+            self.profile_cache.close()
+        self.artifacts.close()
         if self.driver:
             self.driver.quit()
             print("Browser closed.")
@@ -804,12 +1087,12 @@ def main():
         print("Initializing browser...")
         # Try to create the scraper with different headless settings if needed
         try:
-            scraper = IndiaMartScraper(headless=False)
+            scraper = IndiaMartScraper(headless=False, profile_cache=ProfileCache())
         except Exception as e:
             logger.warning(f"Failed to initialize browser in normal mode: {e}")
             print("Failed to initialize browser in normal mode. Trying headless mode...")
             try:
-                scraper = IndiaMartScraper(headless=True)
+                scraper = IndiaMartScraper(headless=True, profile_cache=ProfileCache())
                 print("Browser initialized in headless mode.")
             except Exception as e:
                 logger.error(f"Failed to initialize browser in headless mode: {e}")
@@ -0,0 +1,146 @@
+import os
+import re
+import csv
+import time
+import sqlite3
+
+from dedup import DedupIndex
+from sinks import read_leads
+from utils import LEAD_FIELDS
+
+
+# Function to turn a keyword into a file name
+def keyword_slug(keyword):
+    """Return a file-name-safe version of a keyword"""
+    return re.sub(r"[^a-z0-9]+", "_", keyword.lower()).strip("_") or "keyword"
+
+
+# Function to read a batch keyword file
+def read_keyword_file(path, default_min_leads=100, output_dir="batch_output"):
+    """Read 'keyword[,min_leads[,output]]' lines into job dicts, skipping blanks and # comments"""
+    jobs = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip() or row[0].strip().startswith("#"):
+                continue
+
+            keyword = row[0].strip()
+            min_leads = int(row[1]) if len(row) > 1 and row[1].strip() else default_min_leads
+            output = row[2].strip() if len(row) > 2 and row[2].strip() else os.path.join(output_dir, f"{keyword_slug(keyword)}.csv")
+            jobs.append({"keyword": keyword, "min_leads": min_leads, "output": output})
+    return jobs
+
+
+class JobQueue:
+    """Persistent queue of keyword jobs with a status per keyword"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " keyword TEXT PRIMARY KEY,"
+            " min_leads INTEGER NOT NULL,"
+            " output TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"  # pending, running, done or failed
+            " leads INTEGER NOT NULL DEFAULT 0,"
+            " error TEXT NOT NULL DEFAULT '',"
+            " position INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def add_jobs(self, jobs):
+        """Queue new keywords; keywords already in the queue keep their status but take the file's settings and order"""
+        for position, job in enumerate(jobs):
+            self.conn.execute(
+                "INSERT INTO jobs (keyword, min_leads, output, position, updated_at) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (keyword) DO UPDATE SET"
+                " min_leads = excluded.min_leads, output = excluded.output, position = excluded.position",
+                (job["keyword"], job["min_leads"], job["output"], position, time.time())
+            )
+        self.conn.commit()
+
+    def batch_finished(self, keywords):
+        """Return True if none of the keywords is waiting or was interrupted"""
+        (unfinished,) = self.conn.execute(
+            f"SELECT COUNT(*) FROM jobs WHERE status IN ('running', 'pending') AND keyword IN ({', '.join('?' * len(keywords))})",
+            keywords
+        ).fetchone()
+        return unfinished == 0
+
+    def start_batch(self, keywords):
+        """Queue the keywords again for a new run of the batch"""
+        self.conn.execute(
+            f"UPDATE jobs SET status = 'pending', leads = 0, error = '', updated_at = ? WHERE keyword IN ({', '.join('?' * len(keywords))})",
+            [time.time()] + keywords
+        )
+        self.conn.commit()
+
+    def retry_failed(self, keywords):
+        """Put the keywords' failed jobs back in the queue"""
+        self.conn.execute(
+            f"UPDATE jobs SET status = 'pending', error = '' WHERE status = 'failed' AND keyword IN ({', '.join('?' * len(keywords))})",
+            keywords
+        )
+        self.conn.commit()
+
+    def next_job(self, keywords):
+        """Return the next job of the keywords to run, interrupted ones first, or None when they are done"""
+        row = self.conn.execute(
+            f"SELECT * FROM jobs WHERE status IN ('running', 'pending') AND keyword IN ({', '.join('?' * len(keywords))})"
+            " ORDER BY status = 'running' DESC, position LIMIT 1",
+            keywords
+        ).fetchone()
+        return dict(row) if row else None
+
+    def update(self, keyword, status, leads=0, error=""):
+        """Set a job's status"""
+        self.conn.execute(
+            "UPDATE jobs SET status = ?, leads = ?, error = ?, updated_at = ? WHERE keyword = ?",
+            (status, leads, error, time.time(), keyword)
+        )
+        self.conn.commit()
+
+    def jobs(self, status=None, keywords=None):
+        """Return all jobs, or only those with the given status or keywords, in queue order"""
+        conditions = []
+        params = []
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+        if keywords is not None:
+            conditions.append(f"keyword IN ({', '.join('?' * len(keywords))})")
+            params.extend(keywords)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.conn.execute(f"SELECT * FROM jobs{where} ORDER BY position", params)
+        return [dict(row) for row in rows]
+
+    def close(self):
+        """Close the queue database"""
+        self.conn.close()
+
+
+# Function to merge the per-keyword outputs
+def combine_outputs(jobs, output):
+    """Write the leads of every finished job to one CSV, dropping suppliers already written"""
+    dedup = DedupIndex(path=None)
+    written = 0
+    with open(output, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=LEAD_FIELDS + ["Keyword"])
+        writer.writeheader()
+        for job in jobs:
+            if not os.path.exists(job["output"]):
+                continue
+            for lead in read_leads(job["output"]):
+                if dedup.is_duplicate(lead):
+                    continue
+                dedup.add(lead)
+                writer.writerow({**{field: lead.get(field, "") for field in LEAD_FIELDS}, "Keyword": job["keyword"]})
+                written += 1
+    return written
@@ -0,0 +1,120 @@
+from dom_extractor import LISTING_SELECTORS, FALLBACK_LISTING_XPATH, DESCRIPTION_WORD, has_details
+
+# Import utility functions
+from utils import new_seller_info, validate_phone
+from text_extractors import scan_text
+
+# Extractor injected into the results page. It receives the listing selectors, the fallback
+# XPath and the fallback description word as arguments, dedups cards by DOM node and returns one record per card.
+EXTRACT_LISTINGS_SCRIPT = r"""
+const selectors = arguments[0];
+const fallbackXPath = arguments[1];
+const descriptionWord = arguments[2];
+const baseUrl = document.baseURI;
+
+const text = (el) => (el.innerText || el.textContent || '').trim();
+const cls = (el) => (typeof el.className === 'string' ? el.className : '');
+
+const seen = new Set();
+let cards = [];
+for (const selector of selectors) {
+    let found;
+    try {
+        found = document.querySelectorAll(selector);
+    } catch (e) {
+        continue;
+    }
+    for (const card of found) {
+        if (!seen.has(card)) {
+            seen.add(card);
+            cards.push(card);
+        }
+    }
+}
+if (cards.length === 0) {
+    const result = document.evaluate(fallbackXPath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < result.snapshotLength; i++) {
+        cards.push(result.snapshotItem(i));
+    }
+}
+
+return cards.map((card) => {
+    const record = {company: '', url: '', price: '', address: '', text: '', title: ''};
+    const all = Array.from(card.querySelectorAll('*'));
+
+    const company = card.querySelector('.company-name, .clg, .FM_b') || card.querySelector('b, strong, .FM_b');
+    if (company) {
+        record.company = text(company);
+    }
+
+    const title = card.querySelector('.prd-title, .prod-name');
+    if (title) {
+        record.title = text(title);
+    } else if (card.getAttribute('prodname')) {
+        record.title = card.getAttribute('prodname').trim();
+    } else {
+        for (const el of all) {
+            const c = cls(el);
+            if (el.tagName === 'DIV' && c.includes('FM_') && !c.includes('price') && !c.includes('contact')) {
+                const t = text(el);
+                if (t.length > 5 && t.toLowerCase().includes(descriptionWord)) {
+                    record.title = t;
+                    break;
+                }
+            }
+        }
+    }
+
+    // Price, phone number and places are found in the card's text lines on the Python side
+    record.text = card.innerText || card.textContent || '';
+    if (card.getAttribute('price')) {
+        record.price = card.getAttribute('price').trim();
+    }
+
+    for (const el of all) {
+        const c = cls(el);
+        if (c.includes('loctn') || c.includes('location')) {
+            const t = text(el);
+            if (t.length > 2 && !t.includes('₹') && !t.includes('Rs')) {
+                record.address = t;
+                break;
+            }
+        }
+    }
+
+    for (const link of card.querySelectorAll("a.company-name, a.clg, a[href*='indiamart.com']")) {
+        const href = link.getAttribute('href') ? new URL(link.getAttribute('href'), baseUrl).href : '';
+        if (href && href.includes('indiamart.com') && !href.endsWith('.pdf')) {
+            record.url = href;
+            break;
+        }
+    }
+
+    const pns = card.hasAttribute('pnsnumber') ? card : card.querySelector('[pnsnumber]');
+    if (pns) {
+        record.pns = pns.getAttribute('pnsnumber');
+    }
+
+    return record;
+});
+"""
+
+
+def extract_listings_js(driver, selectors=LISTING_SELECTORS):
+    """Extract every listing on the current page with a single execute_script call"""
+    records = driver.execute_script(EXTRACT_LISTINGS_SCRIPT, selectors, FALLBACK_LISTING_XPATH, DESCRIPTION_WORD) or []
+
+    listings = []
+    for record in records:
+        seller_info = new_seller_info()
+        seller_info["Company Name"] = record.get("company", "")
+        seller_info["Company Profile URL"] = record.get("url", "")
+        seller_info["Product Title/Description"] = record.get("title", "")
+        fields = scan_text(record.get("text", ""), skip=(seller_info["Company Name"], seller_info["Product Title/Description"]))
+        seller_info["Price"] = fields["Price"] or record.get("price") or seller_info["Price"]
+        seller_info["Address"] = record.get("address") or fields["Address"]
+        seller_info["Phone Number"] = fields["Phone Number"] or validate_phone(record.get("pns", ""))
+        if has_details(seller_info):
+            listings.append(seller_info)
+
+    return listings
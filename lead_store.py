@@ -0,0 +1,94 @@
+import threading
+from array import array
+
+import pandas as pd
+
+from utils import LEAD_FIELDS, sanitize_value, sanitize_column, validate_phone_column
+
+SCORE_FIELD = "Relevancy Score (%)"
+
+# Text columns whose values repeat across leads ("Not Listed" or "₹ 250/ Piece" prices, city-only
+# addresses); each distinct value is kept once and shared by every lead that has it
+INTERNED_FIELDS = ("Price", "Address")
+
+
+class LeadStore:
+    """Holds the collected leads sanitized, as one list per column instead of one dict per lead"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.columns = {field: [] for field in LEAD_FIELDS if field != SCORE_FIELD}
+        # Scores are whole percentages
+        self.scores = array("h")
+        self.strings = {}
+        # id of a lead still being enriched or scored -> (row, lead), rewritten when it is finished
+        self.open = {}
+
+    def intern(self, value):
+        return self.strings.setdefault(value, value)
+
+    def set_row(self, row, lead):
+        for field, column in self.columns.items():
+            value = sanitize_value(lead.get(field) or "")
+            column[row] = self.intern(value) if field in INTERNED_FIELDS else value
+        self.scores[row] = int(lead.get(SCORE_FIELD) or 0)
+
+    def append(self, lead, final=False):
+        """Store a lead; unless final, its row is rewritten by finish() once its details are merged"""
+        with self.lock:
+            row = len(self.scores)
+            for column in self.columns.values():
+                column.append("")
+            self.scores.append(0)
+            self.set_row(row, lead)
+            if not final:
+                # Holding the lead keeps its id from being reused before it is finished
+                self.open[id(lead)] = (row, lead)
+        return row
+
+    def extend(self, leads):
+        """Store final leads in bulk, sanitizing them a column at a time"""
+        leads = list(leads)
+        with self.lock:
+            for field, column in self.columns.items():
+                repeated = field in INTERNED_FIELDS
+                values = sanitize_column([lead.get(field) or "" for lead in leads], repeated=repeated)
+                column.extend([self.intern(value) for value in values] if repeated else values)
+            self.scores.extend(int(lead.get(SCORE_FIELD) or 0) for lead in leads)
+
+    def finish(self, lead):
+        """Copy the final details of a lead added with final=False into its row"""
+        with self.lock:
+            entry = self.open.pop(id(lead), None)
+            if entry is not None:
+                self.set_row(entry[0], lead)
+
+    def row(self, row):
+        """Return one lead as a dict"""
+        with self.lock:
+            lead = {field: column[row] for field, column in self.columns.items()}
+            lead[SCORE_FIELD] = self.scores[row]
+        return {field: lead[field] for field in LEAD_FIELDS}
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __getitem__(self, row):
+        return self.row(row)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self.row(row)
+
+    def export_frame(self):
+        """Return the leads as a DataFrame sorted by relevancy score, highest first"""
+        with self.lock:
+            columns = {field: list(column) for field, column in self.columns.items()}
+            scores = self.scores.tolist()
+        # sorted() is stable, so leads with the same score stay in the order they were collected
+        order = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        # The stream sinks validate each lead's phone number the same way
+        columns["Phone Number"] = validate_phone_column(columns["Phone Number"])
+        columns[SCORE_FIELD] = scores
+        data = {field: [values[row] for row in order] for field, values in columns.items()}
+        return pd.DataFrame(data, columns=LEAD_FIELDS)
@@ -0,0 +1,89 @@
+import json
+import threading
+
+# URL patterns blocked by the lite profile, by category (Network.setBlockedURLs wildcard syntax)
+BLOCKED_RESOURCES = {
+    "image": ["*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", "*.bmp"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg", "*.wav"],
+    "tracker": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*googlesyndication.com*", "*googleadservices.com*", "*adservice.google.*",
+        "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*clarity.ms*",
+        "*scorecardresearch.com*", "*moengage.com*", "*criteo.*", "*taboola.com*",
+    ],
+}
+
+
+class LiteProfile:
+    """Browser profile that drops images, fonts, media and trackers through the DevTools protocol"""
+
+    def __init__(self, allow=None, deny=None):
+        # Allow entries are category names or substrings of the patterns to keep loading
+        self.allow = [entry.lower() for entry in (allow or [])]
+        self.patterns = []
+        for category, patterns in BLOCKED_RESOURCES.items():
+            if category in self.allow:
+                continue
+            self.patterns.extend(pattern for pattern in patterns if not self.allowed(pattern))
+        self.patterns.extend(deny or [])
+        self.block_images = "image" not in self.allow
+
+        self.lock = threading.Lock()
+        self.requests = {}  # requestId -> resource type, until the request finishes
+        self.blocked = {}
+        self.loaded = {}
+        self.bytes_received = 0
+
+    def allowed(self, pattern):
+        """Return True if an allow entry keeps this pattern from being blocked"""
+        return any(entry in pattern.lower() for entry in self.allow)
+
+    def configure_options(self, chrome_options):
+        """Add the launch options the lite profile needs to a Chrome options object"""
+        if self.block_images:
+            # Also covers images served without a file extension
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        # Network events are read back from the performance log for the counters
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        return chrome_options
+
+    def apply(self, driver):
+        """Start blocking the profile's URL patterns in a running browser"""
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.patterns})
+
+    def collect(self, driver):
+        """Read the network events logged since the last call into the counters"""
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            return
+
+        with self.lock:
+            for entry in entries:
+                message = json.loads(entry["message"])["message"]
+                method = message.get("method")
+                params = message.get("params", {})
+                if method == "Network.requestWillBeSent":
+                    self.requests[params["requestId"]] = params.get("type", "Other")
+                elif method == "Network.loadingFinished":
+                    resource_type = self.requests.pop(params["requestId"], "Other")
+                    self.loaded[resource_type] = self.loaded.get(resource_type, 0) + 1
+                    self.bytes_received += int(params.get("encodedDataLength", 0))
+                elif method == "Network.loadingFailed":
+                    resource_type = self.requests.pop(params["requestId"], params.get("type", "Other"))
+                    if params.get("blockedReason") == "inspector":
+                        self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+
+    def stats(self):
+        """Return the blocked and loaded request counts by resource type and the bytes received"""
+        with self.lock:
+            return {
+                "blocked_requests": sum(self.blocked.values()),
+                "blocked": dict(self.blocked),
+                "loaded_requests": sum(self.loaded.values()),
+                "loaded": dict(self.loaded),
+                "bytes_received": self.bytes_received,
+            }
@@ -0,0 +1,193 @@
+import json
+import time
+import threading
+import functools
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Upper bounds in seconds of the duration histogram buckets
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, float("inf"))
+
+# Prefix of every exported Prometheus metric
+PREFIX = "indiamart"
+
+
+class Histogram:
+    """Bucketed distribution of durations"""
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, p):
+        """Return the upper bound of the bucket holding the p-th percentile"""
+        target = p / 100 * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum_s": round(self.sum, 3),
+            "mean_s": round(self.sum / self.count, 3) if self.count else 0.0,
+            "max_s": round(self.max, 3),
+            "p50_s": round(self.percentile(50), 3),
+            "p90_s": round(self.percentile(90), 3),
+            "p99_s": round(self.percentile(99), 3),
+        }
+
+
+class Metrics:
+    """Counters and duration histograms of a scraper run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.counters = {}
+        self.histograms = {}
+        self.server = None
+
+    def _key(self, name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        """Add to a counter"""
+        key = self._key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        """Record a duration"""
+        key = self._key(name, labels)
+        with self.lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(seconds)
+
+    @contextmanager
+    def span(self, name, **labels):
+        """Time a block as one call of a stage, counting the ones that raise"""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.inc(f"{name}_errors", **labels)
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter(self, name, **labels):
+        with self.lock:
+            return self.counters.get(self._key(name, labels), 0)
+
+    def summary(self):
+        """Return the run summary as a JSON-serializable dict"""
+        elapsed = time.time() - self.started
+        minutes = elapsed / 60
+        name_of = lambda key: key[0] + "".join(f"{{{label}={value}}}" for label, value in key[1])
+        with self.lock:
+            counters = {name_of(key): round(value, 3) for key, value in sorted(self.counters.items())}
+            stages = {name_of(key): histogram.summary() for key, histogram in sorted(self.histograms.items())}
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "elapsed_s": round(elapsed, 1),
+            "rates": {
+                "pages_per_min": round(self.counter("pages") / minutes, 2) if minutes else 0.0,
+                "leads_per_min": round(self.counter("leads") / minutes, 2) if minutes else 0.0,
+            },
+            "counters": counters,
+            "stages": stages,
+        }
+
+    def write_json(self, path):
+        """Write the run summary to a JSON file"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def prometheus_text(self):
+        """Return every metric in the Prometheus text exposition format"""
+        format_labels = lambda labels, extra=(): (
+            "{" + ",".join(f'{label}="{value}"' for label, value in list(labels) + list(extra)) + "}"
+            if labels or extra else ""
+        )
+        lines = []
+        with self.lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {PREFIX}_{name}_total counter")
+                lines.append(f"{PREFIX}_{name}_total{format_labels(labels)} {value}")
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                metric = f"{PREFIX}_{name}_seconds"
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else str(bound)
+                    lines.append(f"{metric}_bucket{format_labels(labels, [('le', le)])} {cumulative}")
+                lines.append(f"{metric}_sum{format_labels(labels)} {histogram.sum}")
+                lines.append(f"{metric}_count{format_labels(labels)} {histogram.count}")
+        lines.append(f"# TYPE {PREFIX}_uptime_seconds gauge")
+        lines.append(f"{PREFIX}_uptime_seconds {time.time() - self.started}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serve the Prometheus text format on a background thread"""
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                data = metrics.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="metrics", daemon=True).start()
+        return self.server.server_address[1]
+
+    def close(self):
+        """Stop the Prometheus endpoint"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+# Decorator for timing scraper methods
+def timed(name):
+    """Record each call of a method as a span of the instance's metrics"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            metrics = getattr(self, "metrics", None)
+            if metrics is None:
+                return func(self, *args, **kwargs)
+            with metrics.span(name):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
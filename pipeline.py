@@ -0,0 +1,85 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PagePrefetcher:
+    """Loads the next results pages while the listings of the current one are processed"""
+
+    def __init__(self, driver=None, fetch=None, depth=1):
+        self.driver = driver
+        # With a fetch function pages are downloaded and parsed on background threads,
+        # otherwise each one is opened in a browser tab that loads while the current tab is used
+        self.fetch = fetch
+        self.depth = depth
+        self.logger = logging.getLogger("IndiaMartScraper")
+        self.lock = threading.Lock()
+        # page number -> Future of its listings, or the handle of the tab loading it
+        self.pending = {}
+        self.executor = ThreadPoolExecutor(max_workers=depth, thread_name_prefix="prefetch") if fetch else None
+        self.hits = 0
+
+    def schedule(self, page_num, url):
+        """Start loading a page unless it is already loading or the prefetch window is full"""
+        with self.lock:
+            if page_num in self.pending or len(self.pending) >= self.depth:
+                return False
+        if self.fetch:
+            entry = self.executor.submit(self.fetch, url)
+        else:
+            handles = set(self.driver.window_handles)
+            # The new tab loads in the background, the driver stays in the current one
+            self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+            new_handles = [handle for handle in self.driver.window_handles if handle not in handles]
+            if not new_handles:
+                return False
+            entry = new_handles[0]
+        with self.lock:
+            self.pending[page_num] = entry
+        self.logger.debug(f"Prefetching page {page_num}: {url}")
+        return True
+
+    def has(self, page_num):
+        with self.lock:
+            return page_num in self.pending
+
+    def take(self, page_num):
+        """Return a page's prefetched listings (None if the fetch failed) or switch to its tab; False if it wasn't prefetched"""
+        with self.lock:
+            entry = self.pending.pop(page_num, None)
+            if entry is None:
+                return False
+            self.hits += 1
+        if self.fetch:
+            try:
+                return entry.result()
+            except Exception as e:
+                self.logger.debug(f"Prefetch of page {page_num} failed: {e}")
+                return None
+        # The prefetched tab replaces the tab of the previous page
+        self.driver.close()
+        self.driver.switch_to.window(entry)
+        return True
+
+    def close(self):
+        """Drop the pages that were loaded but never used"""
+        with self.lock:
+            pending = list(self.pending.values())
+            self.pending.clear()
+        if self.fetch:
+            for future in pending:
+                future.cancel()
+            self.executor.shutdown(wait=True)
+        elif pending:
+            current = self.driver.current_window_handle
+            for handle in pending:
+                try:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                except Exception as e:
+                    self.logger.debug(f"Could not close prefetched tab: {e}")
+            self.driver.switch_to.window(current)
+
+    def stats(self):
+        with self.lock:
+            return {"depth": self.depth, "pages_used": self.hits, "pending": len(self.pending)}
@@ -0,0 +1,126 @@
+import os
+import time
+import zlib
+import sqlite3
+import threading
+
+# Import utility functions
+from utils import normalize_url
+
+# Default location of the profile cache
+CACHE_FILE = os.path.join("cache", "profiles.db")
+# Number of puts between sweeps of the expired entries
+EXPIRE_EVERY = 500
+
+
+class ProfileCache:
+    """SQLite-backed cache of company profile details with TTL expiry and LRU eviction"""
+
+    def __init__(self, path=CACHE_FILE, ttl=7 * 24 * 3600, max_entries=50000, store_html=False):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.store_html = store_html
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Shared by the scraper and the enrichment workers, guarded by self.lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            " url TEXT PRIMARY KEY,"
+            " phone TEXT NOT NULL,"
+            " address TEXT NOT NULL,"
+            " html BLOB,"
+            " fetched_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS profiles_accessed_at ON profiles (accessed_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS profiles_fetched_at ON profiles (fetched_at)")
+        self.conn.commit()
+
+        # Running row count and puts since the last expiry sweep, so a put doesn't scan the table
+        (self.count,) = self.conn.execute("SELECT COUNT(*) FROM profiles").fetchone()
+        self.puts = 0
+        with self.lock:
+            self.expire()
+            self.conn.commit()
+
+    def get(self, url):
+        """Return the cached profile details for a URL, or None on a miss or expired entry"""
+        key = normalize_url(url)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT phone, address, fetched_at FROM profiles WHERE url = ?", (key,)).fetchone()
+            if row is None or now - row[2] > self.ttl:
+                self.misses += 1
+                return None
+
+            self.conn.execute("UPDATE profiles SET accessed_at = ? WHERE url = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+            return {"Phone Number": row[0], "Address": row[1]}
+
+    def get_html(self, url):
+        """Return the cached page source for a URL if it was stored"""
+        with self.lock:
+            row = self.conn.execute("SELECT html FROM profiles WHERE url = ?", (normalize_url(url),)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def put(self, url, profile_info, html=None):
+        """Store the details extracted from a profile page"""
+        now = time.time()
+        blob = zlib.compress(html.encode("utf-8")) if html and self.store_html else None
+        key = normalize_url(url)
+        with self.lock:
+            if self.conn.execute("SELECT 1 FROM profiles WHERE url = ?", (key,)).fetchone() is None:
+                self.count += 1
+            self.conn.execute(
+                "INSERT OR REPLACE INTO profiles (url, phone, address, html, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, profile_info.get("Phone Number", ""), profile_info.get("Address", ""), blob, now, now)
+            )
+            self.puts += 1
+            if self.puts >= EXPIRE_EVERY:
+                self.expire()
+            self.evict()
+            self.conn.commit()
+
+    def expire(self):
+        """Drop the entries older than the TTL"""
+        cursor = self.conn.execute("DELETE FROM profiles WHERE fetched_at < ?", (time.time() - self.ttl,))
+        self.count -= cursor.rowcount
+        self.evictions += cursor.rowcount
+        self.puts = 0
+
+    def evict(self):
+        """Drop the least recently used entries above max_entries"""
+        if self.count > self.max_entries:
+            cursor = self.conn.execute(
+                "DELETE FROM profiles WHERE url IN (SELECT url FROM profiles ORDER BY accessed_at LIMIT ?)",
+                (self.count - self.max_entries,)
+            )
+            self.count -= cursor.rowcount
+            self.evictions += cursor.rowcount
+
+    def stats(self):
+        """Return the hit, miss and eviction counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self):
+        """Close the cache database"""
+        with self.lock:
+            self.conn.close()
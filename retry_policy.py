@@ -0,0 +1,207 @@
+import re
+import time
+import random
+import logging
+import threading
+from collections import deque
+import requests
+from selenium.common.exceptions import (
+    TimeoutException, StaleElementReferenceException, ElementNotInteractableException,
+    ElementClickInterceptedException, InvalidSessionIdException, WebDriverException
+)
+
+try:
+    # httpx is optional, the HTTP fetcher only uses it for HTTP/2
+    import httpx
+    HTTP_STATUS_ERRORS = (requests.HTTPError, httpx.HTTPStatusError)
+    HTTP_TIMEOUTS = (requests.Timeout, httpx.TimeoutException)
+    HTTP_CONNECTION_ERRORS = (requests.ConnectionError, httpx.TransportError)
+except ImportError:
+    HTTP_STATUS_ERRORS = (requests.HTTPError,)
+    HTTP_TIMEOUTS = (requests.Timeout,)
+    HTTP_CONNECTION_ERRORS = (requests.ConnectionError,)
+
+# First delay and cap in seconds of the exponential backoff per error class; None uses the decorator's delay
+BACKOFF = {
+    "timeout": (None, 30),
+    "transient": (None, 15),
+    "stale": (0.2, 2),
+    "blocked": (30, 300),
+}
+
+# HTTP statuses IndiaMART answers with when it throttles or blocks a client
+BLOCK_STATUSES = (403, 429, 503)
+
+# Titles and phrases of CAPTCHA and access-denied pages
+BLOCK_TITLE = re.compile(r"<title>[^<]*(captcha|access denied|attention required|just a moment|blocked)[^<]*</title>", re.I)
+BLOCK_PHRASES = ("unusual traffic", "are you a robot", "verify you are human")
+
+
+class BlockedError(Exception):
+    """The site answered with a block or CAPTCHA page instead of content"""
+
+
+# Function to recognize block and CAPTCHA pages
+def is_block_page(html, status=None):
+    """Return True if a response looks like a block or CAPTCHA page"""
+    if status in BLOCK_STATUSES:
+        return True
+    if not html:
+        return False
+    head = html[:20000]
+    return bool(BLOCK_TITLE.search(head)) or any(phrase in head.lower() for phrase in BLOCK_PHRASES)
+
+
+# Function to decide how an error should be retried
+def classify(error):
+    """Return the error class: timeout, stale, blocked, transient or permanent (not retried)"""
+    if isinstance(error, BlockedError):
+        return "blocked"
+    if isinstance(error, HTTP_STATUS_ERRORS):
+        status = error.response.status_code if error.response is not None else None
+        if status in BLOCK_STATUSES:
+            return "blocked"
+        return "transient" if status and status >= 500 else "permanent"
+    if isinstance(error, (TimeoutException, TimeoutError) + HTTP_TIMEOUTS):
+        return "timeout"
+    if isinstance(error, (StaleElementReferenceException, ElementNotInteractableException, ElementClickInterceptedException)):
+        return "stale"
+    if isinstance(error, InvalidSessionIdException):
+        # The browser is gone, retrying the call can't help
+        return "permanent"
+    if isinstance(error, (WebDriverException, ConnectionError) + HTTP_CONNECTION_ERRORS):
+        return "transient"
+    return "permanent"
+
+
+# Function to compute the wait before a retry
+def backoff_delay(kind, attempt, delay):
+    """Exponential backoff with equal jitter for the given error class and attempt (1-based)"""
+    base, cap = BACKOFF[kind]
+    if base is None:
+        base = delay
+    ceiling = min(cap, base * 2 ** (attempt - 1))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+class RetryBudget:
+    """Caps the number of retries of a whole run so a failing site isn't retried forever"""
+
+    def __init__(self, limit=100):
+        self.limit = limit
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Use one retry; returns False when the budget is spent"""
+        with self.lock:
+            if self.limit is not None and self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+    def remaining(self):
+        with self.lock:
+            return None if self.limit is None else self.limit - self.used
+
+
+class CircuitBreaker:
+    """Pauses a stage when too many of its recent calls failed"""
+
+    def __init__(self, name="enrichment", window=20, threshold=0.5, min_calls=5, cooldown=60, max_cooldown=600, metrics=None):
+        self.name = name
+        self.threshold = threshold
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.metrics = metrics
+        self.logger = logging.getLogger("IndiaMartScraper")
+        self.lock = threading.Lock()
+        # Outcomes of the most recent calls, True for success
+        self.results = deque(maxlen=window)
+        # closed: calls go through; open: callers wait; half_open: one trial call decides
+        self.state = "closed"
+        self.opened_at = 0.0
+        # Consecutive openings without a successful trial, each doubling the cooldown
+        self.strikes = 0
+        self.trial_running = False
+        self.opens = 0
+        self.paused_seconds = 0.0
+
+    def current_cooldown(self):
+        return min(self.max_cooldown, self.cooldown * 2 ** max(0, self.strikes - 1))
+
+    def _open(self):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.strikes += 1
+        self.opens += 1
+        self.trial_running = False
+        failures = self.results.count(False)
+        self.logger.warning(
+            f"Circuit breaker '{self.name}' opened after {failures}/{len(self.results)} failures, "
+            f"pausing for {self.current_cooldown():.0f} s"
+        )
+        if self.metrics:
+            self.metrics.inc("breaker_opened", breaker=self.name)
+
+    def record(self, success):
+        """Record the outcome of a call"""
+        with self.lock:
+            if self.state == "half_open":
+                self.trial_running = False
+                if success:
+                    self.state = "closed"
+                    self.strikes = 0
+                    self.results.clear()
+                    self.logger.info(f"Circuit breaker '{self.name}' closed")
+                    if self.metrics:
+                        self.metrics.inc("breaker_closed", breaker=self.name)
+                else:
+                    self._open()
+                return
+
+            self.results.append(success)
+            if self.state == "closed" and len(self.results) >= self.min_calls:
+                if self.results.count(False) / len(self.results) >= self.threshold:
+                    self._open()
+
+    def wait(self):
+        """Block while the breaker is open; after the cooldown a single trial call is let through"""
+        started = None
+        while True:
+            with self.lock:
+                if self.state == "closed":
+                    break
+                if self.state == "open":
+                    remaining = self.opened_at + self.current_cooldown() - time.monotonic()
+                    if remaining <= 0:
+                        self.state = "half_open"
+                        self.trial_running = True
+                        break
+                elif not self.trial_running:
+                    # The previous trial ended without a verdict, let this caller try
+                    self.trial_running = True
+                    break
+                else:
+                    remaining = 0.5
+            if started is None:
+                started = time.monotonic()
+            time.sleep(min(remaining, 1.0))
+
+        if started is not None:
+            paused = time.monotonic() - started
+            with self.lock:
+                self.paused_seconds += paused
+            if self.metrics:
+                self.metrics.inc("breaker_paused_seconds", paused, breaker=self.name)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "state": self.state,
+                "opens": self.opens,
+                "paused_seconds": round(self.paused_seconds, 1),
+                "recent_failures": self.results.count(False),
+                "recent_calls": len(self.results),
+            }
@@ -0,0 +1,116 @@
+import time
+import queue
+import threading
+import numpy as np
+from rapidfuzz import fuzz, process
+
+# Default weights, the same as calculate_relevancy_score
+DEFAULT_PROFILE = {
+    "title": 60,          # Keyword in the product title/description
+    "title_bonus": 10,    # Up to 2 points per repeat of the keyword in the title
+    "company": 30,        # Keyword in the company name
+    "phone": 5,           # Lead has a phone number
+    "address": 5,         # Lead has an address
+}
+
+
+# Function to score many leads at once
+def score_leads(leads, keywords, profile=DEFAULT_PROFILE, workers=-1):
+    """Compute the relevancy score of every lead against the best matching keyword"""
+    if not leads:
+        return []
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    keywords = [keyword.lower() for keyword in keywords if keyword]
+
+    titles = [lead["Product Title/Description"].lower() for lead in leads]
+    companies = [lead["Company Name"].lower() for lead in leads]
+
+    # Fuzzy ratios for every (keyword, lead) pair, computed in parallel; kept as floats so the
+    # weighted shares truncate exactly like int(ratio * 0.6) in calculate_relevancy_score
+    title_ratios = process.cdist(keywords, titles, scorer=fuzz.partial_ratio, dtype=np.float64, workers=workers)
+    company_ratios = process.cdist(keywords, companies, scorer=fuzz.partial_ratio, dtype=np.float64, workers=workers)
+    title_shares = (title_ratios * (profile["title"] / 100)).astype(np.int32)
+    company_shares = (company_ratios * (profile["company"] / 100)).astype(np.int32)
+
+    best = np.zeros(len(leads), dtype=np.int32)
+    for i, keyword in enumerate(keywords):
+        # A direct match earns the full weight plus a repeat bonus, otherwise the fuzzy share
+        # (str.count beats np.char on object data)
+        title_counts = np.fromiter((title.count(keyword) for title in titles), dtype=np.int32, count=len(titles))
+        company_matches = np.fromiter((keyword in company for company in companies), dtype=bool, count=len(companies))
+        title_score = np.where(
+            title_counts > 0,
+            profile["title"] + np.minimum(profile["title_bonus"], title_counts * 2),
+            title_shares[i]
+        )
+        company_score = np.where(
+            company_matches,
+            profile["company"],
+            company_shares[i]
+        )
+        best = np.maximum(best, title_score + company_score)
+
+    has_phone = np.fromiter((bool(lead["Phone Number"]) for lead in leads), dtype=bool, count=len(leads))
+    has_address = np.fromiter((bool(lead["Address"]) for lead in leads), dtype=bool, count=len(leads))
+    scores = best + has_phone * profile["phone"] + has_address * profile["address"]
+
+    # Cap the score at 100
+    return np.minimum(100, scores).tolist()
+
+
+class ScoringStage:
+    """Background stage that scores finished leads in batches and passes them on"""
+
+    def __init__(self, keywords, on_scored=None, batch_size=256, profile=DEFAULT_PROFILE, metrics=None):
+        self.keywords = keywords
+        self.on_scored = on_scored
+        self.batch_size = batch_size
+        self.profile = profile
+        self.metrics = metrics
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="scoring", daemon=True)
+        self.thread.start()
+
+    def submit(self, lead):
+        """Queue a finished lead for scoring"""
+        self.queue.put(lead)
+
+    def run(self):
+        """Collect leads into batches and score each batch in one call"""
+        stop = False
+        while not stop:
+            batch = [self.queue.get()]
+            # Take whatever else is already waiting, up to one batch
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in batch:
+                stop = True
+            leads = [lead for lead in batch if lead is not None]
+
+            start = time.perf_counter()
+            scores = score_leads(leads, self.keywords, self.profile)
+            if self.metrics and leads:
+                self.metrics.observe("scoring_batch", time.perf_counter() - start)
+                self.metrics.inc("scored_leads", len(leads))
+
+            for lead, score in zip(leads, scores):
+                lead["Relevancy Score (%)"] = score
+                if self.on_scored:
+                    self.on_scored(lead)
+
+            for _ in batch:
+                self.queue.task_done()
+
+    def flush(self):
+        """Wait until every queued lead has been scored"""
+        self.queue.join()
+
+    def close(self):
+        """Score the remaining leads and stop the stage"""
+        self.queue.put(None)
+        self.thread.join()
@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from selenium.webdriver.common.by import By
+
+# Default location of the learned selectors
+SELECTOR_FILE = os.path.join("cache", "selectors.db")
+
+
+class SelectorCache:
+    """Remembers which selector of a fallback cascade matched, per page element, across runs"""
+
+    def __init__(self, path=SELECTOR_FILE):
+        self.path = path
+        self.logger = logging.getLogger("IndiaMartScraper")
+        self.lock = threading.Lock()
+        # name -> {"selectors": [...], "frame": iframe index or None}
+        self.winners = {}
+        self.counts = {}
+        self.fallbacks = []
+        self.conn = None
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS winners ("
+                " name TEXT PRIMARY KEY,"
+                " winner TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            self.conn.commit()
+            for name, winner in self.conn.execute("SELECT name, winner FROM winners"):
+                self.winners[name] = json.loads(winner)
+
+    def _count(self, name, outcome):
+        with self.lock:
+            counts = self.counts.setdefault(name, {"hits": 0, "fallbacks": 0, "misses": 0})
+            counts[outcome] += 1
+
+    def _learn(self, name, winner):
+        previous = self.winners.get(name)
+        if previous == winner:
+            return
+        with self.lock:
+            if previous:
+                # The known winner stopped matching: the page markup has probably changed
+                self.logger.warning(f"Selector for {name} changed from {previous} to {winner}")
+                self.fallbacks.append({"name": name, "previous": previous, "winner": winner, "time": time.time()})
+            self.winners[name] = winner
+            if self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO winners (name, winner, updated_at) VALUES (?, ?, ?)",
+                    (name, json.dumps(winner), time.time())
+                )
+                self.conn.commit()
+
+    def _first_displayed(self, driver, by, selector):
+        for element in driver.find_elements(by, selector):
+            if element.is_displayed():
+                return element
+        return None
+
+    def _switch_frame(self, driver, frame):
+        """Switch to the iframe with the given index, or to the main document for None"""
+        driver.switch_to.default_content()
+        if frame is not None:
+            iframes = driver.find_elements(By.TAG_NAME, "iframe")
+            if frame >= len(iframes):
+                return False
+            driver.switch_to.frame(iframes[frame])
+        return True
+
+    def _search(self, driver, by, selectors):
+        for selector in selectors:
+            try:
+                element = self._first_displayed(driver, by, selector)
+                if element:
+                    return selector, element
+            except Exception as e:
+                self.logger.debug(f"Selector {selector} failed: {e}")
+        return None, None
+
+    def find(self, driver, name, selectors, by=By.XPATH, frames=False):
+        """Return the first displayed element matched by the cascade, trying the learned selector first
+
+        With frames=True the iframes are searched after the main document, and the driver is
+        left switched into the frame where the element was found.
+        """
+        winner = self.winners.get(name)
+        if winner and winner["selectors"][0] in selectors:
+            try:
+                if winner["frame"] is None or self._switch_frame(driver, winner["frame"]):
+                    element = self._first_displayed(driver, by, winner["selectors"][0])
+                    if element:
+                        self._count(name, "hits")
+                        return element
+            except Exception as e:
+                self.logger.debug(f"Learned selector for {name} failed: {e}")
+
+        # Fall back to the full cascade, in the main document and then in every iframe
+        frame_count = 0
+        if frames:
+            driver.switch_to.default_content()
+            frame_count = len(driver.find_elements(By.TAG_NAME, "iframe"))
+        for frame in [None] + list(range(frame_count)):
+            try:
+                if frames and not self._switch_frame(driver, frame):
+                    continue
+            except Exception as e:
+                self.logger.debug(f"Failed to switch to iframe {frame}: {e}")
+                continue
+            selector, element = self._search(driver, by, selectors)
+            if element:
+                self._count(name, "fallbacks" if winner else "misses")
+                self._learn(name, {"selectors": [selector], "frame": frame})
+                return element
+
+        if frames:
+            driver.switch_to.default_content()
+        self._count(name, "fallbacks" if winner else "misses")
+        return None
+
+    def find_all(self, driver, name, selectors, by=By.CSS_SELECTOR):
+        """Return the elements of every selector in the cascade that matches, without duplicates
+
+        Only the selectors that matched last time are run while they still find something.
+        """
+        winner = self.winners.get(name)
+        if winner:
+            known = [selector for selector in winner["selectors"] if selector in selectors]
+            elements = self._collect(driver, by, known)[1]
+            if elements:
+                self._count(name, "hits")
+                return elements
+
+        matched, elements = self._collect(driver, by, selectors)
+        self._count(name, "fallbacks" if winner else "misses")
+        if matched:
+            self._learn(name, {"selectors": matched, "frame": None})
+        return elements
+
+    def _collect(self, driver, by, selectors):
+        """Return the selectors that matched and their elements, removing duplicates by element ID"""
+        matched = []
+        elements = []
+        element_ids = set()
+        for selector in selectors:
+            found = driver.find_elements(by, selector)
+            if found:
+                matched.append(selector)
+            for element in found:
+                if element.id not in element_ids:
+                    element_ids.add(element.id)
+                    elements.append(element)
+        return matched, elements
+
+    def stats(self):
+        """Return hits, fallbacks, misses and hit rate per cascade, plus the number of selector changes"""
+        with self.lock:
+            report = {}
+            for name, counts in self.counts.items():
+                lookups = sum(counts.values())
+                report[name] = dict(counts, hit_rate=round(counts["hits"] / lookups, 2) if lookups else 0.0)
+            return {"cascades": report, "changes": len(self.fallbacks)}
+
+    def close(self):
+        """Close the persisted selectors"""
+        if self.conn:
+            with self.lock:
+                self.conn.close()
@@ -0,0 +1,89 @@
+import os
+import json
+import time
+import logging
+
+# Text that only appears on IndiaMART pages for a signed-in user
+LOGGED_IN_MARKERS = ["My Orders", "My Account", "Logout", "Sign Out", "My Profile", "Dashboard"]
+
+
+# Function to check a page for a signed-in user
+def is_logged_in(page_source):
+    """Return True if the page source shows a signed-in user"""
+    return any(marker in page_source for marker in LOGGED_IN_MARKERS)
+
+
+# Function to save the authenticated browser session
+def save_session(driver, path):
+    """Save the driver's cookies and localStorage to a file only the current user can read"""
+    session = {
+        "saved_at": time.time(),
+        "url": driver.current_url,
+        "cookies": driver.get_cookies(),
+        "local_storage": driver.execute_script(
+            "var items = {};"
+            "for (var i = 0; i < localStorage.length; i++) {"
+            "  var key = localStorage.key(i); items[key] = localStorage.getItem(key);"
+            "}"
+            "return items;"
+        ) or {},
+    }
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, mode=0o700)
+
+    # Create the file with owner-only permissions before any secrets are written
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(session, f)
+    os.chmod(path, 0o600)
+
+    logging.info(f"Saved login session to {path}")
+
+
+# Function to restore a saved browser session
+def restore_session(driver, path, check_url):
+    """Load a saved session into the driver and return True if it is still signed in"""
+    if not os.path.exists(path):
+        return False
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            session = json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Could not read saved session {path}: {e}")
+        return False
+
+    # Skip the browser entirely when every cookie has already expired
+    now = time.time()
+    cookies = [c for c in session.get("cookies", []) if not c.get("expiry") or c["expiry"] > now]
+    if not cookies:
+        logging.info("Saved session has expired")
+        return False
+
+    # Cookies and localStorage can only be set for the domain that is currently loaded
+    driver.get(session.get("url") or check_url)
+    for cookie in cookies:
+        cookie.pop("sameSite", None)
+        try:
+            driver.add_cookie(cookie)
+        except Exception as e:
+            logging.debug(f"Could not restore cookie {cookie.get('name')}: {e}")
+
+    local_storage = session.get("local_storage") or {}
+    if local_storage:
+        driver.execute_script(
+            "var items = arguments[0];"
+            "for (var key in items) { localStorage.setItem(key, items[key]); }",
+            local_storage,
+        )
+
+    # One page load tells us whether the server still accepts the session
+    driver.get(check_url)
+    if is_logged_in(driver.page_source):
+        logging.info("Restored saved login session")
+        return True
+
+    logging.info("Saved session is no longer valid")
+    return False
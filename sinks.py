@@ -0,0 +1,180 @@
+import os
+import csv
+import json
+import heapq
+import tempfile
+import threading
+from itertools import islice
+
+# Import utility functions
+from utils import LEAD_FIELDS, sanitize_data, validate_phone
+
+SCORE_FIELD = "Relevancy Score (%)"
+
+
+class LeadSink:
+    """Base class for outputs that receive leads one at a time as they are produced"""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def write(self, lead):
+        """Sanitize a copy of the lead and append it to the output"""
+        row = sanitize_data({field: lead.get(field, "") for field in LEAD_FIELDS})
+        # Same validation as the export's validate_phone_column, so both outputs match
+        row["Phone Number"] = validate_phone(row["Phone Number"])
+        with self.lock:
+            self.write_row(row)
+            self.count += 1
+
+    def write_row(self, row):
+        raise NotImplementedError
+
+    def close(self):
+        """Flush and close the output"""
+        with self.lock:
+            if not self.closed:
+                self.close_output()
+                self.closed = True
+
+    def close_output(self):
+        raise NotImplementedError
+
+
+class CsvSink(LeadSink):
+    """Append leads to a CSV file with the same columns and encoding as export_to_csv"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        # utf-8-sig for Excel compatibility
+        self.file = open(path, "w", newline="", encoding="utf-8-sig")
+        self.writer = csv.DictWriter(self.file, fieldnames=LEAD_FIELDS)
+        self.writer.writeheader()
+
+    def write_row(self, row):
+        self.writer.writerow(row)
+        self.file.flush()
+
+    def close_output(self):
+        self.file.close()
+
+
+class JsonlSink(LeadSink):
+    """Append leads to a JSON Lines file"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write_row(self, row):
+        self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close_output(self):
+        self.file.close()
+
+
+class ParquetSink(LeadSink):
+    """Write leads to a Parquet file one row group at a time"""
+
+    def __init__(self, path, batch_size=1000):
+        super().__init__(path)
+        # pyarrow is only needed for Parquet output
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema([
+            (field, pa.int64() if field == SCORE_FIELD else pa.string()) for field in LEAD_FIELDS
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.batch_size = batch_size
+        self.batch = []
+
+    def write_row(self, row):
+        self.batch.append(row)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.batch:
+            self.writer.write_table(self.pa.Table.from_pylist(self.batch, schema=self.schema))
+            self.batch = []
+
+    def close_output(self):
+        self.flush()
+        self.writer.close()
+
+
+# Function to pick a sink from the output file extension
+def create_sink(path):
+    """Create the sink matching the output file's extension (.csv, .jsonl or .parquet)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".jsonl":
+        return JsonlSink(path)
+    if extension == ".parquet":
+        return ParquetSink(path)
+    return CsvSink(path)
+
+
+# Function to read back a CSV or JSONL lead file
+def read_leads(path):
+    """Yield the leads stored in a CSV or JSONL file"""
+    return _read_rows(path, "jsonl" if path.lower().endswith(".jsonl") else "csv")
+
+
+def _read_rows(path, fmt):
+    """Yield the rows of a CSV or JSONL lead file"""
+    if fmt == "jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                row[SCORE_FIELD] = int(row[SCORE_FIELD] or 0)
+                yield row
+
+
+def _write_rows(path, fmt, rows):
+    """Write rows to a CSV or JSONL lead file"""
+    if fmt == "jsonl":
+        with open(path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    else:
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=LEAD_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+# Function to sort a lead file that may not fit in memory
+def external_sort(input_path, output_path, chunk_size=10000):
+    """Sort a CSV or JSONL lead file by relevancy score (highest first) in bounded memory"""
+    fmt = "jsonl" if input_path.lower().endswith(".jsonl") else "csv"
+    key = lambda row: -int(row[SCORE_FIELD] or 0)
+    run_paths = []
+
+    try:
+        # Sort fixed-size chunks into temporary run files
+        rows = _read_rows(input_path, fmt)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            chunk.sort(key=key)
+            fd, run_path = tempfile.mkstemp(suffix=f".{fmt}")
+            os.close(fd)
+            _write_rows(run_path, fmt, chunk)
+            run_paths.append(run_path)
+
+        # Merge the runs; heapq.merge only keeps one row per run in memory
+        runs = [_read_rows(run_path, fmt) for run_path in run_paths]
+        _write_rows(output_path, fmt, heapq.merge(*runs, key=key))
+    finally:
+        for run_path in run_paths:
+            os.remove(run_path)
@@ -0,0 +1,159 @@
+import os
+import re
+
+from utils import validate_phone
+
+# Gazetteer of Indian states, union territories and their cities, shipped next to this module
+PLACES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "india_places.txt")
+
+# Units IndiaMART prices are quoted per, longest first so "Square Feet" wins over "Feet"
+PRICE_UNITS = [
+    "square feet", "square foot", "square meter", "square metre", "sq ft", "sq feet", "sqft", "metric ton",
+    "running feet", "kilogram", "kg", "gram", "gm", "piece", "pieces", "pc", "pcs", "dozen", "box", "boxes",
+    "pack", "packet", "set", "sets", "unit", "units", "pair", "pairs", "meter", "metre", "mtr", "feet", "foot",
+    "litre", "liter", "ltr", "ml", "tonne", "ton", "quintal", "roll", "bag", "bottle", "carton", "nos", "no",
+    "number", "sheet", "bundle", "bunch", "kit", "can", "drum", "jar", "pouch", "strip", "vial", "tablet",
+    "day", "month", "year", "hour", "job", "project", "person",
+]
+_UNIT = "|".join(re.escape(unit) for unit in sorted(PRICE_UNITS, key=len, reverse=True))
+_AMOUNT = r"\d[\d,]*(?:\.\d+)?"
+
+# Indian mobiles with an optional +91/0 prefix, and landlines with an STD code
+_PHONE = r"(?<![\d+])(?:(?:\+|00)?91[\s-]{0,2}|0)?[6-9]\d{4}[\s-]?\d{5}(?!\d)|(?<![\d+])0\d{2,4}[\s-]?\d{6,8}(?!\d)"
+PHONE_RE = re.compile(_PHONE)
+
+# Phone numbers and prices, matched in one scan of a line: ₹/Rs/INR amounts or ranges with an
+# optional unit, and bare amounts with a known unit. The leading lookahead lets positions that
+# can't start either fail before any alternative is tried
+FIELDS_RE = re.compile(
+    r"(?=[\d+₹RrIi])"
+    rf"(?:(?P<phone>{_PHONE})"
+    rf"|(?P<price>(?:₹|\bRs\.?|\bINR)[ \t]*{_AMOUNT}(?:[ \t]*(?:-|to)[ \t]*(?:₹|Rs\.?)?[ \t]*{_AMOUNT})?"
+    rf"(?:[ \t]*/[ \t]*(?:{_UNIT}|[A-Za-z]+)\b)?"
+    rf"|(?<![\w/.-]){_AMOUNT}[ \t]*/[ \t]*(?:{_UNIT})\b))",
+    re.IGNORECASE,
+)
+
+# Words of a place name are compared lowercased, ignoring punctuation and digits ("Hyderabad-500004")
+TOKEN_RE = re.compile(r"[a-z]+")
+
+# Lines longer than this are paragraphs, not addresses
+MAX_ADDRESS_LENGTH = 200
+
+
+class Gazetteer:
+    """Finds Indian cities and states in text with a word-level trie, in one pass over the words"""
+
+    def __init__(self, path=PLACES_FILE):
+        # Nested dicts keyed by word; the "" key of a node holds (name, state, kind) of the place ending there
+        self.trie = {}
+        self.size = 0
+        self.load(path)
+
+    def add(self, name, place):
+        node = self.trie
+        for word in TOKEN_RE.findall(name.lower()):
+            node = node.setdefault(word, {})
+        # The first entry of a name wins, so a city listed under two states keeps the first one
+        if "" not in node:
+            node[""] = place
+            self.size += 1
+
+    def load(self, path):
+        """Read a file of "State (Alias): City, City (Alias/Alias), ..." lines"""
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                state_entry, cities = line.split(":", 1)
+                state, state_aliases = self.split_aliases(state_entry)
+                # Cities go first so "Delhi" or "Chandigarh" count as the city rather than the territory
+                for city_entry in cities.split(","):
+                    city, aliases = self.split_aliases(city_entry)
+                    if city:
+                        for name in [city] + aliases:
+                            self.add(name, (city, state, "city"))
+                for name in [state] + state_aliases:
+                    self.add(name, (state, state, "state"))
+
+    @staticmethod
+    def split_aliases(entry):
+        """Split "Name (Alias/Alias)" into the name and its aliases"""
+        name, _, aliases = entry.strip().partition("(")
+        return name.strip(), [alias.strip() for alias in aliases.rstrip(")").split("/") if alias.strip()]
+
+    def find(self, text):
+        """Return (name, state, kind) of every place in the text, longest match first at each position"""
+        words = TOKEN_RE.findall(text.lower())
+        places = []
+        i = 0
+        while i < len(words):
+            node = self.trie
+            match = None
+            j = i
+            while j < len(words) and words[j] in node:
+                node = node[words[j]]
+                j += 1
+                if "" in node:
+                    match = (node[""], j)
+            if match:
+                places.append(match[0])
+                i = match[1]
+            else:
+                i += 1
+        return places
+
+
+_gazetteer = None
+
+
+# Function to share one gazetteer between every extraction
+def get_gazetteer():
+    """Load the gazetteer on first use"""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer()
+    return _gazetteer
+
+
+# Function to extract phone, price and location from a card's or page's text
+def scan_text(lines, skip=()):
+    """Find the first phone number, price and address line in one pass over lines of text"""
+    # skip holds lines, like the company name, that mention a place but aren't the address
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+    gazetteer = get_gazetteer()
+    found = {"Phone Number": "", "Price": "", "Address": "", "City": "", "State": ""}
+
+    for line in lines:
+        line = " ".join(line.split())
+        if not line:
+            continue
+
+        if not found["Phone Number"] or not found["Price"]:
+            for match in FIELDS_RE.finditer(line):
+                if match.group("phone") and not found["Phone Number"]:
+                    found["Phone Number"] = validate_phone(match.group("phone"))
+                elif match.group("price") and not found["Price"]:
+                    found["Price"] = match.group("price")
+
+        if not found["Address"] and len(line) <= MAX_ADDRESS_LENGTH and line not in skip:
+            places = gazetteer.find(line)
+            if places and not line.startswith(("View", "Call")) and "₹" not in line and "Rs" not in line:
+                found["Address"] = line
+                for name, state, kind in places:
+                    if kind == "city" and not found["City"]:
+                        found["City"] = name
+                    found["State"] = found["State"] or state
+
+        if found["Phone Number"] and found["Price"] and found["Address"]:
+            break
+
+    if not found["Phone Number"]:
+        # A number split over several text nodes ("+91-<b>98765</b> 43210") only shows in the joined text
+        match = PHONE_RE.search(" ".join(" ".join(lines).split()))
+        if match:
+            found["Phone Number"] = validate_phone(match.group())
+
+    return found
@@ -1,64 +1,260 @@
 import logging
 import os
+import copy
+import json
 import time
+import queue
+import atexit
+import threading
+import functools
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from urllib.parse import urlparse
+
+from retry_policy import classify, backoff_delay
+
+# Directory of the log files and how many runs' logs to keep
+LOG_DIR = "logs"
+LOG_RETENTION = 10
+
+# Structured fields copied from a record's extra={...} into its JSON line
+LOG_FIELDS = ("stage", "keyword", "page", "lead", "url", "suppressed")
+
+# Listener that writes queued records off the scraping thread and the handler feeding it, once set up
+_log_listener = None
+_queue_handler = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a log record as one JSON object per line"""
+    
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for field in LOG_FIELDS:
+            if hasattr(record, field):
+                entry[field] = getattr(record, field)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # Formatted by StructuredQueueHandler before the record was queued
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """Queue records with their message and traceback as separate fields instead of merged into one"""
+    
+    def prepare(self, record):
+        # QueueHandler.prepare folds the traceback into the message and clears exc_info,
+        # which leaves the JSON lines without their "exception" field
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class SampleFilter(logging.Filter):
+    """Let through at most `rate` records per second for each extra={"sample": key}; others pass untouched"""
+    
+    def __init__(self, rate=2):
+        super().__init__()
+        self.rate = rate
+        self.lock = threading.Lock()
+        # key -> [window start, records passed, records suppressed]
+        self.windows = {}
+    
+    def filter(self, record):
+        key = getattr(record, "sample", None)
+        if key is None:
+            return True
+        
+        now = time.monotonic()
+        with self.lock:
+            window = self.windows.setdefault(key, [now, 0, 0])
+            if now - window[0] >= 1:
+                if window[2]:
+                    # Tell the reader how many similar messages were dropped
+                    record.suppressed = window[2]
+                window[:] = [now, 0, 0]
+            if window[1] < self.rate:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+# Function to delete old log files
+def prune_logs(log_dir=LOG_DIR, keep=LOG_RETENTION):
+    """Keep only the log files of the most recent runs"""
+    runs = {}
+    for name in os.listdir(log_dir):
+        if name.startswith("scraper_"):
+            # Rotated files share their run's prefix
+            runs.setdefault(name.split(".")[0], []).append(name)
+    for run in sorted(runs)[:-keep or None]:
+        for name in runs[run]:
+            try:
+                os.remove(os.path.join(log_dir, name))
+            except OSError:
+                pass
+
 
 # Configure logging
-def setup_logger():
-    """Set up and configure the logger"""
+def setup_logger(level=logging.INFO, log_dir=LOG_DIR, keep=LOG_RETENTION, max_bytes=10 * 1024 * 1024, sample_rate=2):
+    """Set up and configure the logger once per process; later calls return the same logger"""
+    global _log_listener, _queue_handler
+    logger = logging.getLogger()
+    if _log_listener is not None:
+        return logger
+    
     # Create logs directory if it doesn't exist
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
+    if not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+    prune_logs(log_dir, keep - 1)
     
-    # Create a unique log file name with timestamp
+    # Create a unique log file name with timestamp, rotated when it grows past max_bytes
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = f"logs/scraper_{timestamp}.log"
+    file_handler = RotatingFileHandler(os.path.join(log_dir, f"scraper_{timestamp}.jsonl"), maxBytes=max_bytes, backupCount=5, encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter())
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
     
-    # Configure the logger
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
-    )
+    # The scraping threads only put records on a queue; the listener thread does the I/O
+    log_queue = queue.SimpleQueue()
+    _queue_handler = StructuredQueueHandler(log_queue)
+    _queue_handler.addFilter(SampleFilter(sample_rate))
+    logger.addHandler(_queue_handler)
+    logger.setLevel(level)
     
-    return logging.getLogger()
+    _log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(shutdown_logger)
+    
+    return logger
+
+# Function to flush the log queue
+def shutdown_logger():
+    """Write out the queued log records and stop the listener thread"""
+    global _log_listener, _queue_handler
+    if _log_listener is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _log_listener.stop()
+        _log_listener = None
+        _queue_handler = None
 
 # Retry decorator for handling transient errors
 def retry(max_attempts=3, delay=2):
-    """Decorator to retry a function if it fails"""
+    """Decorator to retry a function if it fails, backing off by error class"""
     def decorator(func):
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            # When decorating a scraper method, use the instance's metrics and run-wide retry budget
+            metrics = getattr(args[0], "metrics", None) if args else None
+            budget = getattr(args[0], "retry_budget", None) if args else None
             attempts = 0
-            while attempts < max_attempts:
+            while True:
                 try:
                     return func(*args, **kwargs)
                 except Exception as e:
                     attempts += 1
-                    if attempts == max_attempts:
+                    kind = classify(e)
+                    if kind == "permanent":
+                        reason = "permanent"
+                    elif attempts >= max_attempts:
+                        reason = "attempts"
+                    elif budget is not None and not budget.take():
+                        reason = "budget"
+                    else:
+                        reason = None
+                    if reason:
+                        if metrics is not None:
+                            metrics.inc("retry_giveups", function=func.__name__, reason=reason)
                         raise
-                    logging.warning(f"Attempt {attempts} failed with error: {e}. Retrying in {delay} seconds...")
-                    time.sleep(delay)
+                    wait = backoff_delay(kind, attempts, delay)
+                    if metrics is not None:
+                        metrics.inc("retries", function=func.__name__, kind=kind)
+                    logging.warning(f"Attempt {attempts} failed with {kind} error: {e}. Retrying in {wait:.1f} seconds...")
+                    time.sleep(wait)
         return wrapper
     return decorator
 
+# Columns of an exported lead, in output order
+LEAD_FIELDS = ["Company Name", "Company Profile URL", "Price", "Address", "Phone Number", "Product Title/Description", "Relevancy Score (%)"]
+
+# Function to create an empty lead record
+def new_seller_info():
+    """Return a lead dict with every exported field set to its default"""
+    return {
+        "Company Name": "",
+        "Company Profile URL": "",
+        "Price": "Not Listed",
+        "Address": "",
+        "Phone Number": "",
+        "Product Title/Description": "",
+        "Relevancy Score (%)": 0
+    }
+
+# Function to merge profile page details into a lead
+def merge_profile_info(seller_info, profile_info):
+    """Fill a lead's missing phone number and short address from its profile details"""
+    if not seller_info["Phone Number"] and profile_info.get("Phone Number"):
+        seller_info["Phone Number"] = profile_info["Phone Number"]
+    if len(seller_info["Address"]) < 5 and profile_info.get("Address"):
+        seller_info["Address"] = profile_info["Address"]
+    return seller_info
+
+# Function to normalize profile URLs
+def normalize_url(url):
+    """Normalize a URL so the same page always maps to the same key"""
+    if not url:
+        return ""
+    
+    parts = urlparse(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/") or "/"
+    
+    # Query strings and fragments only carry tracking and in-page anchors
+    return f"{host}{path}"
+
+# Function to sanitize one value for CSV
+def sanitize_value(value):
+    """Strip a string and turn its newlines, tabs and runs of spaces into single spaces"""
+    value = value.strip().replace('\n', ' ').replace('\t', ' ')
+    if '  ' in value:
+        # One split and join, where repeated replace('  ', ' ') passes rescan long runs
+        value = ' '.join(filter(None, value.split(' ')))
+    return value
+
 # Function to sanitize data for CSV
 def sanitize_data(data):
     """Clean and sanitize data for CSV export"""
     if isinstance(data, dict):
         for key, value in data.items():
             if isinstance(value, str):
-                # Remove any leading/trailing whitespace
-                data[key] = value.strip()
-                # Replace any newlines or tabs with spaces
-                data[key] = data[key].replace('\n', ' ').replace('\t', ' ')
-                # Remove any double spaces
-                while '  ' in data[key]:
-                    data[key] = data[key].replace('  ', ' ')
+                data[key] = sanitize_value(value)
     return data
 
+# Function to sanitize a whole column of data for CSV
+def sanitize_column(values, repeated=False):
+    """Sanitize a column of strings, like sanitize_data on each value"""
+    if repeated:
+        # Columns with few distinct values, like prices and addresses, clean each of them once
+        cleaned = {value: sanitize_value(value) for value in set(values)}
+        return [cleaned[value] for value in values]
+    return [sanitize_value(value) for value in values]
+
 # Function to validate phone numbers
 def validate_phone(phone):
     """Validate and format phone numbers"""
@@ -87,4 +283,15 @@ def validate_email(email):
     if '@' in email and '.' in email.split('@')[1]:
         return email.strip().lower()
     else:
-        return ""  # Return empty string for invalid emails
\ No newline at end of file
+        return ""  # Return empty string for invalid emails
+
+# Function to validate a whole column of phone numbers
+def validate_phone_column(phones):
+    """Validate and format a column of phone numbers, like validate_phone on each value"""
+    # Numbers from the extractors are already ten digits, only the others need the full check
+    return [phone if len(phone) == 10 and phone.isdigit() else validate_phone(phone) for phone in phones]
+
+# Function to validate a whole column of emails
+def validate_email_column(emails):
+    """Validate a column of email addresses, like validate_email on each value"""
+    return [validate_email(email) for email in emails]
@@ -0,0 +1,203 @@
+import time
+import random
+import threading
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, JavascriptException, NoSuchElementException
+
+# Resolves once no DOM mutation has happened for arguments[0] ms, or after arguments[1] ms
+DOM_QUIET_SCRIPT = """
+var quietMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var start = Date.now(), last = Date.now();
+var observer = new MutationObserver(function () { last = Date.now(); });
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+(function check() {
+    var now = Date.now();
+    if (now - last >= quietMs || now - start >= timeoutMs) {
+        observer.disconnect();
+        done(now - last >= quietMs);
+    } else {
+        setTimeout(check, 50);
+    }
+})();
+"""
+
+# Resolves once no new resource has finished loading for arguments[0] ms, or after arguments[1] ms
+NETWORK_IDLE_SCRIPT = """
+var idleMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var start = Date.now(), last = Date.now();
+var count = performance.getEntriesByType('resource').length;
+(function check() {
+    var now = Date.now(), current = performance.getEntriesByType('resource').length;
+    if (current !== count) {
+        count = current;
+        last = now;
+    }
+    if (now - last >= idleMs || now - start >= timeoutMs) {
+        done(now - last >= idleMs);
+    } else {
+        setTimeout(check, 100);
+    }
+})();
+"""
+
+# Any of these means listing cards are on the page
+LISTINGS_READY_SELECTOR = ".product-listing, .FM_sldrB, .prd-block, [class*='FM_']"
+
+# Minimum seconds between two actions of the same kind, as (low, high) for random jitter
+DEFAULT_PACING = {
+    "listing": (0.5, 1.5),
+    "page": (2, 4),
+    "profile": (1, 3),
+    "login": (0.5, 1),
+}
+
+
+class WaitStats:
+    """Wall time spent waiting, broken down by reason"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals = {}
+        self.counts = {}
+
+    def record(self, reason, seconds):
+        with self.lock:
+            self.totals[reason] = self.totals.get(reason, 0.0) + seconds
+            self.counts[reason] = self.counts.get(reason, 0) + 1
+
+    def report(self):
+        """Return {reason: {"seconds": total, "count": n}} sorted by time spent"""
+        with self.lock:
+            reasons = sorted(self.totals, key=self.totals.get, reverse=True)
+            return {reason: {"seconds": round(self.totals[reason], 2), "count": self.counts[reason]} for reason in reasons}
+
+    def total(self):
+        with self.lock:
+            return sum(self.totals.values())
+
+
+class RatePolicy:
+    """Human-like pacing: keeps a minimum, jittered interval between actions of the same kind"""
+
+    def __init__(self, intervals=None, scale=1.0):
+        self.intervals = dict(DEFAULT_PACING, **(intervals or {}))
+        self.scale = scale
+        self.last_action = {}
+        self.lock = threading.Lock()
+
+    def delay(self, kind):
+        """Return how long to wait before the next action of this kind ("page:2" paces like "page" on its own clock)"""
+        low, high = self.intervals.get(kind.split(":")[0], (0, 0))
+        interval = random.uniform(low, high) * self.scale
+        with self.lock:
+            now = time.monotonic()
+            # Time already spent working since the last action counts towards the interval
+            last = self.last_action.get(kind)
+            remaining = interval - (now - last) if last is not None else 0
+            self.last_action[kind] = now + max(0, remaining)
+        return max(0, remaining)
+
+
+class Waiter:
+    """Wait for readiness signals instead of sleeping for fixed times"""
+
+    def __init__(self, rate_policy=None, timeout=15, metrics=None):
+        self.rate_policy = rate_policy or RatePolicy()
+        self.timeout = timeout
+        self.stats = WaitStats()
+        self.metrics = metrics
+
+    def _timed(self, reason, func):
+        start = time.monotonic()
+        try:
+            return func()
+        finally:
+            seconds = time.monotonic() - start
+            self.stats.record(reason, seconds)
+            if self.metrics:
+                self.metrics.inc("wait_seconds", seconds, reason=reason)
+
+    def page_ready(self, driver, reason="page load"):
+        """Wait until document.readyState is complete"""
+        def wait():
+            try:
+                WebDriverWait(driver, self.timeout, poll_frequency=0.1).until(
+                    lambda d: d.execute_script("return document.readyState") == "complete"
+                )
+                return True
+            except TimeoutException:
+                return False
+        return self._timed(reason, wait)
+
+    def _run_async(self, driver, script, settle_ms, timeout_ms):
+        """Run a waiting script, starting it again on the new page if a navigation unloads the old one"""
+        driver.set_script_timeout(timeout_ms / 1000 + 5)
+        for attempt in range(2):
+            try:
+                return driver.execute_async_script(script, settle_ms, timeout_ms)
+            except JavascriptException as e:
+                if "unload" not in str(e) or attempt:
+                    return False
+                try:
+                    WebDriverWait(driver, timeout_ms / 1000, poll_frequency=0.1).until(
+                        lambda d: d.execute_script("return document.readyState") == "complete"
+                    )
+                except TimeoutException:
+                    return False
+        return False
+
+    def dom_quiet(self, driver, reason="dom quiet", quiet_ms=500, timeout=None):
+        """Wait until the DOM has stopped changing for quiet_ms"""
+        timeout_ms = int((timeout or self.timeout) * 1000)
+        return self._timed(reason, lambda: self._run_async(driver, DOM_QUIET_SCRIPT, quiet_ms, timeout_ms))
+
+    def network_idle(self, driver, reason="network idle", idle_ms=500, timeout=None):
+        """Wait until no resource has finished loading for idle_ms"""
+        timeout_ms = int((timeout or self.timeout) * 1000)
+        return self._timed(reason, lambda: self._run_async(driver, NETWORK_IDLE_SCRIPT, idle_ms, timeout_ms))
+
+    def page_marker(self, driver):
+        """Return an element of the current page, a listing card if there is one, that goes stale once the page is replaced"""
+        for locator in ((By.CSS_SELECTOR, LISTINGS_READY_SELECTOR), (By.TAG_NAME, "html")):
+            try:
+                return driver.find_element(*locator)
+            except NoSuchElementException:
+                continue
+        return None
+
+    def navigation(self, driver, marker, old_url, reason="navigation", timeout=None):
+        """Wait until the page of marker and old_url has been replaced and the new one has loaded; False on timeout"""
+        def left(d):
+            if d.current_url != old_url:
+                return True
+            # Pages that swap their cards in place keep the URL, their old cards go stale
+            return marker is None or EC.staleness_of(marker)(d)
+        def wait():
+            try:
+                WebDriverWait(driver, timeout or self.timeout, poll_frequency=0.1).until(left)
+                return True
+            except TimeoutException:
+                return False
+        return self._timed(reason, wait) and self.page_ready(driver, reason)
+
+    def element(self, driver, locator, reason="element", timeout=None, clickable=False):
+        """Wait for an element to be present (or clickable) and return it, or None on timeout"""
+        condition = EC.element_to_be_clickable(locator) if clickable else EC.presence_of_element_located(locator)
+        def wait():
+            try:
+                return WebDriverWait(driver, timeout or self.timeout, poll_frequency=0.1).until(condition)
+            except TimeoutException:
+                return None
+        return self._timed(reason, wait)
+
+    def listings(self, driver, reason="listings"):
+        """Wait for the listing cards of a results page; True if they appeared"""
+        return self.element(driver, (By.CSS_SELECTOR, LISTINGS_READY_SELECTOR), reason=reason) is not None
+
+    def pace(self, kind):
+        """Apply the rate policy before an action of the given kind"""
+        delay = self.rate_policy.delay(kind)
+        if delay > 0:
+            self._timed(f"pacing:{kind}", lambda: time.sleep(delay))
@@ -0,0 +1,200 @@
+import os
+import time
+import sqlite3
+
+# Import utility functions
+from utils import LEAD_FIELDS, normalize_url
+from sinks import LeadSink, SCORE_FIELD
+from dedup import canonical_phone, canonical_name
+from text_extractors import get_gazetteer
+
+# Default location of the lead warehouse shared by every run
+WAREHOUSE_FILE = os.path.join("warehouse", "leads.db")
+
+# Orders the export can sort by, mapped to their SQL
+SORT_ORDERS = {
+    "relevancy": "relevancy DESC, l.last_seen DESC",
+    "last-seen": "l.last_seen DESC",
+    "first-seen": "l.first_seen DESC",
+    "company": "l.company_name COLLATE NOCASE, relevancy DESC",
+}
+
+# Columns of the leads table holding each exported field
+LEAD_COLUMNS = {
+    "Company Name": "company_name",
+    "Company Profile URL": "profile_url",
+    "Price": "price",
+    "Address": "address",
+    "Phone Number": "phone",
+    "Product Title/Description": "description",
+}
+
+
+# Function to pick the key a lead is stored under
+def lead_key(lead):
+    """Return the warehouse key of a lead: its profile URL, else its phone number, else its company name"""
+    url = normalize_url(lead.get("Company Profile URL", ""))
+    if url:
+        return f"url:{url}"
+    phone = canonical_phone(lead.get("Phone Number", ""))
+    if phone:
+        return f"phone:{phone}"
+    name = canonical_name(lead.get("Company Name", ""))
+    return f"name:{name}" if name else ""
+
+
+class WarehouseSink(LeadSink):
+    """Upsert leads into a SQLite warehouse that keeps every run's suppliers, with keyword and run provenance"""
+
+    def __init__(self, path=WAREHOUSE_FILE, keyword="", run_id="", batch_size=200):
+        super().__init__(path)
+        self.keyword = keyword
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self.batch = []
+        self.conn = open_warehouse(path)
+
+    def write_row(self, row):
+        self.batch.append(row)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Upsert the batched leads in one transaction"""
+        if not self.batch:
+            return
+        now = time.time()
+        gazetteer = get_gazetteer()
+        leads = []
+        sightings = []
+        for row in self.batch:
+            key = lead_key(row)
+            if not key:
+                continue
+            # Addresses go from the locality to the state, so the last city named is the city
+            city = state = ""
+            for name, place_state, kind in gazetteer.find(row["Address"]):
+                if kind == "city":
+                    city = name
+                state = place_state
+            leads.append((key, *(row[field] for field in LEAD_COLUMNS), city, state, now, now))
+            sightings.append((key, self.keyword, self.run_id, row[SCORE_FIELD], now, now))
+
+        with self.conn:
+            # Empty fields of a new sighting don't erase what earlier runs found
+            self.conn.executemany(
+                "INSERT INTO leads (lead_key, company_name, profile_url, price, address, phone, description, city, state, first_seen, last_seen)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (lead_key) DO UPDATE SET"
+                " company_name = COALESCE(NULLIF(excluded.company_name, ''), company_name),"
+                " profile_url = COALESCE(NULLIF(excluded.profile_url, ''), profile_url),"
+                " price = CASE WHEN excluded.price IN ('', 'Not Listed') THEN price ELSE excluded.price END,"
+                " address = COALESCE(NULLIF(excluded.address, ''), address),"
+                " phone = COALESCE(NULLIF(excluded.phone, ''), phone),"
+                " description = COALESCE(NULLIF(excluded.description, ''), description),"
+                " city = COALESCE(NULLIF(excluded.city, ''), city),"
+                " state = COALESCE(NULLIF(excluded.state, ''), state),"
+                " last_seen = excluded.last_seen",
+                leads
+            )
+            self.conn.executemany(
+                "INSERT INTO sightings (lead_key, keyword, run_id, relevancy, first_seen, last_seen)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (lead_key, keyword) DO UPDATE SET"
+                " run_id = excluded.run_id, relevancy = excluded.relevancy, last_seen = excluded.last_seen",
+                sightings
+            )
+        self.batch = []
+
+    def close_output(self):
+        self.flush()
+        self.conn.close()
+
+
+# Function to open the warehouse database
+def open_warehouse(path=WAREHOUSE_FILE):
+    """Open the warehouse in WAL mode, creating its tables and indexes if needed"""
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    # Written by the scraping thread and the enrichment workers, guarded by the sink's lock
+    conn = sqlite3.connect(path, check_same_thread=False)
+    # Readers, like an export, don't block a run that is writing
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS leads ("
+        " lead_key TEXT PRIMARY KEY,"
+        " company_name TEXT NOT NULL,"
+        " profile_url TEXT NOT NULL,"
+        " price TEXT NOT NULL,"
+        " address TEXT NOT NULL,"
+        " phone TEXT NOT NULL,"
+        " description TEXT NOT NULL,"
+        " city TEXT NOT NULL COLLATE NOCASE,"
+        " state TEXT NOT NULL COLLATE NOCASE,"
+        " first_seen REAL NOT NULL,"
+        " last_seen REAL NOT NULL)"
+    )
+    # One row per keyword a lead was found for, with the run and score of the latest sighting
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS sightings ("
+        " lead_key TEXT NOT NULL,"
+        " keyword TEXT NOT NULL COLLATE NOCASE,"
+        " run_id TEXT NOT NULL,"
+        " relevancy INTEGER NOT NULL,"
+        " first_seen REAL NOT NULL,"
+        " last_seen REAL NOT NULL,"
+        " PRIMARY KEY (lead_key, keyword))"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS leads_city ON leads (city)")
+    conn.execute("CREATE INDEX IF NOT EXISTS leads_phone ON leads (phone)")
+    conn.execute("CREATE INDEX IF NOT EXISTS sightings_keyword ON sightings (keyword, relevancy)")
+    conn.execute("CREATE INDEX IF NOT EXISTS sightings_relevancy ON sightings (relevancy)")
+    conn.commit()
+    return conn
+
+
+# Function to read a filtered slice of the warehouse
+def query_leads(path=WAREHOUSE_FILE, keyword=None, city=None, state=None, has_phone=False, min_score=None, since_days=None, sort="relevancy", limit=None):
+    """Yield the warehouse's leads matching the filters as lead dicts, in the given order"""
+    conditions = []
+    params = []
+    if keyword:
+        conditions.append("s.keyword = ?")
+        params.append(keyword)
+    if city:
+        conditions.append("l.city = ?")
+        params.append(city)
+    if state:
+        conditions.append("l.state = ?")
+        params.append(state)
+    if has_phone:
+        conditions.append("l.phone != ''")
+    if since_days is not None:
+        conditions.append("l.last_seen >= ?")
+        params.append(time.time() - since_days * 24 * 3600)
+
+    # A lead found for several keywords is scored by its best match
+    sql = (
+        f"SELECT {', '.join('l.' + column for column in LEAD_COLUMNS.values())}, MAX(s.relevancy) AS relevancy"
+        " FROM leads l JOIN sightings s ON s.lead_key = l.lead_key"
+    )
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " GROUP BY l.lead_key"
+    if min_score is not None:
+        sql += " HAVING relevancy >= ?"
+        params.append(min_score)
+    sql += f" ORDER BY {SORT_ORDERS[sort]}"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+
+    conn = open_warehouse(path)
+    try:
+        for row in conn.execute(sql, params):
+            yield dict(zip(LEAD_FIELDS, row))
+    finally:
+        conn.close()
@@ -0,0 +1,169 @@
+import queue
+import threading
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+import psutil
+from selenium import webdriver
+
+from dom_extractor import extract_listings
+from js_extractor import extract_listings_js
+
+
+# Function to build the URL of a numbered results page
+def page_url(url, page_num, page_param="page"):
+    """Return the results URL with its page number query parameter set"""
+    parts = urlparse(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key != page_param]
+    if page_num > 1:
+        query.append((page_param, str(page_num)))
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+
+class PageWorkerPool:
+    """Scrape result pages with several browsers that share one logged-in session"""
+
+    def __init__(self, scraper, workers=4, memory_limit_mb=1024, max_pages=100, page_param="page"):
+        self.scraper = scraper
+        self.logger = scraper.logger
+        self.workers = workers
+        self.memory_limit_mb = memory_limit_mb
+        self.max_pages = max_pages
+        self.page_param = page_param
+        self.pages = queue.Queue()
+        self.results = queue.Queue()
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        # Lowest page number known to be past the end of the results
+        self.last_page = max_pages
+
+    def create_driver(self, cookies):
+        """Launch a browser and copy the main browser's cookies into it"""
+        chrome_options = self.scraper.build_chrome_options()
+        # Cap the renderer's JavaScript heap so one worker can't take the machine down
+        chrome_options.add_argument(f"--js-flags=--max-old-space-size={self.memory_limit_mb}")
+        driver = webdriver.Chrome(options=chrome_options)
+        if self.scraper.lite:
+            self.scraper.lite.apply(driver)
+
+        # Cookies can only be added for the domain that is currently loaded
+        driver.get(self.scraper.base_url)
+        for cookie in cookies:
+            cookie = dict(cookie)
+            cookie.pop("sameSite", None)
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                self.logger.debug(f"Could not copy cookie {cookie.get('name')}: {e}")
+
+        return driver
+
+    def driver_memory_mb(self, driver):
+        """Return the resident memory of a driver's chromedriver and browser processes"""
+        try:
+            process = psutil.Process(driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except (psutil.Error, AttributeError):
+            return 0
+
+    def scrape_page(self, driver, url):
+        """Load one results page and extract its listings"""
+        driver.get(url)
+        self.scraper.wait_for_listings(driver)
+
+        if self.scraper.backend == "js":
+            return extract_listings_js(driver)
+        return extract_listings(driver.page_source, base_url=driver.current_url)
+
+    def worker(self, worker_id, start_url, cookies):
+        """Take page numbers from the shared queue until the run is done"""
+        driver = None
+        try:
+            driver = self.create_driver(cookies)
+            while not self.stop_event.is_set():
+                try:
+                    page_num = self.pages.get_nowait()
+                except queue.Empty:
+                    break
+
+                if page_num > self.last_page:
+                    continue
+
+                try:
+                    listings = self.scrape_page(driver, page_url(start_url, page_num, self.page_param))
+                except Exception as e:
+                    self.logger.warning(f"Worker {worker_id} failed on page {page_num}: {e}")
+                    listings = None
+
+                if listings == []:
+                    # Nothing on this page, so nothing after it either
+                    with self.lock:
+                        self.last_page = min(self.last_page, page_num - 1)
+                elif listings:
+                    self.results.put((page_num, listings))
+
+                # Restart the browser when it grows past its memory budget
+                if self.driver_memory_mb(driver) > self.memory_limit_mb:
+                    self.logger.info(f"Worker {worker_id} exceeded {self.memory_limit_mb} MB, restarting its browser")
+                    self.scraper.collect_network(driver)
+                    driver.quit()
+                    driver = self.create_driver(cookies)
+
+                # Each worker paces its own page loads
+                self.scraper.waiter.pace(f"page:{worker_id}")
+        except Exception as e:
+            self.logger.error(f"Worker {worker_id} stopped: {e}")
+        finally:
+            if driver:
+                self.scraper.collect_network(driver)
+                driver.quit()
+
+    def scrape(self, keyword, min_leads=100):
+        """Scrape the current search's result pages in parallel and merge the leads"""
+        start_url = self.scraper.driver.current_url
+        # The main browser is only read here, on its own thread; workers get a copy of its cookies
+        # since the main thread keeps driving it for profile visits
+        cookies = self.scraper.driver.get_cookies()
+        for page_num in range(1, self.max_pages + 1):
+            self.pages.put(page_num)
+
+        threads = [
+            threading.Thread(target=self.worker, args=(worker_id, start_url, cookies), daemon=True)
+            for worker_id in range(1, self.workers + 1)
+        ]
+        for thread in threads:
+            thread.start()
+
+        self.scraper.start_enrichment()
+        self.scraper.start_scoring(keyword)
+        leads_count = 0
+
+        # Merge the workers' listings into one lead stream as pages finish
+        while any(thread.is_alive() for thread in threads) or not self.results.empty():
+            try:
+                page_num, listings = self.results.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            self.logger.info(f"Merging {len(listings)} listings from page {page_num}", extra={"stage": "page", "keyword": keyword, "page": page_num})
+            for seller_info in listings:
+                if leads_count >= min_leads:
+                    break
+                if self.scraper.should_skip(seller_info):
+                    continue
+                if seller_info["Company Profile URL"] and self.scraper.enricher is None:
+                    self.scraper.visit_profile(seller_info)
+                if self.scraper.add_lead(seller_info, keyword):
+                    leads_count += 1
+
+            if leads_count >= min_leads:
+                self.stop_event.set()
+
+        self.stop_event.set()
+        for thread in threads:
+            thread.join()
+
+        self.scraper.finish_enrichment()
+        self.scraper.finish_scoring()
+
+        print(f"Total leads collected: {self.scraper.lead_count}")
+        return self.scraper.leads